@@ -1,7 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
-from .models import UserProfile, Scholarship, Application, Notification, ApplicationDocument, ScholarshipRequirement
+from django.utils import timezone
+from .models import UserProfile, Scholarship, Application, Notification, ApplicationDocument, ScholarshipRequirement, OutgoingEmail, ReportJob, DocumentBlob, UploadSession
+from .services import DashboardStatsService
 
 
 class UserProfileInline(admin.StackedInline):
@@ -143,16 +145,71 @@ class NotificationAdmin(admin.ModelAdmin):
     actions = ['mark_as_read', 'mark_as_unread']
     
     def mark_as_read(self, request, queryset):
+        recipient_ids = list(queryset.values_list('recipient_id', flat=True).distinct())
         queryset.update(is_read=True)
+        DashboardStatsService.invalidate(user_ids=recipient_ids)
         self.message_user(request, f"{queryset.count()} notifications marked as read.")
     mark_as_read.short_description = "Mark selected notifications as read"
     
     def mark_as_unread(self, request, queryset):
+        recipient_ids = list(queryset.values_list('recipient_id', flat=True).distinct())
         queryset.update(is_read=False)
+        DashboardStatsService.invalidate(user_ids=recipient_ids)
         self.message_user(request, f"{queryset.count()} notifications marked as unread.")
     mark_as_unread.short_description = "Mark selected notifications as unread"
 
 
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    """Admin interface for the email outbox."""
+    list_display = ('to_email', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('to_email', 'subject')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'sent_at', 'claimed_at', 'claim_token', 'last_error')
+    
+    actions = ['requeue']
+    
+    def requeue(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(
+            status='queued',
+            attempts=0,
+            next_attempt_at=timezone.now(),
+            claim_token='',
+            claimed_at=None
+        )
+        self.message_user(request, f"{updated} emails requeued.")
+    requeue.short_description = "Requeue selected emails"
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    """Admin interface for generated PDF reports."""
+    list_display = ('report_type', 'status', 'row_count', 'requested_by', 'created_at', 'finished_at')
+    list_filter = ('report_type', 'status', 'created_at')
+    ordering = ('-created_at',)
+    readonly_fields = ('filter_hash', 'data_version', 'created_at', 'finished_at', 'claimed_at', 'claim_token', 'last_error')
+
+
+@admin.register(DocumentBlob)
+class DocumentBlobAdmin(admin.ModelAdmin):
+    """Admin interface for deduplicated document files."""
+    list_display = ('name', 'size', 'ref_count', 'created_at')
+    search_fields = ('name', 'sha256')
+    ordering = ('-ref_count',)
+    readonly_fields = ('name', 'sha256', 'size', 'ref_count', 'created_at')
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    """Admin interface for resumable document uploads."""
+    list_display = ('filename', 'application', 'uploaded_by', 'received', 'size', 'status', 'updated_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('filename', 'uploaded_by__username')
+    ordering = ('-updated_at',)
+    readonly_fields = ('id', 'sha256', 'received', 'document', 'created_at', 'updated_at')
+
+
 # Re-register UserAdmin
 admin.site.unregister(User)
 admin.site.register(User, UserAdmin)
\ No newline at end of file
@@ -2,16 +2,21 @@
 Email and notification services for the Scholarship Management System.
 """
 
-from django.core.mail import send_mail, EmailMultiAlternatives
+from django.core.mail import send_mail, EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.utils.html import escape, strip_tags
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.db.models import QuerySet
 from django.utils import timezone
+from datetime import timedelta
 from typing import List, Optional, Dict, Any
 import logging
+import time
+import uuid
 
-from .models import Notification, Application, Scholarship
+from .models import Notification, Application, Scholarship, OutgoingEmail
+from . import services
 
 logger = logging.getLogger(__name__)
 
@@ -27,23 +32,38 @@ class EmailService:
         context: Dict[str, Any],
         notification_type: str = 'info'
     ) -> bool:
-        """Send notification email to user."""
+        """Send notification email to user.
+        
+        With ``EMAIL_USE_OUTBOX`` enabled (the default) the rendered email is
+        stored in the outbox and delivered later by ``run_email_worker``, so
+        no SMTP round-trip happens inside the request.
+        """
+        if not recipient.email:
+            logger.warning(f'Not emailing {recipient.username}: no email address')
+            return False
+        
         try:
             # Create email content from template
             html_content = render_to_string(f'emails/{template_name}.html', context)
             text_content = strip_tags(html_content)
             
-            # Create email message
-            email = EmailMultiAlternatives(
-                subject=subject,
-                body=text_content,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[recipient.email]
-            )
-            email.attach_alternative(html_content, "text/html")
+            if getattr(settings, 'EMAIL_USE_OUTBOX', True):
+                EmailService.queue_email(
+                    to_email=recipient.email,
+                    subject=subject,
+                    body_text=text_content,
+                    body_html=html_content
+                )
+                logger.info(f'Email queued for {recipient.email}: {subject}')
+                return True
             
             # Send email
-            email.send()
+            EmailService.build_message(
+                to_email=recipient.email,
+                subject=subject,
+                body_text=text_content,
+                body_html=html_content
+            ).send()
             
             logger.info(f'Email sent successfully to {recipient.email}: {subject}')
             return True
@@ -52,6 +72,44 @@ class EmailService:
             logger.error(f'Failed to send email to {recipient.email}: {str(e)}')
             return False
     
+    @staticmethod
+    def build_message(
+        to_email: str,
+        subject: str,
+        body_text: str,
+        body_html: str = '',
+        from_email: Optional[str] = None,
+        connection=None
+    ) -> EmailMultiAlternatives:
+        """Build a plain-text email with an optional HTML alternative."""
+        email = EmailMultiAlternatives(
+            subject=subject,
+            body=body_text,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            to=[to_email],
+            connection=connection
+        )
+        if body_html:
+            email.attach_alternative(body_html, "text/html")
+        return email
+    
+    @staticmethod
+    def queue_email(
+        to_email: str,
+        subject: str,
+        body_text: str,
+        body_html: str = '',
+        from_email: Optional[str] = None
+    ) -> OutgoingEmail:
+        """Store an email in the outbox for the background worker."""
+        return OutgoingEmail.objects.create(
+            to_email=to_email,
+            from_email=from_email or '',
+            subject=subject[:255],
+            body_text=body_text,
+            body_html=body_html
+        )
+    
     @staticmethod
     def send_application_notification(application: Application, notification_type: str) -> bool:
         """Send application-related notification email."""
@@ -121,9 +179,11 @@ class EmailService:
     
     @staticmethod
     def send_scholarship_notification(scholarship: Scholarship, notification_type: str, recipients: List[User] = None) -> int:
-        \"\"\"Send scholarship-related notification emails.\"\"\"
-        sent_count = 0
+        """Send scholarship-related notification emails.
         
+        The template is rendered once per call and delivered in chunks over a
+        single connection by :class:`BatchMailer`.
+        """
         context = {
             'scholarship': scholarship,
             'site_name': 'Scholarship Management System',
@@ -139,17 +199,6 @@ class EmailService:
                     profile__user_type='student',
                     is_active=True
                 )
-            
-            for recipient in recipients:
-                context['user'] = recipient
-                if EmailService.send_notification_email(
-                    recipient=recipient,
-                    subject=subject,
-                    template_name=template,
-                    context=context,
-                    notification_type='info'
-                ):
-                    sent_count += 1
         
         elif notification_type == 'deadline_reminder':
             subject = f'Deadline Reminder: {scholarship.title}'
@@ -157,7 +206,7 @@ class EmailService:
             
             # Get students who haven't applied yet
             if recipients is None:
-                applied_users = scholarship.applications.values_list('user_id', flat=True)
+                applied_users = scholarship.applications.values_list('student_id', flat=True)
                 recipients = User.objects.filter(
                     profile__user_type='student',
                     is_active=True
@@ -165,23 +214,16 @@ class EmailService:
             
             days_left = (scholarship.application_deadline - timezone.now()).days
             context['days_left'] = days_left
-            
-            for recipient in recipients:
-                context['user'] = recipient
-                if EmailService.send_notification_email(
-                    recipient=recipient,
-                    subject=subject,
-                    template_name=template,
-                    context=context,
-                    notification_type='warning'
-                ):
-                    sent_count += 1
         
-        return sent_count
+        else:
+            return 0
+        
+        metrics = BatchMailer(subject=subject, template_name=template, context=context).send(recipients)
+        return metrics['sent']
     
     @staticmethod
     def send_admin_notification(scholarship: Scholarship, notification_type: str) -> bool:
-        \"\"\"Send notifications to administrators.\"\"\"
+        """Send notifications to administrators."""
         admin_users = User.objects.filter(profile__user_type='admin', is_active=True)
         
         context = {
@@ -215,8 +257,132 @@ class EmailService:
         return sent_count > 0
 
 
+class _RecipientPlaceholder:
+    """Stand-in ``user`` whose fields render as substitution tokens."""
+    
+    def __init__(self, tokens: Dict[str, str]):
+        self._tokens = tokens
+        self.first_name = tokens['first_name']
+        self.last_name = tokens['last_name']
+        self.username = tokens['username']
+        self.email = tokens['email']
+    
+    def get_full_name(self):
+        return self._tokens['full_name']
+    
+    def get_short_name(self):
+        return self._tokens['first_name']
+
+
+class BatchMailer:
+    """Send one templated email to many recipients efficiently.
+    
+    The template is rendered once with placeholder tokens in place of the
+    recipient's name, username and email; each message is then produced by
+    plain string substitution. Messages are sent in chunks of ``chunk_size``
+    over a single connection, and :meth:`send` returns throughput metrics.
+    """
+    
+    RECIPIENT_FIELDS = ('full_name', 'first_name', 'last_name', 'username', 'email')
+    
+    def __init__(
+        self,
+        subject: str,
+        template_name: str,
+        context: Dict[str, Any],
+        chunk_size: int = 500,
+        connection=None
+    ):
+        self.subject = subject
+        self.template_name = template_name
+        self.context = context
+        self.chunk_size = chunk_size
+        self.connection = connection
+        self.tokens = {field: f'[[recipient:{field}:{uuid.uuid4().hex[:8]}]]' for field in self.RECIPIENT_FIELDS}
+    
+    def render(self):
+        """Render the HTML and text bodies once with placeholder tokens."""
+        context = dict(self.context, user=_RecipientPlaceholder(self.tokens))
+        html_content = render_to_string(f'emails/{self.template_name}.html', context)
+        return html_content, strip_tags(html_content)
+    
+    def personalize(self, content: str, recipient: User, html: bool) -> str:
+        """Substitute a recipient's values for the placeholder tokens."""
+        values = {
+            'full_name': recipient.get_full_name() or recipient.username,
+            'first_name': recipient.first_name,
+            'last_name': recipient.last_name,
+            'username': recipient.username,
+            'email': recipient.email,
+        }
+        for field, token in self.tokens.items():
+            value = values[field]
+            content = content.replace(token, escape(value) if html else value)
+        return content
+    
+    def _iter_recipients(self, recipients):
+        if isinstance(recipients, QuerySet):
+            return recipients.only(
+                'id', 'email', 'first_name', 'last_name', 'username'
+            ).iterator(chunk_size=self.chunk_size)
+        return iter(recipients)
+    
+    def send(self, recipients) -> Dict[str, Any]:
+        """Send to every recipient with an email address.
+        
+        Returns the number of messages sent, failed and skipped, the elapsed
+        time and the throughput in messages per second.
+        """
+        started = time.perf_counter()
+        html_template, text_template = self.render()
+        metrics = {'sent': 0, 'failed': 0, 'skipped': 0}
+        
+        connection = self.connection or get_connection(fail_silently=True)
+        connection.open()
+        try:
+            chunk = []
+            for recipient in self._iter_recipients(recipients):
+                if not recipient.email:
+                    metrics['skipped'] += 1
+                    continue
+                chunk.append(EmailService.build_message(
+                    to_email=recipient.email,
+                    subject=self.subject,
+                    body_text=self.personalize(text_template, recipient, html=False),
+                    body_html=self.personalize(html_template, recipient, html=True),
+                    connection=connection
+                ))
+                if len(chunk) >= self.chunk_size:
+                    self._send_chunk(connection, chunk, metrics)
+                    chunk = []
+            if chunk:
+                self._send_chunk(connection, chunk, metrics)
+        finally:
+            connection.close()
+        
+        elapsed = time.perf_counter() - started
+        metrics['elapsed_seconds'] = elapsed
+        metrics['messages_per_second'] = metrics['sent'] / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f'Batch mail "{self.subject}": {metrics["sent"]} sent, {metrics["failed"]} failed, '
+            f'{metrics["skipped"]} skipped in {elapsed:.2f}s ({metrics["messages_per_second"]:.0f} msg/s)'
+        )
+        return metrics
+    
+    def _send_chunk(self, connection, chunk, metrics: Dict[str, Any]) -> None:
+        # The connection is fail-silent, so a refused message is reported
+        # through the returned count instead of aborting the whole chunk.
+        try:
+            sent = connection.send_messages(chunk) or 0
+        except Exception as e:
+            logger.error(f'Failed to send chunk of {len(chunk)} emails: {str(e)}')
+            sent = 0
+        metrics['sent'] += sent
+        metrics['failed'] += len(chunk) - sent
+
+
 class NotificationService:
-    \"\"\"Enhanced notification service with email integration.\"\"\"
+    """Enhanced notification service with email integration."""
     
     @staticmethod
     def create_notification(
@@ -227,7 +393,7 @@ class NotificationService:
         related_application: Optional[Application] = None,
         send_email: bool = True
     ) -> Notification:
-        \"\"\"Create a notification and optionally send email.\"\"\"
+        """Create a notification and optionally send email."""
         notification = Notification.objects.create(
             recipient=recipient,
             title=title,
@@ -256,7 +422,7 @@ class NotificationService:
     
     @staticmethod
     def notify_application_status_change(application: Application, old_status: str) -> None:
-        \"\"\"Send notifications when application status changes.\"\"\"
+        """Send notifications when application status changes."""
         # Determine notification type based on status change
         if application.status == 'approved' and old_status != 'approved':
             NotificationService.create_notification(
@@ -300,32 +466,28 @@ class NotificationService:
     
     @staticmethod
     def notify_new_scholarship(scholarship: Scholarship) -> int:
-        \"\"\"Notify all students about a new scholarship.\"\"\"
+        """Notify all students about a new scholarship."""
         students = User.objects.filter(
             profile__user_type='student',
             is_active=True
         )
         
-        notification_count = 0
-        
-        for student in students:
-            NotificationService.create_notification(
-                recipient=student,
-                title='New Scholarship Available!',
-                message=f'A new scholarship \"{scholarship.title}\" is now available for applications.',
-                notification_type='info',
-                send_email=False  # Will send bulk email separately
-            )
-            notification_count += 1
+        # Email is sent in bulk separately below
+        result = services.NotificationService.fan_out(
+            students,
+            title='New Scholarship Available!',
+            message=f'A new scholarship "{scholarship.title}" is now available for applications.',
+            notification_type='info'
+        )
         
         # Send bulk email notification
         EmailService.send_scholarship_notification(scholarship, 'new_scholarship')
         
-        return notification_count
+        return result['created']
     
     @staticmethod
     def send_deadline_reminders() -> int:
-        \"\"\"Send deadline reminders for scholarships closing soon.\"\"\"
+        """Send deadline reminders for scholarships closing soon."""
         from datetime import timedelta
         
         # Find scholarships closing in the next 3 days
@@ -340,7 +502,7 @@ class NotificationService:
         
         for scholarship in scholarships_closing:
             # Get students who haven't applied yet
-            applied_users = scholarship.applications.values_list('user_id', flat=True)
+            applied_users = scholarship.applications.values_list('student_id', flat=True)
             students_to_notify = User.objects.filter(
                 profile__user_type='student',
                 is_active=True
@@ -348,15 +510,14 @@ class NotificationService:
             
             days_left = (scholarship.application_deadline - timezone.now()).days
             
-            for student in students_to_notify:
-                NotificationService.create_notification(
-                    recipient=student,
-                    title='Scholarship Deadline Reminder',
-                    message=f'Only {days_left} day(s) left to apply for {scholarship.title}!',
-                    notification_type='warning',
-                    send_email=False  # Will send bulk email separately
-                )
-                total_notifications += 1
+            # Email is sent in bulk separately below
+            result = services.NotificationService.fan_out(
+                students_to_notify,
+                title='Scholarship Deadline Reminder',
+                message=f'Only {days_left} day(s) left to apply for {scholarship.title}!',
+                notification_type='warning'
+            )
+            total_notifications += result['created']
             
             # Send bulk email reminders
             EmailService.send_scholarship_notification(
@@ -367,7 +528,7 @@ class NotificationService:
     
     @staticmethod
     def mark_notifications_read(user: User, notification_ids: List[int] = None) -> int:
-        \"\"\"Mark notifications as read for a user.\"\"\"
+        """Mark notifications as read for a user."""
         notifications = Notification.objects.filter(
             recipient=user,
             is_read=False
@@ -385,11 +546,136 @@ class NotificationService:
     
     @staticmethod
     def cleanup_old_notifications(days: int = 30) -> int:
-        \"\"\"Clean up old read notifications.\"\"\"
+        """Clean up old read notifications."""
         cutoff_date = timezone.now() - timezone.timedelta(days=days)
         deleted_count = Notification.objects.filter(
             is_read=True,
             created_at__lt=cutoff_date
         ).delete()[0]
         
-        return deleted_count
\ No newline at end of file
+        return deleted_count
+
+
+class EmailOutboxWorker:
+    """Deliver queued ``OutgoingEmail`` rows in batches.
+    
+    Each batch is claimed with a conditional UPDATE (so several workers can
+    run side by side) and sent over a single connection from
+    ``get_connection()``. Failed messages are retried with exponential
+    backoff and moved to the ``dead`` status after ``max_attempts``.
+    """
+    
+    MAX_BACKOFF_SECONDS = 6 * 60 * 60
+    
+    def __init__(
+        self,
+        batch_size: int = 100,
+        max_attempts: Optional[int] = None,
+        backoff_seconds: Optional[int] = None,
+        claim_timeout_seconds: Optional[int] = None
+    ):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts or getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+        self.backoff_seconds = backoff_seconds or getattr(settings, 'EMAIL_OUTBOX_BACKOFF_SECONDS', 60)
+        self.claim_timeout = timedelta(
+            seconds=claim_timeout_seconds or getattr(settings, 'EMAIL_OUTBOX_CLAIM_TIMEOUT', 600)
+        )
+    
+    def backoff_for(self, attempts: int) -> timedelta:
+        """Delay before the next attempt after ``attempts`` failures."""
+        seconds = self.backoff_seconds * (2 ** max(attempts - 1, 0))
+        return timedelta(seconds=min(seconds, self.MAX_BACKOFF_SECONDS))
+    
+    def release_stale_claims(self) -> int:
+        """Requeue emails claimed by a worker that never finished them."""
+        return OutgoingEmail.objects.filter(
+            status='sending',
+            claimed_at__lt=timezone.now() - self.claim_timeout
+        ).update(status='queued', claim_token='', claimed_at=None)
+    
+    def claim_batch(self) -> List[OutgoingEmail]:
+        """Atomically claim up to ``batch_size`` due emails for this worker."""
+        now = timezone.now()
+        due_ids = list(
+            OutgoingEmail.objects.filter(
+                status='queued',
+                next_attempt_at__lte=now
+            ).order_by('next_attempt_at', 'id').values_list('id', flat=True)[:self.batch_size]
+        )
+        if not due_ids:
+            return []
+        
+        token = uuid.uuid4().hex
+        OutgoingEmail.objects.filter(id__in=due_ids, status='queued').update(
+            status='sending',
+            claim_token=token,
+            claimed_at=now
+        )
+        return list(OutgoingEmail.objects.filter(claim_token=token, status='sending').order_by('id'))
+    
+    def process_batch(self) -> Dict[str, int]:
+        """Claim and deliver one batch; return counts per outcome."""
+        self.release_stale_claims()
+        emails = self.claim_batch()
+        stats = {'claimed': len(emails), 'sent': 0, 'retried': 0, 'dead': 0}
+        if not emails:
+            return stats
+        
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            logger.error(f'Could not open email connection: {str(e)}')
+            for email in emails:
+                self._record_failure(email, e, stats)
+        else:
+            try:
+                for email in emails:
+                    self._deliver(email, connection, stats)
+            finally:
+                connection.close()
+        
+        OutgoingEmail.objects.bulk_update(
+            emails,
+            ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at', 'claim_token', 'claimed_at']
+        )
+        return stats
+    
+    def _deliver(self, email: OutgoingEmail, connection, stats: Dict[str, int]) -> None:
+        message = EmailService.build_message(
+            to_email=email.to_email,
+            subject=email.subject,
+            body_text=email.body_text,
+            body_html=email.body_html,
+            from_email=email.from_email or None,
+            connection=connection
+        )
+        try:
+            if not connection.send_messages([message]):
+                raise RuntimeError('Message was not accepted by the email backend')
+        except Exception as e:
+            logger.warning(f'Failed to send email {email.pk} to {email.to_email}: {str(e)}')
+            self._record_failure(email, e, stats)
+            return
+        
+        email.attempts += 1
+        email.status = 'sent'
+        email.sent_at = timezone.now()
+        email.last_error = ''
+        email.claim_token = ''
+        email.claimed_at = None
+        stats['sent'] += 1
+    
+    def _record_failure(self, email: OutgoingEmail, error: Exception, stats: Dict[str, int]) -> None:
+        email.attempts += 1
+        email.last_error = str(error)
+        email.claim_token = ''
+        email.claimed_at = None
+        if email.attempts >= self.max_attempts:
+            email.status = 'dead'
+            stats['dead'] += 1
+            logger.error(f'Email {email.pk} to {email.to_email} moved to dead letter after {email.attempts} attempts')
+        else:
+            email.status = 'queued'
+            email.next_attempt_at = timezone.now() + self.backoff_for(email.attempts)
+            stats['retried'] += 1
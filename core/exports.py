@@ -0,0 +1,272 @@
+"""
+Streaming CSV and XLSX exports of application listings.
+
+Exports read the filtered queryset with ``.values()`` and ``.iterator()`` and
+write each row to the response as soon as it is fetched, so memory use stays
+flat however many rows are exported. XLSX files are built with ``zipfile``
+directly: the worksheet is one deflated zip member written row by row, with
+strings stored inline so no shared-strings table has to be held in memory.
+"""
+
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+
+from .models import UserProfile
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# Rows fetched from the database per round trip.
+CHUNK_SIZE = 2000
+
+# Worksheet rows written between two flushes of the zip buffer.
+XLSX_FLUSH_ROWS = 500
+
+CAMPUS_LABELS = dict(UserProfile.CAMPUS_CHOICES)
+YEAR_LEVEL_LABELS = dict(UserProfile.YEAR_LEVEL_CHOICES)
+
+# Spreadsheet apps treat cells starting with these as formulas.
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Characters XML 1.0 does not allow, even escaped.
+_XML_ILLEGAL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+
+class Column:
+    """One export column built from one or more ``.values()`` fields.
+
+    ``format`` receives the field values in order; without it the column
+    is the single field's value.
+    """
+
+    def __init__(self, header, *fields, format=None):
+        self.header = header
+        self.fields = fields
+        self.format = format
+
+    def value(self, row):
+        values = [row[field] for field in self.fields]
+        if self.format is not None:
+            return self.format(*values)
+        return values[0]
+
+
+def full_name(first_name, last_name):
+    return f'{first_name} {last_name}'.strip()
+
+
+def label(choices):
+    return lambda value: choices.get(value, value or '')
+
+
+AWARDEE_COLUMNS = [
+    Column('Student Name', 'student__first_name', 'student__last_name', format=full_name),
+    Column('Student ID', 'student__profile__student_id'),
+    Column('Email', 'student__email'),
+    Column('Campus', 'student__profile__campus', format=label(CAMPUS_LABELS)),
+    Column('Year Level', 'student__profile__year_level', format=label(YEAR_LEVEL_LABELS)),
+    Column('Department', 'student__profile__department'),
+    Column('Scholarship', 'scholarship__title'),
+    Column('Award Amount', 'scholarship__award_amount'),
+    Column('GPA', 'gpa'),
+    Column('Approved Date', 'final_decision_at'),
+]
+
+APPLICATION_COLUMNS = [
+    Column('Application ID', 'id'),
+    Column('Student Name', 'student__first_name', 'student__last_name', format=full_name),
+    Column('Username', 'student__username'),
+    Column('Scholarship', 'scholarship__title'),
+    Column('Status', 'status'),
+    Column('GPA', 'gpa'),
+    Column('Submitted', 'submitted_at'),
+    Column('Reviewed By', 'reviewed_by__username'),
+    Column('Reviewed', 'reviewed_at'),
+]
+
+REVIEW_HISTORY_COLUMNS = [
+    Column('Application ID', 'id'),
+    Column('Student Name', 'student__first_name', 'student__last_name', format=full_name),
+    Column('Student ID', 'student__profile__student_id'),
+    Column('Campus', 'student__profile__campus', format=label(CAMPUS_LABELS)),
+    Column('Scholarship', 'scholarship__title'),
+    Column('Decision', 'status'),
+    Column('OSAS Reviewer', 'reviewed_by__username'),
+    Column('Decided By', 'final_decision_by__username'),
+    Column('Decided', 'final_decision_at'),
+    Column('Comments', 'final_decision_comments'),
+]
+
+
+def export_rows(queryset, columns):
+    """Yield one list of cell values per row of ``queryset``."""
+    fields = list(dict.fromkeys(field for column in columns for field in column.fields))
+    for row in queryset.values(*fields).iterator(chunk_size=CHUNK_SIZE):
+        yield [column.value(row) for column in columns]
+
+
+def _cell_text(value, tz):
+    if isinstance(value, str):
+        return "'" + value if value.startswith(_FORMULA_PREFIXES) else value
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(tz)
+        return value.strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the written text back."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(headers, rows):
+    """Yield a CSV file, one encoded line at a time."""
+    writer = csv.writer(_Echo())
+    # Looked up once: get_current_timezone() is slow enough to dominate
+    # when called for every cell.
+    tz = timezone.get_current_timezone()
+    # A byte order mark makes Excel read the file as UTF-8.
+    yield '\ufeff' + writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow([_cell_text(value, tz) for value in row])
+
+
+class _ZipBuffer(io.RawIOBase):
+    """Unseekable sink that ``zipfile`` writes into and the stream drains."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+
+def column_letter(index):
+    """Spreadsheet column name for a zero-based index (0 -> A, 26 -> AA)."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xlsx_row(number, values, letters, tz):
+    cells = []
+    for letter, value in zip(letters, values):
+        ref = f'{letter}{number}'
+        if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+            cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+        elif value is not None and value != '':
+            text = escape(_XML_ILLEGAL.sub('', _cell_text(value, tz)))
+            cells.append(f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'
+
+
+def stream_xlsx(headers, rows, sheet_name='Export'):
+    """Yield an XLSX workbook with one sheet, built while ``rows`` is read."""
+    letters = [column_letter(index) for index in range(len(headers))]
+    tz = timezone.get_current_timezone()
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, xml in _XLSX_PARTS.items():
+            archive.writestr(name, xml)
+        archive.writestr('xl/workbook.xml', _WORKBOOK.format(name=escape(sheet_name[:31])))
+        yield buffer.drain()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write((_SHEET_HEAD + _xlsx_row(1, headers, letters, tz)).encode())
+            for number, row in enumerate(rows, start=2):
+                sheet.write(_xlsx_row(number, row, letters, tz).encode())
+                if number % XLSX_FLUSH_ROWS == 0:
+                    yield buffer.drain()
+            sheet.write(_SHEET_TAIL.encode())
+    yield buffer.drain()
+
+
+def export_response(queryset, columns, fmt, basename, sheet_name='Export'):
+    """Stream ``queryset`` as a CSV or XLSX download named after ``basename``."""
+    if fmt not in FORMATS:
+        raise Http404('Unknown export format.')
+    headers = [column.header for column in columns]
+    rows = export_rows(queryset, columns)
+    if fmt == 'csv':
+        content = stream_csv(headers, rows)
+    else:
+        content = stream_xlsx(headers, rows, sheet_name=sheet_name)
+
+    filename = f'{basename}_{timezone.localdate().isoformat()}.{fmt}'
+    response = StreamingHttpResponse(content, content_type=FORMATS[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -8,10 +8,11 @@ from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import UploadedFile
 from django.conf import settings
+import hashlib
 import os
-from typing import List
+from typing import Dict, List, Optional
 
-from .models import UserProfile, Scholarship, Application, Notification, DocumentRequirement
+from .models import UserProfile, Scholarship, Application, ApplicationDocument, Notification, DocumentRequirement
 
 
 class CustomUserCreationForm(UserCreationForm):
@@ -366,7 +367,13 @@ class ScholarshipForm(forms.ModelForm):
 
 
 class FileUploadValidator:
-    """Validator for uploaded files."""
+    """Validator for uploaded files.
+    
+    ``validate_file`` reads the upload once, a chunk at a time: the first
+    ``SNIFF_BYTES`` go to libmagic for the MIME check while every chunk
+    feeds a SHA-256 digest and a byte count. Memory use is bounded by the
+    chunk size whatever the size of the file.
+    """
     
     # Allowed file types and their MIME types
     ALLOWED_TYPES = {
@@ -382,12 +389,26 @@ class FileUploadValidator:
     # Maximum file size in bytes (10MB)
     MAX_FILE_SIZE = 10 * 1024 * 1024
     
+    # Leading bytes passed to libmagic; enough for it to tell a DOCX from
+    # any other zip file.
+    SNIFF_BYTES = 16 * 1024
+    
+    CHUNK_SIZE = 64 * 1024
+    
     @classmethod
-    def validate_file(cls, uploaded_file: UploadedFile) -> None:
-        """Validate uploaded file."""
+    def validate_file(cls, uploaded_file: UploadedFile, max_size: Optional[int] = None) -> Dict:
+        """Validate uploaded file.
+        
+        Returns ``{'size', 'sha256', 'mime_type'}`` for the file;
+        ``mime_type`` is None when python-magic is not installed. The
+        digest is also set as ``uploaded_file.sha256``.
+        """
+        max_size = max_size or cls.MAX_FILE_SIZE
+        size_error = f"File size must be less than {max_size // (1024*1024)}MB."
+        
         # Check file size
-        if uploaded_file.size > cls.MAX_FILE_SIZE:
-            raise ValidationError(f"File size must be less than {cls.MAX_FILE_SIZE // (1024*1024)}MB.")
+        if uploaded_file.size is not None and uploaded_file.size > max_size:
+            raise ValidationError(size_error)
         
         # Get file extension
         file_extension = os.path.splitext(uploaded_file.name)[1].lower().lstrip('.')
@@ -397,24 +418,42 @@ class FileUploadValidator:
             allowed_extensions = ', '.join(cls.ALLOWED_TYPES.keys())
             raise ValidationError(f"File type '{file_extension}' is not allowed. Allowed types: {allowed_extensions}")
         
-        # Validate MIME type using python-magic (if available)
         try:
-            import magic
-            file_content = uploaded_file.read()
+            digest = hashlib.sha256()
+            header = b''
+            size = 0
+            for chunk in uploaded_file.chunks(cls.CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise ValidationError(size_error)
+                if len(header) < cls.SNIFF_BYTES:
+                    header += chunk[:cls.SNIFF_BYTES - len(header)]
+                digest.update(chunk)
             uploaded_file.seek(0)  # Reset file pointer
             
-            mime_type = magic.from_buffer(file_content, mime=True)
-            
-            allowed_mimes = cls.ALLOWED_TYPES[file_extension]
-            if mime_type not in allowed_mimes:
-                raise ValidationError(f"File content does not match expected type for '{file_extension}' files.")
-                
-        except ImportError:
-            # python-magic not available, skip MIME type validation
-            pass
+            mime_type = cls.sniff_mime_type(header)
+        except ValidationError:
+            raise
         except Exception as e:
             # Other errors in file validation
             raise ValidationError(f"Error validating file: {str(e)}")
+        
+        # python-magic not available: skip MIME type validation
+        if mime_type is not None and mime_type not in cls.ALLOWED_TYPES[file_extension]:
+            raise ValidationError(f"File content does not match expected type for '{file_extension}' files.")
+        
+        # Kept on the file so ContentAddressedStorage need not hash it again.
+        uploaded_file.sha256 = digest.hexdigest()
+        return {'size': size, 'sha256': uploaded_file.sha256, 'mime_type': mime_type}
+    
+    @staticmethod
+    def sniff_mime_type(header: bytes) -> Optional[str]:
+        """MIME type of a file from its leading bytes, or None without python-magic."""
+        try:
+            import magic
+        except ImportError:
+            return None
+        return magic.from_buffer(header, mime=True)
 
 
 class DocumentUploadForm(forms.Form):
@@ -504,25 +543,68 @@ class DynamicApplicationForm(forms.ModelForm):
             }),
         }
     
-    def __init__(self, scholarship=None, *args, **kwargs):
+    def __init__(self, scholarship=None, *args, student=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.scholarship = scholarship
+        self.requirements = list(scholarship.document_requirements.all()) if scholarship else []
+        # Earlier uploads the student may attach again instead of uploading.
+        self.reusable_documents = {}
         
-        if scholarship:
-            # Add dynamic file fields for each document requirement
-            for requirement in scholarship.document_requirements.all():
-                field_name = f'document_{requirement.id}'
-                self.fields[field_name] = forms.FileField(
-                    label=requirement.display_name,
-                    required=requirement.is_required,
-                    help_text=f"{requirement.description or ''} (Max size: {requirement.max_file_size_mb}MB, Formats: {requirement.file_format_requirements})",
-                    widget=forms.FileInput(attrs={
-                        'class': 'form-input w-full border rounded-lg transition-all duration-200',
-                        'accept': self._get_accept_string(requirement.file_format_requirements),
-                        'data-max-size': requirement.max_file_size_mb * 1024 * 1024,  # Convert to bytes
-                    })
+        if student is not None and self.requirements:
+            latest = ApplicationDocument.latest_by_requirement(student)
+            for requirement in self.requirements:
+                document = latest.get(requirement.reuse_key)
+                if document is not None and self._fits_requirement(document.file.name, document.file_size, requirement):
+                    self.reusable_documents[requirement.id] = document
+        
+        # Add dynamic file fields for each document requirement
+        for requirement in self.requirements:
+            field_name = f'document_{requirement.id}'
+            reusable = self.reusable_documents.get(requirement.id)
+            attrs = {
+                'class': 'form-input w-full border rounded-lg transition-all duration-200',
+                'accept': self._get_accept_string(requirement.file_format_requirements),
+                'data-max-size': requirement.max_file_size_mb * 1024 * 1024,  # Convert to bytes
+            }
+            if reusable is not None:
+                # The browser leaves disabled inputs out of the upload.
+                attrs['x-bind:disabled'] = 'reuse'
+            self.fields[field_name] = forms.FileField(
+                label=requirement.display_name,
+                # A reusable file satisfies the requirement; checked in clean().
+                required=requirement.is_required and reusable is None,
+                help_text=f"{requirement.description or ''} (Max size: {requirement.max_file_size_mb}MB, Formats: {requirement.file_format_requirements})",
+                widget=forms.FileInput(attrs=attrs)
+            )
+            if reusable is not None:
+                self.fields[f'reuse_{requirement.id}'] = forms.BooleanField(
+                    label=f'Use {reusable.name} (uploaded {reusable.uploaded_at:%b %d, %Y})',
+                    required=False,
+                    initial=True,
+                    widget=forms.CheckboxInput(attrs={'x-model': 'reuse'})
                 )
     
+    @staticmethod
+    def _fits_requirement(filename, size, requirement):
+        """Whether a file of this name and size meets ``requirement``'s limits."""
+        allowed_formats = [fmt.strip().lower() for fmt in requirement.file_format_requirements.split(',')]
+        return (
+            size <= requirement.max_file_size_mb * 1024 * 1024
+            and filename.split('.')[-1].lower() in allowed_formats
+        )
+    
+    @property
+    def document_fields(self):
+        """Per requirement: its upload field, the reuse checkbox and the reusable document."""
+        return [
+            {
+                'field': self[f'document_{requirement.id}'],
+                'reuse': self[f'reuse_{requirement.id}'] if requirement.id in self.reusable_documents else None,
+                'document': self.reusable_documents.get(requirement.id),
+            }
+            for requirement in self.requirements
+        ]
+    
     def _get_accept_string(self, file_formats):
         """Convert file format requirements to HTML accept attribute."""
         format_mapping = {
@@ -547,40 +629,75 @@ class DynamicApplicationForm(forms.ModelForm):
     def clean(self):
         cleaned_data = super().clean()
         
-        if self.scholarship:
-            # Validate each document requirement
-            for requirement in self.scholarship.document_requirements.all():
-                field_name = f'document_{requirement.id}'
-                file_field = cleaned_data.get(field_name)
-                
-                # Check if field exists in form
-                if field_name not in self.fields:
-                    continue
+        # Validate each document requirement
+        for requirement in self.requirements:
+            field_name = f'document_{requirement.id}'
+            file_field = cleaned_data.get(field_name)
+            
+            # Check if field exists in form
+            if field_name not in self.fields:
+                continue
+            
+            if file_field:
+                # A new upload replaces the earlier file.
+                cleaned_data[f'reuse_{requirement.id}'] = False
+            elif cleaned_data.get(f'reuse_{requirement.id}'):
+                continue
+            
+            if requirement.is_required and not file_field:
+                error_msg = f'{requirement.display_name} is required.'
+                self.add_error(field_name, error_msg)
+            
+            if file_field:
+                # Validate file size
+                max_size = requirement.max_file_size_mb * 1024 * 1024
+                if file_field.size > max_size:
+                    self.add_error(
+                        field_name, 
+                        f'File size must be less than {requirement.max_file_size_mb}MB.'
+                    )
                 
-                if requirement.is_required and not file_field:
-                    error_msg = f'{requirement.display_name} is required.'
-                    self.add_error(field_name, error_msg)
+                # Validate file extension
+                allowed_formats = [fmt.strip().lower() for fmt in requirement.file_format_requirements.split(',')]
+                file_extension = file_field.name.split('.')[-1].lower()
                 
-                if file_field:
-                    # Validate file size
-                    max_size = requirement.max_file_size_mb * 1024 * 1024
-                    if file_field.size > max_size:
-                        self.add_error(
-                            field_name, 
-                            f'File size must be less than {requirement.max_file_size_mb}MB.'
-                        )
-                    
-                    # Validate file extension
-                    allowed_formats = [fmt.strip().lower() for fmt in requirement.file_format_requirements.split(',')]
-                    file_extension = file_field.name.split('.')[-1].lower()
-                    
-                    if file_extension not in allowed_formats:
-                        self.add_error(
-                            field_name,
-                            f'File format "{file_extension}" is not allowed. Allowed formats: {requirement.file_format_requirements}'
-                        )
+                if file_extension not in allowed_formats:
+                    self.add_error(
+                        field_name,
+                        f'File format "{file_extension}" is not allowed. Allowed formats: {requirement.file_format_requirements}'
+                    )
         
         return cleaned_data
+    
+    def save_documents(self, application):
+        """Attach the uploaded or reused file for each requirement to ``application``.
+        
+        Reused documents point at the stored file of the earlier upload, so
+        nothing is copied; ``DocumentBlob`` counts the extra reference.
+        """
+        documents = []
+        for requirement in self.requirements:
+            uploaded_file = self.cleaned_data.get(f'document_{requirement.id}')
+            if uploaded_file:
+                documents.append(ApplicationDocument.objects.create(
+                    application=application,
+                    document_requirement=requirement,
+                    name=f"{requirement.display_name} - {uploaded_file.name}",
+                    file=uploaded_file,
+                    file_size=uploaded_file.size,
+                    content_type=uploaded_file.content_type
+                ))
+            elif self.cleaned_data.get(f'reuse_{requirement.id}'):
+                reused = self.reusable_documents[requirement.id]
+                documents.append(ApplicationDocument.objects.create(
+                    application=application,
+                    document_requirement=requirement,
+                    name=reused.name,
+                    file=reused.file.name,
+                    file_size=reused.file_size,
+                    content_type=reused.content_type
+                ))
+        return documents
 
 
 class ScholarshipFilterForm(forms.Form):
@@ -0,0 +1,273 @@
+"""
+Synthetic data generator for load testing and capacity planning.
+
+``LoadDataGenerator`` writes students, scholarships, applications, documents
+and notifications with ``bulk_create`` in fixed-size batches. All choices come
+from a seeded ``random.Random`` so the same arguments always produce the same
+data set.
+"""
+
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    Application, ApplicationDocument, EligibilityKeyword, Notification,
+    Scholarship, ScholarshipCounter, UserProfile,
+)
+from .services import DashboardStatsService, ScholarshipService
+
+
+# Rough shape of a semester in progress: most applications still waiting on
+# OSAS, a good share already decided by the admins.
+STATUS_WEIGHTS = {
+    'pending': 30,
+    'under_review': 15,
+    'osas_approved': 8,
+    'osas_rejected': 5,
+    'approved': 20,
+    'rejected': 15,
+    'additional_info_required': 7,
+}
+
+REVIEWED_STATUSES = {
+    'under_review', 'osas_approved', 'osas_rejected',
+    'approved', 'rejected', 'additional_info_required',
+}
+DECIDED_STATUSES = {'approved', 'rejected'}
+
+DOCUMENT_NAMES = ['Transcript of Records', 'Certificate of Enrollment', 'Certificate of Indigency', 'Valid ID']
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """Let ``bulk_create`` keep preset values on ``auto_now_add`` fields."""
+    saved = [(field, field.auto_now_add) for field in fields]
+    for field, _ in saved:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now_add in saved:
+            field.auto_now_add = auto_now_add
+
+
+class LoadDataGenerator:
+    """Deterministic bulk generator for production-sized data sets."""
+
+    def __init__(self, seed=0, prefix='load', batch_size=5000, password='load123', stdout=None):
+        self.rng = random.Random(seed)
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.password_hash = make_password(password)
+        self.stdout = stdout
+        self.now = timezone.now()
+        self.campuses = [choice for choice, _ in UserProfile.CAMPUS_CHOICES]
+        self.year_levels = [choice for choice, _ in UserProfile.YEAR_LEVEL_CHOICES]
+        self.statuses = list(STATUS_WEIGHTS)
+        self.status_weights = list(STATUS_WEIGHTS.values())
+
+    def _log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def prefix_in_use(self):
+        """Return True if students with this generator's prefix already exist."""
+        return User.objects.filter(username__startswith=f'{self.prefix}_student').exists()
+
+    def ensure_staff(self, reviewers=3):
+        """Create (or reuse) one admin and ``reviewers`` OSAS users."""
+        def staff_user(username, user_type, first_name, last_name):
+            user, created = User.objects.get_or_create(
+                username=username,
+                defaults={
+                    'first_name': first_name,
+                    'last_name': last_name,
+                    'email': f'{username}@scholar.edu',
+                    'password': self.password_hash,
+                },
+            )
+            if user.profile.user_type != user_type:
+                user.profile.user_type = user_type
+                user.profile.save(update_fields=['user_type'])
+            return user
+
+        admin = staff_user(f'{self.prefix}_admin', 'admin', 'Load', 'Admin')
+        osas_users = [
+            staff_user(f'{self.prefix}_osas{i}', 'osas', 'Load', f'Reviewer {i}')
+            for i in range(1, reviewers + 1)
+        ]
+        return admin, osas_users
+
+    def generate(self, students, scholarships, apps_per_student=3, docs_per_application=1,
+                 notifications_per_student=1, admin=None, reviewers=None):
+        """Generate the data set and return the number of rows per model.
+
+        Students are written in batches of ``batch_size``; each batch inserts
+        its users, profiles, applications, documents and notifications in one
+        transaction. Scholarship counters are rebuilt once at the end.
+        """
+        if admin is None or not reviewers:
+            admin, reviewers = self.ensure_staff()
+
+        scholarship_rows = self._create_scholarships(scholarships, admin)
+        apps_per_student = min(apps_per_student, len(scholarship_rows))
+        totals = {
+            'students': 0,
+            'scholarships': len(scholarship_rows),
+            'applications': 0,
+            'documents': 0,
+            'notifications': 0,
+        }
+
+        for start in range(0, students, self.batch_size):
+            stop = min(start + self.batch_size, students)
+            with transaction.atomic():
+                batch = self._create_students(start, stop)
+                applications = self._create_applications(
+                    batch, scholarship_rows, apps_per_student, admin, reviewers
+                )
+                documents = self._create_documents(applications, docs_per_application)
+                notifications = self._create_notifications(batch, applications, notifications_per_student)
+            totals['students'] += len(batch)
+            totals['applications'] += len(applications)
+            totals['documents'] += documents
+            totals['notifications'] += notifications
+            self._log(f'  {stop}/{students} students, {totals["applications"]} applications')
+
+        scholarship_ids = [scholarship.pk for scholarship in scholarship_rows]
+        ScholarshipCounter.rebuild(scholarship_ids=scholarship_ids)
+        EligibilityKeyword.rebuild(scholarship_ids=scholarship_ids)
+        # bulk_create skips the signals that expire cached stats and keywords.
+        DashboardStatsService.invalidate('applications', 'scholarships', 'notifications')
+        ScholarshipService.invalidate_department_keywords()
+        return totals
+
+    def _create_scholarships(self, count, admin):
+        rng = self.rng
+        scholarships = []
+        for i in range(count):
+            # Roughly one in five scholarships has already closed.
+            days = rng.randint(-60, -1) if rng.random() < 0.2 else rng.randint(7, 180)
+            scholarships.append(Scholarship(
+                title=f'Load Scholarship {self.prefix}-{i + 1}',
+                description=f'Synthetic scholarship {i + 1} for load testing.',
+                eligibility_criteria='Enrolled student in good standing; GPA of 2.5 or higher.',
+                award_amount=Decimal(rng.randrange(5000, 50001, 500)),
+                application_deadline=self.now + timedelta(days=days),
+                available_slots=rng.randint(1, 50),
+                is_active=rng.random() < 0.9,
+                created_by=admin,
+            ))
+        return self._bulk_create(Scholarship, scholarships)
+
+    def _create_students(self, start, stop):
+        rng = self.rng
+        users = self._bulk_create(User, [
+            User(
+                username=f'{self.prefix}_student{i}',
+                first_name='Student',
+                last_name=f'{i:07d}',
+                email=f'{self.prefix}_student{i}@scholar.edu',
+                password=self.password_hash,
+                date_joined=self.now,
+            )
+            for i in range(start, stop)
+        ])
+        if not all(user.pk for user in users):
+            # Backends without RETURNING support leave pk unset.
+            users = list(
+                User.objects.filter(username__in=[user.username for user in users]).order_by('id')
+            )
+        self._bulk_create(UserProfile, [
+            UserProfile(
+                user=user,
+                user_type='student',
+                student_id=f'{self.prefix}-{start + offset:07d}',
+                campus=self.campuses[(start + offset) % len(self.campuses)],
+                department='College of Computing Studies',
+                year_level=rng.choice(self.year_levels),
+            )
+            for offset, user in enumerate(users)
+        ])
+        return users
+
+    def _create_applications(self, students, scholarships, apps_per_student, admin, reviewers):
+        rng = self.rng
+        applications = []
+        for student in students:
+            for scholarship in rng.sample(scholarships, apps_per_student):
+                status = rng.choices(self.statuses, self.status_weights)[0]
+                submitted_at = self.now - timedelta(minutes=rng.randint(60, 180 * 24 * 60))
+                application = Application(
+                    student=student,
+                    scholarship=scholarship,
+                    status=status,
+                    personal_statement='Synthetic personal statement for load testing.',
+                    gpa=Decimal(rng.randint(200, 400)) / 100,
+                    submitted_at=submitted_at,
+                )
+                if status in REVIEWED_STATUSES:
+                    application.reviewed_by = rng.choice(reviewers)
+                    application.reviewed_at = min(
+                        submitted_at + timedelta(hours=rng.randint(1, 240)), self.now
+                    )
+                if status in DECIDED_STATUSES:
+                    application.final_decision_by = admin
+                    application.final_decision_at = min(
+                        application.reviewed_at + timedelta(hours=rng.randint(1, 120)), self.now
+                    )
+                applications.append(application)
+        with explicit_timestamps(Application._meta.get_field('submitted_at')):
+            return self._bulk_create(Application, applications)
+
+    def _create_documents(self, applications, per_application):
+        if not per_application:
+            return 0
+        rng = self.rng
+        documents = [
+            ApplicationDocument(
+                application=application,
+                name=DOCUMENT_NAMES[k % len(DOCUMENT_NAMES)],
+                file=f'application_documents/load/{application.pk}-{k}.pdf',
+                file_size=rng.randint(50 * 1024, 5 * 1024 * 1024),
+                content_type='application/pdf',
+                uploaded_at=application.submitted_at,
+            )
+            for application in applications
+            for k in range(per_application)
+        ]
+        with explicit_timestamps(ApplicationDocument._meta.get_field('uploaded_at')):
+            return len(self._bulk_create(ApplicationDocument, documents))
+
+    def _create_notifications(self, students, applications, per_student):
+        if not per_student:
+            return 0
+        rng = self.rng
+        latest = {}
+        for application in applications:
+            latest[application.student_id] = application
+        notifications = []
+        for student in students:
+            application = latest.get(student.pk)
+            for k in range(per_student):
+                notifications.append(Notification(
+                    recipient=student,
+                    title='Application Update' if application else 'New Scholarship Available',
+                    message='Synthetic notification for load testing.',
+                    notification_type='info',
+                    is_read=rng.random() < 0.6,
+                    related_application=application,
+                    created_at=self.now - timedelta(minutes=rng.randint(1, 90 * 24 * 60)),
+                ))
+        with explicit_timestamps(Notification._meta.get_field('created_at')):
+            return len(self._bulk_create(Notification, notifications))
+
+    def _bulk_create(self, model, objects):
+        return model.objects.bulk_create(objects, batch_size=self.batch_size)
@@ -0,0 +1,90 @@
+"""
+Django management command to distribute pending applications among OSAS reviewers.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.services import ReviewerAssignmentService
+
+
+class Command(BaseCommand):
+    help = 'Assign unclaimed pending applications to OSAS reviewers, balancing their workload'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Assign at most this many applications, oldest first'
+        )
+        
+        parser.add_argument(
+            '--max-open',
+            type=int,
+            default=None,
+            help='Open reviews a reviewer may hold (default: REVIEW_ASSIGNMENT_MAX_OPEN or 25, 0 for no cap)'
+        )
+        
+        parser.add_argument(
+            '--throughput-days',
+            type=int,
+            default=14,
+            help='Days of finished reviews used to weigh each reviewer (default: 14)'
+        )
+        
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Applications written per UPDATE (default: 500)'
+        )
+        
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show the distribution without assigning anything'
+        )
+        
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the distribution report as JSON'
+        )
+    
+    def handle(self, *args, **options):
+        max_open = options['max_open']
+        if max_open is None:
+            max_open = getattr(settings, 'REVIEW_ASSIGNMENT_MAX_OPEN', 25)
+        
+        report = ReviewerAssignmentService.assign_pending(
+            limit=options['limit'],
+            throughput_days=options['throughput_days'],
+            max_open=max_open or None,
+            dry_run=options['dry_run'],
+            batch_size=options['batch_size']
+        )
+        
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        
+        if not report['reviewers']:
+            self.stdout.write(self.style.WARNING('No active OSAS reviewers to assign applications to'))
+        else:
+            self.stdout.write(
+                f"{'Reviewer':<20} {'Campus':<10} {'Recent':>7} {'Open':>6} {'Assigned':>9} {'Campus match':>13} {'Open after':>11}"
+            )
+            for reviewer in report['reviewers']:
+                self.stdout.write(
+                    f"{reviewer['username'][:20]:<20} {reviewer['campus'] or '-':<10} "
+                    f"{reviewer['throughput']:>7} {reviewer['open']:>6} {reviewer['assigned']:>9} "
+                    f"{reviewer['campus_matches']:>13} {reviewer['open'] + reviewer['assigned']:>11}"
+                )
+        
+        verb = 'Would assign' if report['dry_run'] else 'Assigned'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['assigned']} of {report['pending']} pending application(s); "
+            f"{report['unassigned']} left unassigned"
+        ))
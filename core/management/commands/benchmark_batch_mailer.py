@@ -0,0 +1,111 @@
+"""
+Django management command to compare the batch mailer with per-message sending.
+"""
+
+import time
+from decimal import Decimal
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test.utils import override_settings
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from core.email_service import BatchMailer
+from core.models import Scholarship
+
+LOCMEM_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark BatchMailer against the per-message send loop on the locmem email backend'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recipients',
+            type=int,
+            default=10000,
+            help='Number of in-memory recipients to email (default: 10000)'
+        )
+        
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Messages per send_messages() call for the batch mailer (default: 500)'
+        )
+        
+        parser.add_argument(
+            '--skip-legacy',
+            action='store_true',
+            help='Only run the batch mailer'
+        )
+    
+    def handle(self, *args, **options):
+        # Nothing is saved: recipients and the scholarship only live in memory.
+        recipients = [
+            User(
+                username=f'bench{i}',
+                email=f'bench{i}@example.com',
+                first_name='Bench',
+                last_name=f'Student {i}'
+            )
+            for i in range(options['recipients'])
+        ]
+        scholarship = Scholarship(
+            title='Benchmark Scholarship',
+            description='Benchmark',
+            eligibility_criteria='Benchmark',
+            award_amount=Decimal('10000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=10
+        )
+        context = {
+            'scholarship': scholarship,
+            'site_name': 'Scholarship Management System',
+        }
+        subject = f'New Scholarship Available: {scholarship.title}'
+        
+        self.stdout.write(f'Sending {len(recipients)} emails on the locmem backend...')
+        
+        with override_settings(EMAIL_BACKEND=LOCMEM_BACKEND):
+            if not options['skip_legacy']:
+                mail.outbox = []
+                started = time.perf_counter()
+                for recipient in recipients:
+                    context['user'] = recipient
+                    html_content = render_to_string('emails/new_scholarship.html', context)
+                    email = EmailMultiAlternatives(
+                        subject=subject,
+                        body=strip_tags(html_content),
+                        from_email=settings.DEFAULT_FROM_EMAIL,
+                        to=[recipient.email]
+                    )
+                    email.attach_alternative(html_content, 'text/html')
+                    email.send()
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'Per-message loop: {len(mail.outbox)} sent in {elapsed:.2f}s '
+                    f'({len(mail.outbox) / elapsed:.0f} msg/s)'
+                )
+            
+            mail.outbox = []
+            metrics = BatchMailer(
+                subject=subject,
+                template_name='new_scholarship',
+                context={key: value for key, value in context.items() if key != 'user'},
+                chunk_size=options['chunk_size'],
+                connection=get_connection(LOCMEM_BACKEND)
+            ).send(recipients)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Batch mailer: {metrics['sent']} sent, {metrics['failed']} failed in "
+                    f"{metrics['elapsed_seconds']:.2f}s ({metrics['messages_per_second']:.0f} msg/s)"
+                )
+            )
+            mail.outbox = []
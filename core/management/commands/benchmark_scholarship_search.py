@@ -0,0 +1,148 @@
+"""
+Django management command to compare full-text scholarship search with the
+old three-column icontains filter.
+"""
+
+import random
+import time
+from decimal import Decimal
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.middleware import percentile
+from core.models import Scholarship
+from core.search import fts_available, search_scholarships
+
+FIELDS = [
+    'Engineering', 'Nursing', 'Education', 'Agriculture', 'Computer Science',
+    'Information Technology', 'Business Administration', 'Criminology',
+    'Fisheries', 'Forestry', 'Mathematics', 'Accountancy',
+]
+SPONSORS = ['Provincial', 'Municipal', 'Alumni', 'Foundation', 'Merit', 'Athletic', 'Indigenous Peoples', 'Cooperative']
+CRITERIA = [
+    'GPA of at least {gpa}', 'enrolled full time', 'from a low-income household',
+    'resident of Zamboanga del Sur', 'no failing grades', 'active in campus organizations',
+    'member of an indigenous community', 'varsity athlete',
+]
+# Keystroke-by-keystroke type-ahead plus a few complete phrases.
+QUERIES = [
+    'en', 'eng', 'engin', 'engineering',
+    'nu', 'nur', 'nursing merit',
+    'comp', 'computer sci', 'computer science foundation',
+    'low-income', 'indigenous', 'zamboanga', 'varsity athlete',
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark FTS5 scholarship search against icontains on a generated data set (rolled back afterwards)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scholarships',
+            type=int,
+            default=10000,
+            help='Number of scholarships to generate (default: 10000)'
+        )
+        
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Times each query is run per method (default: 20)'
+        )
+        
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the generated scholarships (default: 42)'
+        )
+    
+    def handle(self, *args, **options):
+        if not fts_available():
+            raise CommandError('The FTS5 scholarship index is not available; run migrate on a SQLite database first.')
+        
+        try:
+            with transaction.atomic():
+                self._generate(options['scholarships'], options['seed'])
+                self._benchmark(options['repeat'])
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write('Generated scholarships rolled back.')
+    
+    def _generate(self, count, seed):
+        rng = random.Random(seed)
+        admin, _ = User.objects.get_or_create(username='search_benchmark_admin')
+        now = timezone.now()
+        scholarships = []
+        for i in range(count):
+            field = rng.choice(FIELDS)
+            sponsor = rng.choice(SPONSORS)
+            criteria = rng.sample(CRITERIA, 3)
+            scholarships.append(Scholarship(
+                title=f'{sponsor} {field} Scholarship {i + 1}',
+                description=(
+                    f'Financial assistance from the {sponsor.lower()} program for '
+                    f'{field.lower()} students covering tuition and books.'
+                ),
+                eligibility_criteria='; '.join(c.format(gpa=rng.choice(['2.5', '3.0', '3.5'])) for c in criteria),
+                award_amount=Decimal(rng.randrange(5000, 50001, 500)),
+                application_deadline=now + timedelta(days=rng.randint(1, 180)),
+                available_slots=rng.randint(1, 50),
+                created_by=admin,
+            ))
+        started = time.perf_counter()
+        Scholarship.objects.bulk_create(scholarships, batch_size=2000)
+        self.stdout.write(f'Inserted and indexed {count} scholarships in {time.perf_counter() - started:.2f}s')
+    
+    def _benchmark(self, repeat):
+        base = Scholarship.objects.filter(is_active=True, application_deadline__gt=timezone.now())
+        
+        def legacy(query):
+            return list(base.filter(
+                Q(title__icontains=query) |
+                Q(description__icontains=query) |
+                Q(eligibility_criteria__icontains=query)
+            )[:5])
+        
+        def fts(query):
+            return list(search_scholarships(base, query).order_by('search_rank')[:5])
+        
+        def legacy_page(query):
+            queryset = base.filter(
+                Q(title__icontains=query) |
+                Q(description__icontains=query) |
+                Q(eligibility_criteria__icontains=query)
+            ).order_by('application_deadline')
+            return queryset.count(), list(queryset[:9])
+        
+        def fts_page(query):
+            queryset = search_scholarships(base, query).order_by('search_rank', 'application_deadline')
+            return queryset.count(), list(queryset[:9])
+        
+        self.stdout.write(f'{"method":<28}{"p50 ms":>10}{"p95 ms":>10}{"max ms":>10}')
+        for label, method in [
+            ('icontains type-ahead (5)', legacy),
+            ('fts5 type-ahead (5)', fts),
+            ('icontains list page (9)', legacy_page),
+            ('fts5 list page (9)', fts_page),
+        ]:
+            timings = []
+            for query in QUERIES:
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    method(query)
+                    timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            self.stdout.write(
+                f'{label:<28}{percentile(timings, 50):>10.2f}{percentile(timings, 95):>10.2f}{timings[-1]:>10.2f}'
+            )
@@ -0,0 +1,32 @@
+"""
+Django management command to remove resumable uploads that were never
+finished, together with their partial files.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from core.uploads import collect_garbage
+
+
+class Command(BaseCommand):
+    help = 'Delete stale chunked upload sessions and partial upload files'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age-hours',
+            type=float,
+            default=None,
+            help='Remove uploads idle for longer than this (default: CHUNKED_UPLOAD_EXPIRY)'
+        )
+    
+    def handle(self, *args, **options):
+        max_age = None
+        if options['max_age_hours'] is not None:
+            max_age = timedelta(hours=options['max_age_hours'])
+        
+        removed = collect_garbage(max_age=max_age)
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed['sessions']} upload session(s) and {removed['files']} partial file(s) "
+            f"({removed['bytes']} bytes)"
+        ))
@@ -0,0 +1,99 @@
+"""
+Django management command to move existing application documents into
+content-addressed storage, keeping one copy of each distinct file.
+"""
+
+import os
+
+from django.core.management.base import BaseCommand
+from core.models import ApplicationDocument, DocumentBlob
+from core.storage import blob_name, blob_sha256, file_sha256
+
+
+class Command(BaseCommand):
+    help = 'Deduplicate uploaded application documents and report the disk space reclaimed'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Hash the files and report what would be reclaimed without changing anything'
+        )
+        
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Files moved between two reference count rebuilds (default: 500)'
+        )
+    
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        field = ApplicationDocument._meta.get_field('file')
+        storage = field.storage
+        directory = field.upload_to.rstrip('/')
+        
+        legacy = [
+            name for name in ApplicationDocument.objects.exclude(file='').order_by('file')
+            .values_list('file', flat=True).distinct().iterator()
+            if not blob_sha256(name)
+        ]
+        self.stdout.write(f'Found {len(legacy)} file(s) outside content-addressed storage')
+        
+        totals = {'moved': 0, 'duplicates': 0, 'missing': 0, 'removed_bytes': 0, 'written_bytes': 0, 'orphans': 0}
+        planned = set()
+        targets = []
+        for name in legacy:
+            if not storage.exists(name):
+                totals['missing'] += 1
+                self.stdout.write(self.style.WARNING(f'Missing file: {name}'))
+                continue
+            
+            size = storage.size(name)
+            with storage.open(name, 'rb') as source:
+                digest = file_sha256(source)
+            extension = os.path.splitext(name)[1]
+            target = blob_name(directory, digest, extension)
+            if storage.exists(target) or target in planned:
+                totals['duplicates'] += 1
+            else:
+                totals['written_bytes'] += size
+            totals['removed_bytes'] += size
+            totals['moved'] += 1
+            
+            if dry_run:
+                planned.add(target)
+                continue
+            
+            if not storage.exists(target):
+                with storage.open(name, 'rb') as source:
+                    source.sha256 = digest
+                    storage.save(f'{directory}/{digest}{extension}', source)
+            ApplicationDocument.objects.filter(file=name).update(file=target)
+            storage.delete(name)
+            
+            targets.append(target)
+            if len(targets) >= options['batch_size']:
+                DocumentBlob.rebuild(names=targets)
+                targets = []
+        
+        if not dry_run:
+            if targets:
+                DocumentBlob.rebuild(names=targets)
+            # Files left behind by documents deleted outside the signals.
+            for blob in DocumentBlob.rebuild():
+                if storage.exists(blob.name):
+                    totals['removed_bytes'] += storage.size(blob.name)
+                    storage.delete(blob.name)
+                blob.delete()
+                totals['orphans'] += 1
+        
+        reclaimed = totals['removed_bytes'] - totals['written_bytes']
+        verb = 'Would move' if dry_run else 'Moved'
+        self.stdout.write(
+            f"{verb} {totals['moved']} file(s): {totals['duplicates']} duplicate(s), "
+            f"{totals['missing']} missing, {totals['orphans']} unreferenced file(s) removed"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Would reclaim' if dry_run else 'Reclaimed'} {reclaimed} bytes ({reclaimed / (1024 * 1024):.1f} MB)"
+        ))
@@ -0,0 +1,35 @@
+"""
+Django management command to rebuild the eligibility keyword index.
+"""
+
+from django.core.management.base import BaseCommand
+from core.models import EligibilityKeyword
+from core.services import ScholarshipService
+
+
+class Command(BaseCommand):
+    help = 'Recompute EligibilityKeyword rows from scholarship eligibility criteria'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scholarship',
+            type=int,
+            action='append',
+            dest='scholarship_ids',
+            help='Only rebuild keywords for this scholarship ID (can be repeated)'
+        )
+    
+    def handle(self, *args, **options):
+        scholarship_ids = options['scholarship_ids']
+        
+        if scholarship_ids:
+            self.stdout.write(f'Rebuilding keywords for scholarships: {", ".join(map(str, scholarship_ids))}')
+        else:
+            self.stdout.write('Rebuilding keywords for all scholarships...')
+        
+        written = EligibilityKeyword.rebuild(scholarship_ids=scholarship_ids)
+        ScholarshipService.invalidate_department_keywords()
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully wrote {written} keyword row(s)')
+        )
@@ -0,0 +1,33 @@
+"""
+Django management command to rebuild the denormalized scholarship counters.
+"""
+
+from django.core.management.base import BaseCommand
+from core.models import ScholarshipCounter
+
+
+class Command(BaseCommand):
+    help = 'Recompute ScholarshipCounter rows from the applications table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scholarship',
+            type=int,
+            action='append',
+            dest='scholarship_ids',
+            help='Only rebuild the counter for this scholarship ID (can be repeated)'
+        )
+    
+    def handle(self, *args, **options):
+        scholarship_ids = options['scholarship_ids']
+        
+        if scholarship_ids:
+            self.stdout.write(f'Rebuilding counters for scholarships: {", ".join(map(str, scholarship_ids))}')
+        else:
+            self.stdout.write('Rebuilding counters for all scholarships...')
+        
+        rebuilt = ScholarshipCounter.rebuild(scholarship_ids=scholarship_ids)
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt {rebuilt} scholarship counter(s)')
+        )
@@ -0,0 +1,18 @@
+"""
+Django management command to rebuild the scholarship full-text search index.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from core.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Recreate missing FTS5 search triggers and re-index every scholarship (SQLite only)'
+    
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding scholarship search index...')
+        
+        if not rebuild_search_index():
+            raise CommandError('Full-text search needs SQLite with FTS5; searches use the icontains fallback.')
+        
+        self.stdout.write(self.style.SUCCESS('Successfully rebuilt the scholarship search index'))
@@ -0,0 +1,77 @@
+"""
+Django management command to deliver queued notification emails.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from core.email_service import EmailOutboxWorker
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails from the outbox in batches over a reused connection'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of emails to claim and send per batch (default: 100)'
+        )
+        
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep when the outbox is empty (default: 5)'
+        )
+        
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=None,
+            help='Attempts before an email is dead-lettered (default: EMAIL_OUTBOX_MAX_ATTEMPTS or 5)'
+        )
+        
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the emails that are currently due and exit'
+        )
+    
+    def handle(self, *args, **options):
+        worker = EmailOutboxWorker(
+            batch_size=options['batch_size'],
+            max_attempts=options['max_attempts']
+        )
+        once = options['once']
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Email worker started (batch size {worker.batch_size})')
+        )
+        
+        totals = {'claimed': 0, 'sent': 0, 'retried': 0, 'dead': 0}
+        try:
+            while True:
+                stats = worker.process_batch()
+                for key, value in stats.items():
+                    totals[key] += value
+                
+                if stats['claimed']:
+                    self.stdout.write(
+                        f"Batch: {stats['sent']} sent, {stats['retried']} retrying, {stats['dead']} dead-lettered"
+                    )
+                
+                if stats['claimed'] < worker.batch_size:
+                    if once:
+                        break
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Email worker interrupted'))
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Email worker finished: {totals['sent']} sent, {totals['retried']} retrying, "
+                f"{totals['dead']} dead-lettered"
+            )
+        )
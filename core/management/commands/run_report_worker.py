@@ -0,0 +1,65 @@
+"""
+Django management command to generate queued PDF reports.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from core.reports import ReportWorker
+
+
+class Command(BaseCommand):
+    help = 'Generate queued PDF award and decision reports'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep when no report is queued (default: 5)'
+        )
+        
+        parser.add_argument(
+            '--claim-timeout',
+            type=int,
+            default=None,
+            help='Seconds before a running job is handed out again (default: REPORT_WORKER_CLAIM_TIMEOUT or 900)'
+        )
+        
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Generate the reports that are currently queued and exit'
+        )
+    
+    def handle(self, *args, **options):
+        worker = ReportWorker(claim_timeout_seconds=options['claim_timeout'])
+        once = options['once']
+        
+        self.stdout.write(self.style.SUCCESS('Report worker started'))
+        
+        totals = {'done': 0, 'failed': 0}
+        try:
+            while True:
+                job = worker.process_next()
+                if job is None:
+                    if once:
+                        break
+                    time.sleep(options['interval'])
+                    continue
+                
+                totals[job.status] += 1
+                if job.status == 'done':
+                    self.stdout.write(
+                        f'Report {job.pk} ({job.report_type}): {job.row_count} rows -> {job.file.name}'
+                    )
+                else:
+                    self.stdout.write(
+                        self.style.ERROR(f'Report {job.pk} ({job.report_type}) failed: {job.last_error}')
+                    )
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Report worker interrupted'))
+        
+        self.stdout.write(
+            self.style.SUCCESS(f"Report worker finished: {totals['done']} generated, {totals['failed']} failed")
+        )
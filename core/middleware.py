@@ -0,0 +1,195 @@
+"""
+Per-request profiling middleware.
+
+``RequestProfilingMiddleware`` records wall time, query count, database time
+and template render time for every request, keyed by URL name (for example
+``core:review_queue``). Requests slower than ``REQUEST_PROFILING_SLOW_MS`` are
+logged to the ``core.profiling`` logger as JSON together with their slowest
+queries, and a rolling window of samples per view feeds the p50/p95/p99
+summary served by ``views.admin_profiling_summary``.
+
+The middleware is listed in ``MIDDLEWARE`` but removes itself at startup
+unless ``REQUEST_PROFILING_ENABLED`` is True. Samples are kept in process
+memory, so each worker process reports on the requests it served.
+"""
+
+import heapq
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import Template as DjangoBackendTemplate
+
+logger = logging.getLogger('core.profiling')
+
+# Profile of the request being served on this thread, if any.
+_current_profile = ContextVar('core_request_profile', default=None)
+
+METRICS = ('wall_ms', 'db_ms', 'queries', 'template_ms')
+
+
+class RequestProfile:
+    """Timings collected while serving a single request."""
+
+    def __init__(self, worst_queries=5):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self._template_depth = 0
+        self._worst_limit = worst_queries
+        self._worst = []  # min-heap of (duration_ms, sequence, sql)
+
+    def record_query(self, sql, duration_ms):
+        self.queries += 1
+        self.db_ms += duration_ms
+        entry = (duration_ms, self.queries, sql)
+        if len(self._worst) < self._worst_limit:
+            heapq.heappush(self._worst, entry)
+        elif duration_ms > self._worst[0][0]:
+            heapq.heapreplace(self._worst, entry)
+
+    def worst_queries(self):
+        """Return the slowest queries, slowest first."""
+        return [
+            {'sql': sql, 'ms': round(duration_ms, 3)}
+            for duration_ms, _, sql in sorted(self._worst, reverse=True)
+        ]
+
+
+class ProfileStore:
+    """Thread-safe rolling window of request samples per view."""
+
+    def __init__(self, window=500):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def add(self, view_name, sample):
+        with self._lock:
+            self._samples[view_name].append(sample)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        """Return ``{view_name: {'count': n, metric: {'p50', 'p95', 'p99', 'max'}}}``."""
+        with self._lock:
+            snapshot = {view: list(samples) for view, samples in self._samples.items()}
+
+        summary = {}
+        for view_name, samples in snapshot.items():
+            entry = {'count': len(samples)}
+            for metric in METRICS:
+                values = sorted(sample[metric] for sample in samples)
+                entry[metric] = {
+                    'p50': percentile(values, 50),
+                    'p95': percentile(values, 95),
+                    'p99': percentile(values, 99),
+                    'max': values[-1],
+                }
+            summary[view_name] = entry
+        return summary
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+profile_store = ProfileStore(window=getattr(settings, 'REQUEST_PROFILING_WINDOW', 500))
+
+
+def _timed_template_render(render):
+    """Wrap the template backend's ``render`` to add its time to the profile.
+
+    Only the outermost render is timed so that templates rendered from inside
+    another template are not counted twice.
+    """
+    def wrapper(self, *args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None:
+            return render(self, *args, **kwargs)
+        profile._template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            profile._template_depth -= 1
+            if profile._template_depth == 0:
+                profile.template_ms += (time.perf_counter() - started) * 1000
+    wrapper._profiled = True
+    return wrapper
+
+
+def instrument_templates():
+    """Patch the Django template backend once so renders can be timed."""
+    if not getattr(DjangoBackendTemplate.render, '_profiled', False):
+        DjangoBackendTemplate.render = _timed_template_render(DjangoBackendTemplate.render)
+
+
+class RequestProfilingMiddleware:
+    """Record timings for each request and log the slow ones."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'REQUEST_PROFILING_SLOW_MS', 500)
+        self.worst_queries = getattr(settings, 'REQUEST_PROFILING_WORST_QUERIES', 5)
+        instrument_templates()
+
+    def __call__(self, request):
+        profile = RequestProfile(worst_queries=self.worst_queries)
+        token = _current_profile.set(profile)
+
+        def record(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                profile.record_query(sql, (time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(record))
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else '<unresolved>'
+        sample = {
+            'wall_ms': round(wall_ms, 3),
+            'db_ms': round(profile.db_ms, 3),
+            'queries': profile.queries,
+            'template_ms': round(profile.template_ms, 3),
+        }
+        profile_store.add(view_name, sample)
+
+        response['Server-Timing'] = (
+            f'db;dur={sample["db_ms"]}, tpl;dur={sample["template_ms"]}, total;dur={sample["wall_ms"]}'
+        )
+
+        if wall_ms >= self.slow_ms:
+            logger.warning('slow_request %s', json.dumps({
+                'view': view_name,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                **sample,
+                'worst_queries': profile.worst_queries(),
+            }, sort_keys=True))
+        return response
+
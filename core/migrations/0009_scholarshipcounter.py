@@ -0,0 +1,54 @@
+# Generated by Django 5.2.6 on 2026-10-17 07:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    Scholarship = apps.get_model('core', 'Scholarship')
+    Application = apps.get_model('core', 'Application')
+    ScholarshipCounter = apps.get_model('core', 'ScholarshipCounter')
+
+    counters = {
+        scholarship_id: ScholarshipCounter(scholarship_id=scholarship_id)
+        for scholarship_id in Scholarship.objects.values_list('id', flat=True)
+    }
+    rows = Application.objects.order_by().values_list('scholarship_id', 'status').annotate(count=Count('id'))
+    for scholarship_id, status, count in rows:
+        counter = counters.get(scholarship_id)
+        if counter is None or not hasattr(counter, status):
+            continue
+        setattr(counter, status, count)
+        counter.total += count
+    ScholarshipCounter.objects.bulk_create(counters.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_userprofile_campus'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScholarshipCounter',
+            fields=[
+                ('scholarship', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counter', serialize=False, to='core.scholarship')),
+                ('total', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+                ('under_review', models.IntegerField(default=0)),
+                ('osas_approved', models.IntegerField(default=0)),
+                ('osas_rejected', models.IntegerField(default=0)),
+                ('approved', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+                ('additional_info_required', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Scholarship Counter',
+                'verbose_name_plural': 'Scholarship Counters',
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
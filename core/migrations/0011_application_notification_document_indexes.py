@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-17 07:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_outgoingemail'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'submitted_at'], name='core_app_status_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'reviewed_at'], name='core_app_status_reviewed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'final_decision_at'], name='core_app_status_decision_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['reviewed_by', 'status', 'reviewed_at'], name='core_app_reviewer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['student', 'status'], name='core_app_student_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(condition=models.Q(('final_decision_by__isnull', False)), fields=['-final_decision_at'], name='core_app_decided_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationdocument',
+            index=models.Index(fields=['application', '-uploaded_at'], name='core_doc_app_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'is_read', 'created_at'], name='core_notif_recipient_read_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['recipient', '-created_at'], name='core_notif_unread_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.6 on 2026-10-17 08:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_search_index(apps, schema_editor):
+    from core.search import install_search_index
+    
+    install_search_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    from core.search import FTS_TABLE
+    
+    with schema_editor.connection.cursor() as cursor:
+        for suffix in ('ai', 'ad', 'au'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_application_notification_document_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScholarshipSearchEntry',
+            fields=[
+                ('scholarship', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='core.scholarship')),
+                ('title', models.TextField()),
+                ('description', models.TextField()),
+                ('eligibility_criteria', models.TextField()),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'core_scholarship_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.6 on 2026-10-17 08:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_keywords(apps, schema_editor):
+    from core.models import EligibilityKeyword as LiveEligibilityKeyword
+    
+    Scholarship = apps.get_model('core', 'Scholarship')
+    EligibilityKeyword = apps.get_model('core', 'EligibilityKeyword')
+    
+    rows = [
+        EligibilityKeyword(scholarship_id=scholarship_id, keyword=keyword, frequency=frequency)
+        for scholarship_id, criteria in Scholarship.objects.values_list('id', 'eligibility_criteria')
+        for keyword, frequency in LiveEligibilityKeyword.tokenize(criteria).items()
+    ]
+    EligibilityKeyword.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_scholarship_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EligibilityKeyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=50)),
+                ('frequency', models.PositiveIntegerField(default=1)),
+                ('scholarship', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eligibility_keywords', to='core.scholarship')),
+            ],
+            options={
+                'verbose_name': 'Eligibility Keyword',
+                'verbose_name_plural': 'Eligibility Keywords',
+                'indexes': [models.Index(fields=['keyword', 'scholarship'], name='core_elig_keyword_idx')],
+                'constraints': [models.UniqueConstraint(fields=('scholarship', 'keyword'), name='core_eligibility_keyword_unique')],
+            },
+        ),
+        migrations.RunPython(populate_keywords, migrations.RunPython.noop),
+    ]
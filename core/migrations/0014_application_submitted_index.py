@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-17 08:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_eligibilitykeyword'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-submitted_at'], name='core_app_submitted_idx'),
+        ),
+    ]
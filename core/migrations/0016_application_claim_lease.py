@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-17 08:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_reportjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='claim_expires_at',
+            field=models.DateTimeField(blank=True, help_text='When an under-review claim lapses and the application returns to the queue', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(condition=models.Q(('status', 'under_review')), fields=['claim_expires_at'], name='core_app_claim_lease_idx'),
+        ),
+    ]
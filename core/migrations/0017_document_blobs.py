@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-17 09:09
+
+import core.storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_application_claim_lease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Storage name of the file', max_length=255, unique=True)),
+                ('sha256', models.CharField(blank=True, db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField(default=0, help_text='File size in bytes')),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Document Blob',
+                'verbose_name_plural': 'Document Blobs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='applicationdocument',
+            name='file',
+            field=models.FileField(db_index=True, help_text='Uploaded document file, stored once per distinct content', storage=core.storage.document_storage, upload_to='documents/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx', 'jpg', 'jpeg', 'png'])]),
+        ),
+    ]
@@ -1,9 +1,15 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, Max, Sum
 from django.contrib.auth.models import User
 from django.core.validators import MaxValueValidator, MinValueValidator, FileExtensionValidator
 from django.utils import timezone
 from decimal import Decimal
+from collections import Counter
 import os
+import re
+import uuid
+
+from .storage import blob_sha256, document_storage
 
 
 def user_document_path(instance, filename):
@@ -122,6 +128,17 @@ class DocumentRequirement(models.Model):
         if self.name == 'other' and self.custom_name:
             return self.custom_name
         return self.get_name_display()
+    
+    @property
+    def reuse_key(self):
+        """Key under which a student's uploads for this kind of document are reused.
+        
+        Requirements share a key when they ask for the same document type;
+        'other' documents are told apart by their custom name.
+        """
+        if self.name == 'other':
+            return f"other:{(self.custom_name or '').strip().lower()}"
+        return self.name
 
 
 class Scholarship(models.Model):
@@ -173,14 +190,30 @@ class Scholarship(models.Model):
             return delta.days
         return 0
     
+    def get_counter(self):
+        """Return the denormalized counter row for this scholarship.
+        
+        A counter loaded with ``select_related('counter')`` is used as-is so
+        list pages cost no extra queries; otherwise it is read fresh.
+        """
+        if Scholarship.counter.is_cached(self):
+            return Scholarship.counter.related.get_cached_value(self)
+        return ScholarshipCounter.objects.filter(scholarship_id=self.pk).first()
+    
     @property
     def applications_count(self):
         """Count total applications for this scholarship."""
+        counter = self.get_counter()
+        if counter is not None:
+            return counter.total
         return self.applications.count()
     
     @property
     def approved_applications_count(self):
         """Count approved applications."""
+        counter = self.get_counter()
+        if counter is not None:
+            return counter.approved
         return self.applications.filter(status='approved').count()
     
     @property
@@ -189,6 +222,160 @@ class Scholarship(models.Model):
         return max(0, self.available_slots - self.approved_applications_count)
 
 
+class ScholarshipSearchEntry(models.Model):
+    """Row of the SQLite FTS5 full-text index over scholarships.
+    
+    The table and the triggers that keep it in sync are created by
+    ``core.search.install_search_index``, not by Django, and only exist on
+    SQLite. The model lets searches join the index to ``core_scholarship``.
+    """
+    
+    scholarship = models.OneToOneField(
+        Scholarship,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search_entry'
+    )
+    title = models.TextField()
+    description = models.TextField()
+    eligibility_criteria = models.TextField()
+    # BM25 score of the current MATCH; lower is better.
+    rank = models.FloatField()
+    
+    class Meta:
+        managed = False
+        db_table = 'core_scholarship_fts'
+    
+    def __str__(self):
+        return self.title
+
+
+class EligibilityKeyword(models.Model):
+    """Inverted index from eligibility-criteria keywords to scholarships.
+    
+    One row per (scholarship, keyword) with the number of times the keyword
+    appears in the scholarship's eligibility criteria. Rows are refreshed by
+    a post_save signal on Scholarship; bulk writes must call :meth:`rebuild`.
+    """
+    
+    # Filler words that appear in almost every criteria text and make
+    # useless filter chips.
+    STOP_WORDS = frozenset({
+        'with', 'must', 'have', 'from', 'that', 'this', 'will', 'than',
+        'their', 'been', 'least', 'also', 'other', 'should', 'student',
+        'students', 'applicant', 'applicants', 'enrolled', 'good', 'standing',
+    })
+    MIN_LENGTH = 4
+    TOKEN_RE = re.compile(r'[^\W\d_]+', re.UNICODE)
+    
+    scholarship = models.ForeignKey(
+        Scholarship,
+        on_delete=models.CASCADE,
+        related_name='eligibility_keywords'
+    )
+    keyword = models.CharField(max_length=50)
+    frequency = models.PositiveIntegerField(default=1)
+    
+    class Meta:
+        verbose_name = 'Eligibility Keyword'
+        verbose_name_plural = 'Eligibility Keywords'
+        constraints = [
+            models.UniqueConstraint(fields=['scholarship', 'keyword'], name='core_eligibility_keyword_unique'),
+        ]
+        indexes = [
+            # Department filter: keyword -> scholarships
+            models.Index(fields=['keyword', 'scholarship'], name='core_elig_keyword_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.keyword} ({self.frequency}) - {self.scholarship_id}"
+    
+    @classmethod
+    def tokenize(cls, text):
+        """Return ``Counter({keyword: frequency})`` for a criteria text."""
+        words = cls.TOKEN_RE.findall((text or '').lower())
+        return Counter(
+            word[:50] for word in words
+            if len(word) >= cls.MIN_LENGTH and word not in cls.STOP_WORDS
+        )
+    
+    @classmethod
+    def index_scholarship(cls, scholarship):
+        """Bring one scholarship's keywords in line with its criteria.
+        
+        Only keywords that were added, removed or changed frequency are
+        written. Returns the number of rows written or deleted.
+        """
+        wanted = cls.tokenize(scholarship.eligibility_criteria)
+        existing = dict(
+            cls.objects.filter(scholarship=scholarship).values_list('keyword', 'frequency')
+        )
+        removed = [keyword for keyword in existing if keyword not in wanted]
+        changed = [
+            cls(scholarship_id=scholarship.pk, keyword=keyword, frequency=frequency)
+            for keyword, frequency in wanted.items()
+            if existing.get(keyword) != frequency
+        ]
+        with transaction.atomic():
+            if removed:
+                cls.objects.filter(scholarship=scholarship, keyword__in=removed).delete()
+            if changed:
+                cls.objects.bulk_create(
+                    changed,
+                    update_conflicts=True,
+                    unique_fields=['scholarship', 'keyword'],
+                    update_fields=['frequency'],
+                )
+        return len(removed) + len(changed)
+    
+    @classmethod
+    def rebuild(cls, scholarship_ids=None, batch_size=1000):
+        """Re-index scholarships from scratch (all of them by default).
+        
+        Returns the number of keyword rows written.
+        """
+        scholarships = Scholarship.objects.all()
+        existing = cls.objects.all()
+        if scholarship_ids is not None:
+            scholarships = scholarships.filter(id__in=scholarship_ids)
+            existing = existing.filter(scholarship_id__in=scholarship_ids)
+        
+        written = 0
+        with transaction.atomic():
+            existing.delete()
+            rows = []
+            for scholarship_id, criteria in scholarships.values_list('id', 'eligibility_criteria').iterator(chunk_size=batch_size):
+                rows.extend(
+                    cls(scholarship_id=scholarship_id, keyword=keyword, frequency=frequency)
+                    for keyword, frequency in cls.tokenize(criteria).items()
+                )
+                if len(rows) >= batch_size:
+                    cls.objects.bulk_create(rows, batch_size=batch_size)
+                    written += len(rows)
+                    rows = []
+            if rows:
+                cls.objects.bulk_create(rows, batch_size=batch_size)
+                written += len(rows)
+        return written
+    
+    @classmethod
+    def top_keywords(cls, limit=10):
+        """Most widespread keywords across active scholarships.
+        
+        Ranked by how many scholarships use the keyword, then by total
+        occurrences. Returns a list of ``(keyword, scholarship_count)``.
+        """
+        rows = (
+            cls.objects.filter(scholarship__is_active=True)
+            .values('keyword')
+            .annotate(scholarships=Count('scholarship'), occurrences=Sum('frequency'))
+            .order_by('-scholarships', '-occurrences', 'keyword')[:limit]
+        )
+        return [(row['keyword'], row['scholarships']) for row in rows]
+
+
 class ScholarshipRequirement(models.Model):
     """Detailed requirements for scholarships."""
     
@@ -245,6 +432,9 @@ class Application(models.Model):
         ('additional_info_required', 'Additional Information Required'),
     ]
     
+    # Statuses OSAS can still act on (see views.application_review)
+    REVIEWABLE_STATUSES = ('pending', 'under_review', 'additional_info_required')
+    
     student = models.ForeignKey(
         User, 
         on_delete=models.CASCADE, 
@@ -285,6 +475,11 @@ class Application(models.Model):
         blank=True
     )
     reviewer_comments = models.TextField(blank=True, null=True)
+    claim_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='When an under-review claim lapses and the application returns to the queue'
+    )
     
     # Admin final decision fields
     final_decision_by = models.ForeignKey(
@@ -303,6 +498,32 @@ class Application(models.Model):
         verbose_name_plural = 'Applications'
         ordering = ['-submitted_at']
         unique_together = ['student', 'scholarship']  # One application per student per scholarship
+        indexes = [
+            # Review queue / OSAS dashboard: status filter ordered by submission
+            models.Index(fields=['status', 'submitted_at'], name='core_app_status_submitted_idx'),
+            # Pending approvals: OSAS recommendations ordered by review date
+            models.Index(fields=['status', 'reviewed_at'], name='core_app_status_reviewed_idx'),
+            # Awardees: approved applications ordered by final decision
+            models.Index(fields=['status', 'final_decision_at'], name='core_app_status_decision_idx'),
+            # OSAS "my reviews" and completed review counts
+            models.Index(fields=['reviewed_by', 'status', 'reviewed_at'], name='core_app_reviewer_status_idx'),
+            # Student dashboard and my applications
+            models.Index(fields=['student', 'status'], name='core_app_student_status_idx'),
+            # Review history: only applications with a final decision
+            models.Index(
+                fields=['-final_decision_at'],
+                condition=models.Q(final_decision_by__isnull=False),
+                name='core_app_decided_idx'
+            ),
+            # Unfiltered listings paged by (submitted_at, id) keyset cursors
+            models.Index(fields=['-submitted_at'], name='core_app_submitted_idx'),
+            # Lapsed reviewer claims to return to the queue
+            models.Index(
+                fields=['claim_expires_at'],
+                condition=models.Q(status='under_review'),
+                name='core_app_claim_lease_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.student.get_full_name()} - {self.scholarship.title}"
@@ -321,20 +542,210 @@ class Application(models.Model):
         }
         return status_classes.get(self.status, 'bg-gray-100 text-gray-800')
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so counter updates know the transition.
+        # Read __dict__ so deferred fields are not fetched (refresh_from_db
+        # with ``fields`` loads through here and would recurse).
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_scholarship_id = instance.__dict__.get('scholarship_id')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # The post_save handler updates ScholarshipCounter; keep both writes
+        # in the same transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
     def can_be_edited(self):
         """Check if application can still be edited."""
         return self.status in ['pending', 'additional_info_required']
     
+    def can_be_reviewed(self):
+        """Check if OSAS can still make a recommendation on the application."""
+        return self.status in self.REVIEWABLE_STATUSES
+    
     def mark_as_reviewed(self, reviewer, status, comments=None):
         """Mark application as reviewed with decision."""
         self.reviewed_by = reviewer
         self.reviewed_at = timezone.now()
         self.status = status
+        self.claim_expires_at = None
         if comments:
             self.reviewer_comments = comments
         self.save()
 
 
+class ScholarshipCounter(models.Model):
+    """Denormalized application counters for a scholarship.
+    
+    One column per ``Application.STATUS_CHOICES`` value plus a total. The
+    rows are kept in step with ``Application`` saves and deletes by the
+    handlers in ``core.signals``; bulk status changes made with
+    ``QuerySet.update()`` must call :meth:`apply_deltas` themselves. Use
+    ``manage.py rebuild_scholarship_counters`` to recompute them from scratch.
+    """
+    
+    STATUS_FIELDS = [status for status, _ in Application.STATUS_CHOICES]
+    
+    scholarship = models.OneToOneField(
+        Scholarship,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='counter'
+    )
+    total = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+    under_review = models.IntegerField(default=0)
+    osas_approved = models.IntegerField(default=0)
+    osas_rejected = models.IntegerField(default=0)
+    approved = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+    additional_info_required = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Scholarship Counter'
+        verbose_name_plural = 'Scholarship Counters'
+    
+    def __str__(self):
+        return f"{self.scholarship_id}: {self.total} applications"
+    
+    @classmethod
+    def record_transition(cls, scholarship_id, old_status=None, new_status=None, rebuild_missing=True):
+        """Record one application moving from ``old_status`` to ``new_status``.
+        
+        ``old_status=None`` means the application was created and
+        ``new_status=None`` means it was deleted.
+        """
+        delta = {}
+        if old_status is None:
+            delta['total'] = 1
+        else:
+            delta[old_status] = delta.get(old_status, 0) - 1
+        if new_status is None:
+            delta['total'] = delta.get('total', 0) - 1
+        else:
+            delta[new_status] = delta.get(new_status, 0) + 1
+        cls.apply_deltas({scholarship_id: delta}, rebuild_missing=rebuild_missing)
+    
+    @classmethod
+    def apply_deltas(cls, deltas, rebuild_missing=True):
+        """Apply ``{scholarship_id: {field: delta}}`` as atomic F() updates.
+        
+        Counters that do not exist yet are rebuilt from the applications
+        table instead, unless ``rebuild_missing`` is False.
+        """
+        missing = []
+        with transaction.atomic():
+            for scholarship_id, delta in deltas.items():
+                changes = {
+                    field: F(field) + amount
+                    for field, amount in delta.items() if amount
+                }
+                if not changes:
+                    continue
+                if not cls.objects.filter(scholarship_id=scholarship_id).update(**changes):
+                    missing.append(scholarship_id)
+            if missing and rebuild_missing:
+                cls.rebuild(scholarship_ids=missing)
+    
+    @classmethod
+    def reserve_slot(cls, scholarship_id, available_slots, from_status):
+        """Count one ``from_status`` application as approved if a slot is free.
+
+        A single conditional UPDATE (``approved < available_slots``) both
+        checks and takes the slot, so concurrent approvals can never award
+        more than ``available_slots`` and only the counter row is locked,
+        for the duration of that statement. Returns True if the slot was
+        reserved. Call inside the transaction that approves the application,
+        before its status is changed: a later failure then gives the slot
+        back, and a missing counter row is rebuilt with the application
+        still counted under ``from_status``.
+        """
+        changes = {'approved': F('approved') + 1}
+        if from_status is None:
+            changes['total'] = F('total') + 1
+        elif from_status != 'approved':
+            changes[from_status] = F(from_status) - 1
+
+        for attempt in range(2):
+            reserved = cls.objects.filter(
+                scholarship_id=scholarship_id,
+                approved__lt=available_slots
+            ).update(**changes)
+            if reserved or attempt or cls.objects.filter(scholarship_id=scholarship_id).exists():
+                return bool(reserved)
+            # No counter row yet: build it from the applications table first.
+            cls.rebuild(scholarship_ids=[scholarship_id])
+        return False
+
+    @classmethod
+    def reserve_slots(cls, scholarship_id, available_slots, from_statuses):
+        """Batch version of :meth:`reserve_slot` for many approvals at once.
+
+        ``from_statuses`` holds the current status of each application to
+        approve, in priority order. As many as there are free slots are
+        counted as approved with one compare-and-set UPDATE on the
+        ``approved`` value just read, which is retried if another approval
+        got in between. Returns how many were reserved: the first ``n`` of
+        ``from_statuses``.
+        """
+        from_statuses = list(from_statuses)
+        rebuilt = False
+        while True:
+            approved = cls.objects.filter(scholarship_id=scholarship_id).values_list('approved', flat=True).first()
+            if approved is None:
+                if rebuilt:
+                    return 0
+                cls.rebuild(scholarship_ids=[scholarship_id])
+                rebuilt = True
+                continue
+
+            granted = from_statuses[:max(0, available_slots - approved)]
+            if not granted:
+                return 0
+            changes = {'approved': F('approved') + len(granted)}
+            for status, count in Counter(granted).items():
+                if status != 'approved':
+                    changes[status] = F(status) - count
+            if cls.objects.filter(scholarship_id=scholarship_id, approved=approved).update(**changes):
+                return len(granted)
+
+    @classmethod
+    def rebuild(cls, scholarship_ids=None):
+        """Recompute counters from one GROUP BY query and upsert them.
+        
+        Returns the number of counter rows written.
+        """
+        scholarships = Scholarship.objects.all()
+        applications = Application.objects.all()
+        if scholarship_ids is not None:
+            scholarships = scholarships.filter(id__in=scholarship_ids)
+            applications = applications.filter(scholarship_id__in=scholarship_ids)
+        
+        counters = {
+            scholarship_id: cls(scholarship_id=scholarship_id)
+            for scholarship_id in scholarships.values_list('id', flat=True)
+        }
+        rows = applications.order_by().values_list('scholarship_id', 'status').annotate(count=Count('id'))
+        for scholarship_id, status, count in rows:
+            counter = counters.get(scholarship_id)
+            if counter is None or status not in cls.STATUS_FIELDS:
+                continue
+            setattr(counter, status, count)
+            counter.total += count
+        
+        cls.objects.bulk_create(
+            counters.values(),
+            update_conflicts=True,
+            unique_fields=['scholarship'],
+            update_fields=['total', *cls.STATUS_FIELDS, 'updated_at'],
+        )
+        return len(counters)
+
+
 class Notification(models.Model):
     """System notifications for users."""
     
@@ -367,6 +778,15 @@ class Notification(models.Model):
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', 'is_read', 'created_at'], name='core_notif_recipient_read_idx'),
+            # Unread notification bell / dropdown, polled on every page
+            models.Index(
+                fields=['recipient', '-created_at'],
+                condition=models.Q(is_read=False),
+                name='core_notif_unread_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.recipient.username} - {self.title}"
@@ -412,8 +832,10 @@ class ApplicationDocument(models.Model):
     )
     
     file = models.FileField(
-        upload_to='application_documents/%Y/%m/%d/',
-        help_text="Uploaded document file",
+        upload_to='documents/',
+        storage=document_storage,
+        db_index=True,
+        help_text="Uploaded document file, stored once per distinct content",
         validators=[
             FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx', 'jpg', 'jpeg', 'png'])
         ]
@@ -434,6 +856,9 @@ class ApplicationDocument(models.Model):
         ordering = ['-uploaded_at']
         verbose_name = "Application Document"
         verbose_name_plural = "Application Documents"
+        indexes = [
+            models.Index(fields=['application', '-uploaded_at'], name='core_doc_app_uploaded_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.application.student.username}"
@@ -448,8 +873,305 @@ class ApplicationDocument(models.Model):
         else:
             return f"{self.file_size / (1024 * 1024):.1f} MB"
 
-    def delete(self, *args, **kwargs):
-        """Delete the file when the model instance is deleted."""
-        if self.file and hasattr(self.file, 'delete'):
-            self.file.delete(save=False)
-        super().delete(*args, **kwargs)
+    @classmethod
+    def latest_by_requirement(cls, student):
+        """The student's most recent upload for each kind of required document.
+        
+        Returns ``{DocumentRequirement.reuse_key: ApplicationDocument}`` from
+        one query, so the apply form can offer to reuse an earlier file.
+        """
+        documents = cls.objects.filter(
+            application__student=student,
+            document_requirement__isnull=False
+        ).exclude(file='').select_related('document_requirement').order_by('-uploaded_at', '-id')
+        
+        latest = {}
+        for document in documents:
+            latest.setdefault(document.document_requirement.reuse_key, document)
+        return latest
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored file so a replaced file releases its blob.
+        if 'file' in instance.__dict__:
+            instance._loaded_file_name = instance.__dict__['file']
+        return instance
+
+
+class DocumentBlob(models.Model):
+    """Reference count for one file in the document storage.
+    
+    ``ApplicationDocument`` files are content-addressed (see
+    ``core.storage``), so documents with identical contents share a file.
+    The signals keep ``ref_count`` equal to the number of documents using
+    ``name``; the file is deleted once it drops to zero. Files stored before
+    reference counting have no row until they are next acquired or
+    released, at which point their references are counted.
+    """
+    
+    name = models.CharField(max_length=255, unique=True, help_text="Storage name of the file")
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    size = models.PositiveBigIntegerField(default=0, help_text="File size in bytes")
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Document Blob'
+        verbose_name_plural = 'Document Blobs'
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} reference(s))"
+    
+    @classmethod
+    def acquire(cls, name, size=0, count=1, storage=None, content=None):
+        """Count ``count`` more documents using the file ``name``.
+        
+        Storage skips writing content it already has, so the last document
+        using that file may have been deleted, and the file with it, since
+        the save. Pass the ``storage`` and the uploaded ``content`` to write
+        the file again in that case.
+        """
+        if not cls.objects.filter(name=name).update(ref_count=F('ref_count') + count):
+            # First reference, or a file stored before reference counting:
+            # count the documents that use it, including the ones just saved.
+            cls.objects.get_or_create(name=name, defaults={
+                'sha256': blob_sha256(name) or '',
+                'size': size,
+                'ref_count': ApplicationDocument.objects.filter(file=name).count(),
+            })
+        if content is not None and not storage.exists(name):
+            storage.save(name, content)
+    
+    @classmethod
+    def release(cls, name, storage):
+        """Count one fewer document using ``name``; delete the file if none are left.
+        
+        The file is removed once the surrounding transaction commits.
+        Returns True if it will be deleted.
+        """
+        with transaction.atomic():
+            cls.objects.filter(name=name, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+            blob = cls.objects.select_for_update().filter(name=name).first()
+            if blob is not None and blob.ref_count > 0:
+                return False
+            
+            # Trust the documents table over a missing or zero counter.
+            references = ApplicationDocument.objects.filter(file=name).count()
+            if references:
+                cls.objects.update_or_create(name=name, defaults={
+                    'sha256': blob_sha256(name) or '', 'ref_count': references
+                })
+                return False
+            if blob is not None:
+                blob.delete()
+            transaction.on_commit(lambda: cls.delete_unreferenced(name, storage))
+        return True
+    
+    @classmethod
+    def delete_unreferenced(cls, name, storage):
+        """Delete the file ``name`` unless a document has started using it again.
+        
+        Runs after the transaction that released the last reference has
+        committed; a save of the same content may have picked the file up
+        in the meantime.
+        """
+        with transaction.atomic():
+            if cls.objects.select_for_update().filter(name=name, ref_count__gt=0).exists():
+                return False
+            if ApplicationDocument.objects.filter(file=name).exists():
+                return False
+            storage.delete(name)
+        return True
+    
+    @classmethod
+    def rebuild(cls, names=None):
+        """Recount references from the documents table.
+        
+        Returns the rows (saved with ``ref_count=0``) of files that no
+        document uses any more; deleting them is left to the caller.
+        """
+        documents = ApplicationDocument.objects.exclude(file='')
+        if names is not None:
+            documents = documents.filter(file__in=names)
+        counts = {
+            name: (references, size)
+            for name, references, size in documents.values_list('file').annotate(
+                references=Count('id'), size=Max('file_size')
+            ).order_by()
+        }
+        
+        existing = cls.objects.all()
+        if names is not None:
+            existing = existing.filter(name__in=names)
+        with transaction.atomic():
+            blobs = {blob.name: blob for blob in existing.select_for_update()}
+            created = []
+            for name, (references, size) in counts.items():
+                blob = blobs.get(name)
+                if blob is None:
+                    created.append(cls(name=name, sha256=blob_sha256(name) or '', size=size, ref_count=references))
+                else:
+                    blob.ref_count = references
+            for blob in blobs.values():
+                if blob.name not in counts:
+                    blob.ref_count = 0
+            cls.objects.bulk_update(blobs.values(), ['ref_count'], batch_size=500)
+            cls.objects.bulk_create(created, batch_size=500)
+        return [blob for blob in blobs.values() if blob.ref_count == 0]
+
+
+class UploadSession(models.Model):
+    """A document being uploaded in chunks through the resumable upload API.
+    
+    Chunks are written straight into a partial file under
+    ``CHUNKED_UPLOAD_DIR`` at the offset the client sends; ``received`` is
+    how much of the file has arrived, so an interrupted upload resumes
+    from there. Completing the session verifies the file and attaches it
+    to the application as an ``ApplicationDocument``. Sessions left
+    unfinished are removed by ``manage.py cleanup_uploads``.
+    """
+    
+    STATUS_CHOICES = [
+        ('active', 'Active'),
+        ('complete', 'Complete'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    application = models.ForeignKey(
+        Application,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    document_requirement = models.ForeignKey(
+        DocumentRequirement,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='upload_sessions'
+    )
+    uploaded_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    filename = models.CharField(max_length=255)
+    name = models.CharField(max_length=255, help_text="Name the finished document is given")
+    size = models.PositiveBigIntegerField(help_text="Total file size in bytes")
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Digest the client expects, if it sent one")
+    received = models.PositiveBigIntegerField(default=0, help_text="Bytes received so far")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='active')
+    document = models.ForeignKey(
+        'ApplicationDocument',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Upload Session'
+        verbose_name_plural = 'Upload Sessions'
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='core_upload_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size} bytes)"
+
+
+class OutgoingEmail(models.Model):
+    """Queued email waiting to be delivered by ``manage.py run_email_worker``."""
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead Letter'),
+    ]
+    
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=254, blank=True)
+    subject = models.CharField(max_length=255)
+    body_text = models.TextField()
+    body_html = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=32, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        verbose_name = 'Outgoing Email'
+        verbose_name_plural = 'Outgoing Emails'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='core_email_status_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.to_email} - {self.subject} ({self.get_status_display()})"
+
+
+class ReportJob(models.Model):
+    """PDF report generated by ``manage.py run_report_worker``.
+    
+    A job is identified by its report type, a hash of its filters and the
+    version of the data it covers, so asking again for a report whose data
+    has not changed returns the finished job instead of generating a new one.
+    """
+    
+    REPORT_CHOICES = [
+        ('awardees', 'Scholarship Awardees'),
+        ('decisions', 'Final Decision History'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    report_type = models.CharField(max_length=20, choices=REPORT_CHOICES)
+    filters = models.JSONField(default=dict, blank=True)
+    filter_hash = models.CharField(max_length=64)
+    data_version = models.CharField(max_length=64)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    file = models.FileField(upload_to='reports/', blank=True)
+    row_count = models.PositiveIntegerField(default=0)
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='report_jobs'
+    )
+    claim_token = models.CharField(max_length=32, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Report Job'
+        verbose_name_plural = 'Report Jobs'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['report_type', 'filter_hash', 'data_version'],
+                name='core_report_job_version_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='core_report_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_report_type_display()} report ({self.get_status_display()})"
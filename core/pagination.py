@@ -0,0 +1,242 @@
+"""
+Pagination for long application listings.
+
+``paginate`` keeps Django's numbered ``Paginator`` for small result sets and
+switches to keyset (cursor) pagination once the filtered total passes
+``CURSOR_PAGINATION_THRESHOLD``, or whenever the request carries a
+``cursor`` parameter. A cursor page is fetched with
+
+    WHERE (key, id) > (last key, last id) ORDER BY key, id LIMIT n
+
+so it costs the same on page 400 as on page 1, where ``OFFSET`` makes the
+database walk past every earlier row. Rows whose key is NULL sort last in
+both modes and are paged by id alone once the cursor reaches them. Cursors are opaque URL-safe strings;
+``shared/load_more.html`` renders them as an HTMX "load more" button.
+
+Totals for both modes come from ``cached_count``, a COUNT(*) cached per
+filtered query until an application changes.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import math
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+
+from .services import DashboardStatsService
+
+COUNT_CACHE_PREFIX = 'pagination:count'
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that cannot be decoded for this listing."""
+
+
+def encode_cursor(key, pk, offset):
+    """Pack the last row's sort key, its pk and the rows seen so far.
+
+    A ``None`` key marks a cursor inside the trailing NULL-key rows.
+    """
+    payload = json.dumps([key, pk, offset], separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return ``(key, pk, offset)`` from ``encode_cursor`` output."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key, pk, offset = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if not isinstance(pk, int) or not isinstance(offset, int) or offset < 0:
+        raise InvalidCursor(cursor)
+    return key, pk, offset
+
+
+def cached_count(queryset, scopes=('applications',)):
+    """Return ``queryset.count()``, cached until one of ``scopes`` changes.
+
+    The cache key is derived from the compiled SQL, so each combination of
+    filters gets its own entry. Scopes are the ``DashboardStatsService``
+    versions bumped by the model signals.
+    """
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(f'{sql}|{params!r}'.encode()).hexdigest()
+    count_key = f'{COUNT_CACHE_PREFIX}:{queryset.model._meta.label_lower}:{digest}'
+    version_keys = DashboardStatsService.version_keys(*scopes)
+
+    cached = cache.get_many([count_key, *version_keys])
+    versions = [cached.get(key) for key in version_keys]
+    entry = cached.get(count_key)
+    if entry is not None and entry['versions'] == versions:
+        return entry['count']
+
+    count = queryset.count()
+    cache.set(
+        count_key,
+        {'versions': versions, 'count': count},
+        timeout=getattr(settings, 'PAGINATION_COUNT_TIMEOUT', 300),
+    )
+    return count
+
+
+def keyset_ordering(queryset, ordering):
+    """``order_by`` arguments for ``ordering`` with NULLs last and ``pk`` as tiebreaker."""
+    descending = ordering.startswith('-')
+    field = F(ordering.lstrip('-'))
+    pk_name = queryset.model._meta.pk.name
+    return (
+        field.desc(nulls_last=True) if descending else field.asc(nulls_last=True),
+        f'-{pk_name}' if descending else pk_name,
+    )
+
+
+class CursorPaginator:
+    """Keyset paginator over a single sort field with ``pk`` as tiebreaker.
+
+    ``ordering`` is a field name, prefixed with ``-`` for descending order.
+    Rows whose sort field is NULL come after all the others, in ``pk``
+    order for the direction; a cursor with a NULL key resumes among them.
+    """
+
+    def __init__(self, queryset, per_page, ordering, count=None):
+        self.per_page = int(per_page)
+        self.descending = ordering.startswith('-')
+        self.field_name = ordering.lstrip('-')
+        self.field = queryset.model._meta.get_field(self.field_name)
+        self.pk_name = queryset.model._meta.pk.name
+        self.queryset = queryset.order_by(*keyset_ordering(queryset, ordering))
+        if count is not None:
+            self.count = count
+
+    @cached_property
+    def count(self):
+        return cached_count(self.queryset)
+
+    @property
+    def num_pages(self):
+        return max(1, math.ceil(self.count / self.per_page))
+
+    def page(self, cursor=None):
+        """Return the page after ``cursor``, or the first page."""
+        queryset = self.queryset
+        offset = 0
+        if cursor:
+            key, pk, offset = decode_cursor(cursor)
+            try:
+                key = self.field.to_python(key)
+            except ValidationError:
+                raise InvalidCursor(cursor)
+            after = 'lt' if self.descending else 'gt'
+            if key is None:
+                queryset = queryset.filter(**{f'{self.field_name}__isnull': True, f'{self.pk_name}__{after}': pk})
+            else:
+                queryset = queryset.filter(
+                    Q(**{f'{self.field_name}__{after}': key}) |
+                    Q(**{self.field_name: key, f'{self.pk_name}__{after}': pk}) |
+                    Q(**{f'{self.field_name}__isnull': True})
+                )
+
+        rows = list(queryset[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        next_cursor = None
+        if has_next:
+            last = rows[-1]
+            next_cursor = encode_cursor(
+                getattr(last, self.field.attname), last.pk, offset + len(rows)
+            )
+        return CursorPage(rows, offset, next_cursor, self)
+
+
+class CursorPage(Sequence):
+    """One page from ``CursorPaginator``, shaped like Django's ``Page``.
+
+    ``paginator.count`` is the cached total; ``next_query`` and
+    ``first_query`` are filled in by ``paginate`` for the templates.
+    """
+
+    is_cursor = True
+
+    def __init__(self, object_list, offset, next_cursor, paginator):
+        self.object_list = object_list
+        self.offset = offset
+        self.next_cursor = next_cursor
+        self.paginator = paginator
+        self.next_query = ''
+        self.first_query = ''
+
+    def __repr__(self):
+        return f'<CursorPage after {self.offset} rows>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    @property
+    def number(self):
+        return self.offset // self.paginator.per_page + 1
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.offset > 0
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def start_index(self):
+        return self.offset + 1 if self.object_list else 0
+
+    def end_index(self):
+        return self.offset + len(self.object_list)
+
+
+def paginate(request, queryset, per_page):
+    """Paginate an ordered ``queryset`` for a listing view.
+
+    Small result sets get a normal numbered ``Page``, as do requests with an
+    explicit ``?page=`` so existing links keep working. Larger sets, and any
+    request with ``?cursor=``, get a ``CursorPage``. The queryset must be
+    ordered by exactly one field; ``pk`` is added as the tiebreaker.
+    """
+    ordering = queryset.query.order_by
+    if len(ordering) != 1 or not isinstance(ordering[0], str):
+        raise ValueError('paginate() needs a queryset ordered by a single field.')
+    ordering = ordering[0]
+
+    cursor = request.GET.get('cursor')
+    page_number = request.GET.get('page')
+    count = cached_count(queryset)
+    threshold = getattr(settings, 'CURSOR_PAGINATION_THRESHOLD', 1000)
+
+    if not cursor and (page_number or count <= threshold):
+        paginator = Paginator(queryset.order_by(*keyset_ordering(queryset, ordering)), per_page)
+        paginator.count = count
+        return paginator.get_page(page_number)
+
+    paginator = CursorPaginator(queryset, per_page, ordering, count=count)
+    try:
+        page = paginator.page(cursor)
+    except InvalidCursor:
+        page = paginator.page()
+
+    query = request.GET.copy()
+    query.pop('page', None)
+    query.pop('cursor', None)
+    page.first_query = f'?{query.urlencode()}'
+    if page.has_next():
+        query['cursor'] = page.next_cursor
+        page.next_query = f'?{query.urlencode()}'
+    return page
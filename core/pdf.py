@@ -0,0 +1,184 @@
+"""
+Minimal streaming PDF writer for tabular reports.
+
+``PdfTableWriter`` lays out a title block and a table in the standard
+Helvetica fonts, starting a new page (with the header row repeated) whenever
+the current one is full. Each page is compressed and written to the output
+file as soon as it is complete, so only one page of rows is held in memory
+however long the report is. Only the byte offsets of finished objects are
+kept for the cross-reference table written at the end.
+
+Text is encoded as WinAnsi (cp1252); characters outside it print as ``?``.
+"""
+
+import zlib
+
+# A4 landscape, in points.
+PAGE_WIDTH = 842
+PAGE_HEIGHT = 595
+MARGIN = 36
+
+# Rough Helvetica advance width as a fraction of the font size, used to
+# shorten cell text that would overflow its column.
+_AVERAGE_CHAR_WIDTH = 0.5
+
+_CATALOG_ID = 1
+_PAGES_ID = 2
+_FONT_ID = 3
+_BOLD_FONT_ID = 4
+_FIRST_FREE_ID = 5
+
+
+def pdf_string(text):
+    """Encode ``text`` as a PDF literal string."""
+    data = str(text).encode('cp1252', errors='replace')
+    data = data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    data = data.replace(b'\r', b' ').replace(b'\n', b' ')
+    return b'(' + data + b')'
+
+
+def fit_text(text, width, font_size):
+    """Shorten ``text`` with an ellipsis so it fits in ``width`` points."""
+    text = str(text)
+    limit = max(1, int(width / (font_size * _AVERAGE_CHAR_WIDTH)))
+    if len(text) <= limit:
+        return text
+    return text[:max(limit - 3, 1)] + '...'
+
+
+class PdfTableWriter:
+    """Write a paged table to a binary file object.
+
+    ``columns`` is a list of ``(header, relative_width)`` pairs; widths are
+    scaled to the printable page width. Call ``add_row`` for every row and
+    ``close`` once at the end.
+    """
+
+    def __init__(self, fileobj, title, subtitle_lines=(), columns=(), font_size=8, row_height=14):
+        self.file = fileobj
+        self.title = title
+        self.subtitle_lines = list(subtitle_lines)
+        self.headers = [header for header, _ in columns]
+        total = sum(width for _, width in columns) or 1
+        usable = PAGE_WIDTH - 2 * MARGIN
+        self.widths = [usable * width / total for _, width in columns]
+        self.font_size = font_size
+        self.row_height = row_height
+
+        self._offsets = {}
+        self._position = 0
+        self._next_id = _FIRST_FREE_ID
+        self._page_ids = []
+        self._ops = None
+        self._y = 0
+        self.rows = 0
+
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self._write_object(_FONT_ID, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica '
+                                     b'/Encoding /WinAnsiEncoding >>')
+        self._write_object(_BOLD_FONT_ID, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold '
+                                          b'/Encoding /WinAnsiEncoding >>')
+
+    # ------------------------------------------------------------------
+    # Low-level output
+    # ------------------------------------------------------------------
+
+    def _write(self, data):
+        self.file.write(data)
+        self._position += len(data)
+
+    def _allocate(self):
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def _write_object(self, object_id, body):
+        self._offsets[object_id] = self._position
+        self._write(b'%d 0 obj\n' % object_id + body + b'\nendobj\n')
+
+    def _text(self, x, y, text, bold=False, size=None):
+        font = b'/F2' if bold else b'/F1'
+        self._ops.append(
+            b'BT %s %d Tf %.2f %.2f Td %s Tj ET' % (font, size or self.font_size, x, y, pdf_string(text))
+        )
+
+    # ------------------------------------------------------------------
+    # Pages
+    # ------------------------------------------------------------------
+
+    def _start_page(self):
+        self._ops = []
+        y = PAGE_HEIGHT - MARGIN
+        if not self._page_ids:
+            y -= 14
+            self._text(MARGIN, y, self.title, bold=True, size=16)
+            for line in self.subtitle_lines:
+                y -= 13
+                self._text(MARGIN, y, line, size=9)
+            y -= 10
+        y -= self.row_height
+        self._draw_row(y, self.headers, bold=True)
+        self._ops.append(b'0.5 w %.2f %.2f m %.2f %.2f l S' % (
+            MARGIN, y - 4, PAGE_WIDTH - MARGIN, y - 4
+        ))
+        self._y = y - 4
+
+    def _draw_row(self, y, values, bold=False):
+        x = MARGIN
+        for value, width in zip(values, self.widths):
+            self._text(x + 2, y, fit_text(value, width - 4, self.font_size), bold=bold)
+            x += width
+
+    def _finish_page(self):
+        number = len(self._page_ids) + 1
+        self._text(PAGE_WIDTH - MARGIN - 40, MARGIN / 2, f'Page {number}', size=8)
+        content = zlib.compress(b'\n'.join(self._ops))
+        content_id = self._allocate()
+        self._write_object(
+            content_id,
+            b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(content) + content + b'\nendstream'
+        )
+        page_id = self._allocate()
+        self._write_object(page_id, (
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] '
+            b'/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents %d 0 R >>'
+        ) % (_PAGES_ID, PAGE_WIDTH, PAGE_HEIGHT, _FONT_ID, _BOLD_FONT_ID, content_id))
+        self._page_ids.append(page_id)
+        self._ops = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def add_row(self, values):
+        if self._ops is None:
+            self._start_page()
+        if self._y - self.row_height < MARGIN:
+            self._finish_page()
+            self._start_page()
+        self._y -= self.row_height
+        self._draw_row(self._y, values)
+        self.rows += 1
+
+    def close(self):
+        """Finish the last page and write the page tree and trailer."""
+        if self._ops is None:
+            self._start_page()
+            if not self.rows:
+                self._text(MARGIN, self._y - self.row_height, 'No matching records.')
+        self._finish_page()
+
+        kids = b' '.join(b'%d 0 R' % page_id for page_id in self._page_ids)
+        self._write_object(_PAGES_ID, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(self._page_ids)))
+        self._write_object(_CATALOG_ID, b'<< /Type /Catalog /Pages %d 0 R >>' % _PAGES_ID)
+
+        xref_offset = self._position
+        size = self._next_id
+        lines = [b'xref', b'0 %d' % size, b'0000000000 65535 f ']
+        for object_id in range(1, size):
+            lines.append(b'%010d 00000 n ' % self._offsets[object_id])
+        self._write(b'\n'.join(lines) + b'\n')
+        self._write(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+            size, _CATALOG_ID, xref_offset
+        ))
+        return len(self._page_ids)
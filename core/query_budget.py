@@ -0,0 +1,431 @@
+"""
+Query-count budget harness for the views in ``core.urls``.
+
+``QueryBudgetHarness`` seeds applications, documents and notifications with
+``bulk_create``, requests every named route as a student, an admin and an
+OSAS user, and records how many SQL queries each request ran. Routes that
+only act on POST are posted a minimal valid body inside a transaction that
+is rolled back, so every role and every run sees the same fixture.
+
+Measuring once on a small fixture and again after growing it shows which
+views scale with the size of the data instead of staying flat.
+"""
+
+import json
+import os
+import re
+import tempfile
+from decimal import Decimal
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from . import urls as core_urls
+from .load_data import LoadDataGenerator
+from .models import Application, ApplicationDocument, Notification, ReportJob, Scholarship, UploadSession
+
+
+ROLES = ('student', 'admin', 'osas')
+
+# GET parameters needed for a route to do real work instead of returning early.
+ROUTE_QUERY_PARAMS = {
+    'core:htmx_scholarship_search': {'q': 'Budget'},
+}
+
+# Routes that need a different fixture object than the shared one, e.g. the
+# apply form only renders for a scholarship the student has not applied to.
+ROUTE_ARGUMENTS = {
+    'core:apply_scholarship': {'scholarship_id': 'open_scholarship'},
+    'core:admin_final_decision': {'application_id': 'recommended_application'},
+    'core:complete_chunked_upload': {'upload_id': 'completed_upload'},
+    'core:download_report': {'job_id': 'finished_report'},
+}
+
+# Routes measured with a POST, and the body to send given ``objects``.
+ROUTE_POST_DATA = {
+    'core:admin_bulk_final_decision': lambda objects: {
+        'application_ids': [objects['recommended_application'].pk], 'decision': 'approve',
+    },
+    'core:bulk_review_applications': lambda objects: {
+        'application_ids': [objects['application'].pk], 'action': 'approve',
+    },
+    'core:claim_next_application': lambda objects: {},
+    'core:assign_application': lambda objects: {},
+    'core:toggle_scholarship_status': lambda objects: {},
+    'core:bulk_upload_documents': lambda objects: {},
+    'core:start_chunked_upload': lambda objects: {'filename': 'budget.pdf', 'size': 4096},
+    'core:complete_chunked_upload': lambda objects: {},
+    'core:request_report': lambda objects: {},
+    'core:htmx_mark_notification_read': lambda objects: {},
+    'core:ajax_create_document_requirement': lambda objects: {'doc_type': 'transcript'},
+}
+
+# Routes answering with an HTMX partial only when asked by HTMX.
+HTMX_ROUTES = {
+    'core:admin_bulk_final_decision',
+    'core:bulk_review_applications',
+    'core:bulk_upload_documents',
+}
+
+# Roles a route is meant for, where not every role; those roles must get a
+# 2xx response (see ``REDIRECT_ROUTES``).
+ROUTE_ROLES = {
+    'core:student_dashboard': ('student',),
+    'core:scholarships_list': ('student',),
+    'core:scholarship_detail': ('student',),
+    'core:apply_scholarship': ('student',),
+    'core:my_applications': ('student',),
+    'core:application_detail': ('student',),
+    'core:upload_document': ('student',),
+    'core:bulk_upload_documents': ('student',),
+    'core:start_chunked_upload': ('student',),
+    'core:chunked_upload': ('student',),
+    'core:complete_chunked_upload': ('student',),
+    'core:delete_document': ('student',),
+    'core:htmx_application_status': ('student',),
+    'core:admin_dashboard': ('admin',),
+    'core:create_scholarship': ('admin',),
+    'core:edit_scholarship': ('admin',),
+    'core:toggle_scholarship_status': ('admin',),
+    'core:admin_review_application': ('admin',),
+    'core:admin_pending_approvals': ('admin',),
+    'core:admin_final_decision': ('admin',),
+    'core:admin_bulk_final_decision': ('admin',),
+    'core:admin_review_history': ('admin',),
+    'core:export_review_history': ('admin',),
+    'core:admin_profiling_summary': ('admin',),
+    'core:manage_scholarships': ('admin',),
+    'core:manage_document_requirements': ('admin',),
+    'core:ajax_create_document_requirement': ('admin',),
+    'core:view_applications': ('admin', 'osas'),
+    'core:export_view_applications': ('admin', 'osas'),
+    'core:scholarship_awardees': ('admin', 'osas'),
+    'core:export_scholarship_awardees': ('admin', 'osas'),
+    'core:request_report': ('admin', 'osas'),
+    'core:report_status': ('admin', 'osas'),
+    'core:download_report': ('admin', 'osas'),
+    'core:review_queue': ('admin', 'osas'),
+    'core:assign_application': ('admin', 'osas'),
+    'core:osas_dashboard': ('osas',),
+    'core:review_application': ('osas',),
+    'core:bulk_review_applications': ('osas',),
+    'core:claim_next_application': ('osas',),
+    'core:submit_review': ('osas',),
+}
+
+# Routes whose only successful response is a redirect, so their intended
+# roles are not expected to get a 2xx.
+REDIRECT_ROUTES = {
+    # Logs out and sends the user to the landing page.
+    'core:logout',
+    # Forwards to the dashboard for the user's role.
+    'core:dashboard_router',
+    # Toggles on POST, then returns to manage_scholarships.
+    'core:toggle_scholarship_status',
+    # Claims on POST, then returns to the review queue.
+    'core:assign_application',
+    # Deprecated; forwards to review_application.
+    'core:submit_review',
+}
+
+# Literals are stripped so the same query with different ids counts as a repeat.
+_SQL_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def query_shape(sql):
+    """Return ``sql`` with its literal values replaced by ``?``."""
+    return _SQL_LITERALS.sub('?', sql)
+
+
+def default_report_path():
+    """Where the JSON report goes unless ``QUERY_BUDGET_REPORT`` is set."""
+    return os.environ.get(
+        'QUERY_BUDGET_REPORT',
+        os.path.join(tempfile.gettempdir(), 'query_budget_report.json')
+    )
+
+
+class QueryBudgetHarness:
+    """Seed a fixture and count the queries behind every named route."""
+
+    def __init__(self, client=None):
+        self.client = client or Client(raise_request_exception=False)
+        self.users = {}
+        self.objects = {}
+        self._batch = 0
+
+    # ------------------------------------------------------------------
+    # Fixture
+    # ------------------------------------------------------------------
+
+    def seed_base(self):
+        """Create one user per role plus the objects used as URL arguments."""
+        for role in ROLES:
+            user = User.objects.create_user(
+                username=f'budget_{role}',
+                password='budget-pass',
+                first_name='Budget',
+                last_name=role.title(),
+                email=f'budget_{role}@example.com',
+            )
+            user.profile.user_type = role
+            if role == 'student':
+                user.profile.student_id = 'BUDGET-0001'
+                user.profile.campus = 'dumingag'
+            user.profile.save()
+            self.users[role] = user
+
+        scholarship = Scholarship.objects.create(
+            title='Budget Scholarship',
+            description='Scholarship used as the URL argument for budget runs.',
+            eligibility_criteria='Open to all students.',
+            award_amount=Decimal('10000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=5,
+            created_by=self.users['admin'],
+        )
+        open_scholarship = Scholarship.objects.create(
+            title='Budget Open Scholarship',
+            description='Scholarship the budget student has not applied to.',
+            eligibility_criteria='Open to all students.',
+            award_amount=Decimal('8000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=5,
+            created_by=self.users['admin'],
+        )
+        application = Application.objects.create(
+            student=self.users['student'],
+            scholarship=scholarship,
+            personal_statement='Budget personal statement.',
+            gpa=Decimal('3.50'),
+        )
+        document = ApplicationDocument.objects.create(
+            application=application,
+            name='Transcript',
+            file='application_documents/budget/transcript.pdf',
+            file_size=2048,
+            content_type='application/pdf',
+        )
+        notifications = {
+            role: Notification.objects.create(
+                recipient=user,
+                title='Budget notification',
+                message='Budget notification message.',
+                related_application=application,
+            )
+            for role, user in self.users.items()
+        }
+        report_job = ReportJob.objects.create(
+            report_type='awardees',
+            filter_hash='budget',
+            data_version='budget',
+            requested_by=self.users['admin'],
+        )
+        upload_session = UploadSession.objects.create(
+            application=application,
+            uploaded_by=self.users['student'],
+            filename='budget.pdf',
+            name='Budget upload',
+            size=4096,
+        )
+        applicant = User.objects.create_user(username='budget_applicant', first_name='Budget', last_name='Applicant')
+        recommended_application = Application.objects.create(
+            student=applicant,
+            scholarship=scholarship,
+            personal_statement='Budget recommended statement.',
+            gpa=Decimal('3.75'),
+            status='osas_approved',
+            reviewed_by=self.users['osas'],
+            reviewed_at=timezone.now(),
+        )
+        finished_report = ReportJob(
+            report_type='awardees',
+            filter_hash='budget-finished',
+            data_version='budget',
+            status='done',
+            requested_by=self.users['admin'],
+            finished_at=timezone.now(),
+        )
+        finished_report.file.save('budget.pdf', ContentFile(b'%PDF-1.4 budget report'))
+        completed_upload = UploadSession.objects.create(
+            application=application,
+            uploaded_by=self.users['student'],
+            filename='budget-complete.pdf',
+            name='Budget completed upload',
+            size=document.file_size,
+            received=document.file_size,
+            status='complete',
+            document=document,
+        )
+        self.objects = {
+            'scholarship': scholarship,
+            'open_scholarship': open_scholarship,
+            'application': application,
+            'document': document,
+            'notifications': notifications,
+            'report_job': report_job,
+            'upload_session': upload_session,
+            'recommended_application': recommended_application,
+            'finished_report': finished_report,
+            'completed_upload': completed_upload,
+        }
+        return self.objects
+
+    def seed_bulk(self, students, scholarships, apps_per_student=3, docs_per_application=1, notifications_per_user=5):
+        """Add a batch of students, scholarships, applications and documents.
+
+        Rows come from ``LoadDataGenerator`` with the harness admin and OSAS
+        users as decision makers, so thousands of rows take seconds. Returns
+        the number of rows created per model.
+        """
+        self._batch += 1
+        generator = LoadDataGenerator(seed=self._batch, prefix=f'budget{self._batch}')
+        totals = generator.generate(
+            students=students,
+            scholarships=scholarships,
+            apps_per_student=apps_per_student,
+            docs_per_application=docs_per_application,
+            admin=self.users['admin'],
+            reviewers=[self.users['osas']],
+        )
+        Notification.objects.bulk_create([
+            Notification(
+                recipient=user,
+                title=f'Bulk notification {k + 1}',
+                message='Bulk notification message.',
+            )
+            for user in self.users.values()
+            for k in range(notifications_per_user)
+        ])
+        totals['notifications'] += notifications_per_user * len(self.users)
+        return totals
+
+    # ------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------
+
+    def route_names(self):
+        """Return the namespaced names of every route in ``core.urls``."""
+        return [
+            f'{core_urls.app_name}:{pattern.name}'
+            for pattern in core_urls.urlpatterns
+            if isinstance(pattern, URLPattern) and pattern.name
+        ]
+
+    def url_for(self, route_name, role):
+        """Reverse ``route_name`` with fixture objects for its arguments."""
+        pattern = next(
+            pattern for pattern in core_urls.urlpatterns
+            if isinstance(pattern, URLPattern)
+            and f'{core_urls.app_name}:{pattern.name}' == route_name
+        )
+        values = {
+            'application_id': self.objects['application'].pk,
+            'scholarship_id': self.objects['scholarship'].pk,
+            'document_id': self.objects['document'].pk,
+            'notification_id': self.objects['notifications'][role].pk,
+            'fmt': 'csv',
+            'report_type': 'awardees',
+            'job_id': self.objects['report_job'].pk,
+            'upload_id': self.objects['upload_session'].pk,
+        }
+        for name, key in ROUTE_ARGUMENTS.get(route_name, {}).items():
+            values[name] = self.objects[key].pk
+        kwargs = {name: values[name] for name in pattern.pattern.converters}
+        return reverse(route_name, kwargs=kwargs)
+
+    def measure(self, route_name, role):
+        """Request ``route_name`` as ``role`` and count the queries it ran.
+
+        Routes in ``ROUTE_POST_DATA`` are posted their body and rolled back;
+        the rest are fetched with GET.
+
+        ``repeated`` counts queries whose shape already ran earlier in the
+        same request, which is how an N+1 shows up even when the page is
+        already full on the small fixture.
+        """
+        url = self.url_for(route_name, role)
+        headers = {'HTTP_HX_REQUEST': 'true'} if ':htmx_' in route_name or route_name in HTMX_ROUTES else {}
+        post_data = ROUTE_POST_DATA.get(route_name)
+        self.client.force_login(self.users[role])
+        # Measure the cold path: cached dashboard stats would hide their queries.
+        cache.clear()
+        if post_data is None:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, ROUTE_QUERY_PARAMS.get(route_name, {}), **headers)
+                if response.streaming:
+                    # Exports run their queries while the body is consumed.
+                    b''.join(response.streaming_content)
+        else:
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.post(url, post_data(self.objects), **headers)
+                # Leave the fixture as it was for the next role and run.
+                transaction.set_rollback(True)
+        shapes = [query_shape(query['sql']) for query in queries.captured_queries]
+        return {
+            'url': url,
+            'method': 'GET' if post_data is None else 'POST',
+            'status': response.status_code,
+            'queries': len(shapes),
+            'repeated': len(shapes) - len(set(shapes)),
+        }
+
+    @staticmethod
+    def intended_roles(route_name):
+        """Roles that should get a 2xx from ``route_name``."""
+        return ROUTE_ROLES.get(route_name, ROLES)
+
+    def measure_all(self):
+        """Measure every route as every role.
+
+        Returns ``{route_name: {role: {'url', 'method', 'status', 'queries', 'repeated'}}}``.
+        """
+        return {
+            route_name: {role: self.measure(route_name, role) for role in ROLES}
+            for route_name in self.route_names()
+        }
+
+    # ------------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def build_report(small, large, budgets, fixture):
+        """Combine two ``measure_all`` runs into one report dict."""
+        routes = {}
+        for route_name, by_role in large.items():
+            routes[route_name] = {}
+            for role, result in by_role.items():
+                routes[route_name][role] = {
+                    'url': result['url'],
+                    'method': result['method'],
+                    'status': result['status'],
+                    'queries_small': small[route_name][role]['queries'],
+                    'queries_large': result['queries'],
+                    'repeated': result['repeated'],
+                    'budget': budgets(route_name, role),
+                }
+        return {
+            'generated_at': timezone.now().isoformat(),
+            'fixture': fixture,
+            'routes': routes,
+        }
+
+    @staticmethod
+    def write_report(report, path=None):
+        """Write ``report`` as JSON and return the path written."""
+        path = path or default_report_path()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+        return path
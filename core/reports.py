@@ -0,0 +1,288 @@
+"""
+Background-generated PDF reports of awardees and final decisions.
+
+``request_report`` turns a report type and its filters into a ``ReportJob``.
+Jobs are keyed by a hash of the filters and by the version of the data they
+cover, so asking for an unchanged report returns the job that already
+produced it and nothing is generated twice. ``ReportWorker``, run by
+``manage.py run_report_worker``, claims queued jobs and writes each report
+to ``MEDIA_ROOT/reports/`` with ``PdfTableWriter``, reading the rows with
+the same queries as the ``scholarship_awardees`` and
+``admin_review_history`` pages.
+"""
+
+import hashlib
+import json
+import logging
+import tempfile
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from .exports import CAMPUS_LABELS, YEAR_LEVEL_LABELS, Column, export_rows, full_name, label
+from .models import ReportJob
+from .pdf import PdfTableWriter
+from .services import ApplicationService
+
+logger = logging.getLogger(__name__)
+
+
+def _awardees_queryset(filters):
+    return ApplicationService.awardees(
+        search=filters.get('search', ''),
+        campus=filters.get('campus'),
+        scholarship_id=filters.get('scholarship'),
+    )
+
+
+def _peso(amount):
+    return '' if amount is None else f'PHP {amount:,.2f}'
+
+
+def _decisions_queryset(filters):
+    return ApplicationService.final_decisions(
+        decision=filters.get('decision', 'all'),
+        campus=filters.get('campus'),
+        decided_by=filters.get('decided_by'),
+    )
+
+
+# report type -> title, roles allowed to request it, GET parameters it
+# accepts, queryset builder and (column, relative width) pairs.
+REPORTS = {
+    'awardees': {
+        'title': 'Scholarship Awardees Report',
+        'roles': ('admin', 'osas'),
+        'params': ('search', 'campus', 'scholarship'),
+        'queryset': _awardees_queryset,
+        'columns': [
+            (Column('Student Name', 'student__first_name', 'student__last_name', format=full_name), 3),
+            (Column('Student ID', 'student__profile__student_id'), 1.5),
+            (Column('Scholarship', 'scholarship__title'), 3),
+            (Column('Award Amount', 'scholarship__award_amount', format=_peso), 1.3),
+            (Column('Campus', 'student__profile__campus', format=label(CAMPUS_LABELS)), 1.5),
+            (Column('GPA', 'gpa'), 0.7),
+            (Column('Year Level', 'student__profile__year_level', format=label(YEAR_LEVEL_LABELS)), 1.3),
+            (Column('Approved', 'final_decision_at'), 1.3),
+        ],
+    },
+    'decisions': {
+        'title': 'Final Decision History Report',
+        'roles': ('admin',),
+        'params': ('decision', 'campus'),
+        'queryset': _decisions_queryset,
+        'columns': [
+            (Column('Student Name', 'student__first_name', 'student__last_name', format=full_name), 3),
+            (Column('Student ID', 'student__profile__student_id'), 1.5),
+            (Column('Scholarship', 'scholarship__title'), 3),
+            (Column('Decision', 'status'), 1),
+            (Column('OSAS Reviewer', 'reviewed_by__username'), 1.5),
+            (Column('Decided By', 'final_decision_by__username'), 1.5),
+            (Column('Decided', 'final_decision_at'), 1.3),
+        ],
+    },
+}
+
+
+def can_request(user, report_type):
+    """Return True if ``user``'s role may generate ``report_type``."""
+    spec = REPORTS.get(report_type)
+    profile = getattr(user, 'profile', None)
+    return spec is not None and profile is not None and profile.user_type in spec['roles']
+
+
+def report_filters(report_type, params, user):
+    """Normalize the listing page's GET parameters into job filters.
+
+    Empty values and non-numeric scholarship ids are dropped so equivalent
+    requests hash the same, and the history page's ``admin=me`` becomes the
+    requesting admin's id.
+    """
+    filters = {
+        name: params.get(name).strip()
+        for name in REPORTS[report_type]['params']
+        if params.get(name, '').strip()
+    }
+    if not filters.get('scholarship', '0').isdigit():
+        del filters['scholarship']
+    if report_type == 'decisions':
+        if filters.get('decision') == 'all':
+            del filters['decision']
+        if params.get('admin') == 'me':
+            filters['decided_by'] = user.pk
+    return filters
+
+
+def filter_hash(report_type, filters):
+    payload = json.dumps([report_type, filters], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def data_version(queryset):
+    """Fingerprint of the rows a report covers, read from the database.
+
+    Combines the row count, the sum and maximum of their ids and the latest
+    decision time (which change whenever rows enter, leave or are decided
+    again) with the latest edit of the scholarships and student profiles
+    the rows show. Every worker process computes the same version for the
+    same data.
+    """
+    aggregate = queryset.order_by().aggregate(
+        rows=Count('id'), id_sum=Sum('id'), id_max=Max('id'), latest=Max('final_decision_at'),
+        scholarships_updated=Max('scholarship__updated_at'), profiles_updated=Max('student__profile__updated_at'),
+    )
+    payload = json.dumps(sorted(aggregate.items()), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def request_report(report_type, filters, user=None):
+    """Return the job for this report, queueing it if it is not cached yet.
+
+    A finished job whose file still exists is returned as is. Failed jobs,
+    and finished jobs whose file has gone missing, are queued again.
+    """
+    queryset = REPORTS[report_type]['queryset'](filters)
+    job, created = ReportJob.objects.get_or_create(
+        report_type=report_type,
+        filter_hash=filter_hash(report_type, filters),
+        data_version=data_version(queryset),
+        defaults={'filters': filters, 'requested_by': user},
+    )
+    if created:
+        return job
+
+    missing = job.status == 'done' and not (job.file and job.file.storage.exists(job.file.name))
+    if job.status == 'failed' or missing:
+        ReportJob.objects.filter(pk=job.pk, status=job.status).update(
+            status='queued', last_error='', claim_token='', claimed_at=None
+        )
+        job.refresh_from_db()
+    return job
+
+
+def _pdf_cell(value, tz):
+    if value is None:
+        return ''
+    if hasattr(value, 'astimezone'):
+        return value.astimezone(tz).strftime('%b %d, %Y')
+    return str(value)
+
+
+class ReportWorker:
+    """Generate queued ``ReportJob`` PDFs one at a time.
+
+    Jobs are claimed with a conditional UPDATE so several workers can run
+    side by side; a job whose worker died is released after the claim
+    timeout and picked up again.
+    """
+
+    def __init__(self, claim_timeout_seconds=None):
+        self.claim_timeout = timedelta(
+            seconds=claim_timeout_seconds or getattr(settings, 'REPORT_WORKER_CLAIM_TIMEOUT', 900)
+        )
+
+    def release_stale_claims(self):
+        """Requeue jobs claimed by a worker that never finished them."""
+        return ReportJob.objects.filter(
+            status='running',
+            claimed_at__lt=timezone.now() - self.claim_timeout
+        ).update(status='queued', claim_token='', claimed_at=None)
+
+    def claim_next(self):
+        """Atomically claim the oldest queued job, or return None."""
+        for job_id in ReportJob.objects.filter(status='queued').order_by('created_at', 'id').values_list('id', flat=True)[:5]:
+            token = uuid.uuid4().hex
+            claimed = ReportJob.objects.filter(id=job_id, status='queued').update(
+                status='running', claim_token=token, claimed_at=timezone.now()
+            )
+            if claimed:
+                return ReportJob.objects.get(id=job_id)
+        return None
+
+    def process_next(self):
+        """Claim and generate one job; return it, or None if the queue is empty."""
+        self.release_stale_claims()
+        job = self.claim_next()
+        if job is None:
+            return None
+        try:
+            self.generate(job)
+        except Exception as e:
+            logger.exception(f'Report job {job.pk} failed')
+            ReportJob.objects.filter(pk=job.pk, claim_token=job.claim_token).update(
+                status='failed', last_error=str(e), claim_token='', claimed_at=None,
+                finished_at=timezone.now()
+            )
+            job.status = 'failed'
+            job.last_error = str(e)
+        return job
+
+    def generate(self, job):
+        """Write the PDF for ``job`` and mark it done."""
+        spec = REPORTS[job.report_type]
+        queryset = spec['queryset'](job.filters)
+        totals = queryset.order_by().aggregate(rows=Count('id'), amount=Sum('scholarship__award_amount'))
+
+        subtitle = [f'Generated {timezone.localtime():%B %d, %Y %I:%M %p}']
+        if job.filters:
+            subtitle.append('Filters: ' + ', '.join(
+                f'{name.replace("_", " ")}={value}' for name, value in sorted(job.filters.items())
+            ))
+        summary = f'Records: {totals["rows"]}'
+        if job.report_type == 'awardees':
+            summary += f'    Total amount: {_peso(totals["amount"] or 0)}'
+        subtitle.append(summary)
+
+        columns = [column for column, _ in spec['columns']]
+        tz = timezone.get_current_timezone()
+        with tempfile.TemporaryFile() as output:
+            writer = PdfTableWriter(
+                output,
+                spec['title'],
+                subtitle_lines=subtitle,
+                columns=[(column.header, width) for column, width in spec['columns']],
+            )
+            for row in export_rows(queryset, columns):
+                writer.add_row([_pdf_cell(value, tz) for value in row])
+            writer.close()
+
+            output.seek(0)
+            name = f'{job.report_type}/{job.filter_hash[:16]}-{job.data_version[:16]}.pdf'
+            job.file.save(name, File(output), save=False)
+
+        finished_at = timezone.now()
+        finished = ReportJob.objects.filter(pk=job.pk, claim_token=job.claim_token).update(
+            file=job.file.name, row_count=writer.rows, status='done', finished_at=finished_at,
+            claim_token='', claimed_at=None
+        )
+        if not finished:
+            # The claim lapsed and another worker took the job over; keep its
+            # result and drop this one's file.
+            logger.warning(f'Report job {job.pk} was reclaimed before it finished')
+            job.file.delete(save=False)
+            return job
+
+        job.row_count = writer.rows
+        job.status = 'done'
+        job.finished_at = finished_at
+        job.claim_token = ''
+        job.claimed_at = None
+        self.discard_superseded(job)
+        return job
+
+    def discard_superseded(self, job):
+        """Delete older versions of the same report and their files."""
+        older = ReportJob.objects.filter(
+            report_type=job.report_type,
+            filter_hash=job.filter_hash,
+            status__in=['done', 'failed'],
+            created_at__lte=job.created_at,
+        ).exclude(pk=job.pk)
+        for stale in older:
+            if stale.file:
+                stale.file.delete(save=False)
+        return older.delete()[0]
@@ -0,0 +1,173 @@
+"""
+Full-text search over scholarships.
+
+On SQLite the ``core_scholarship_fts`` FTS5 table indexes the title,
+description and eligibility criteria of every scholarship. It is an
+external-content table over ``core_scholarship`` kept in sync by triggers,
+so saves, deletes, ``bulk_create`` and ``QuerySet.update()`` all reach the
+index. Results are ranked with BM25, weighting title matches highest, and
+each search term also matches as a prefix for type-ahead.
+
+Other backends, or a SQLite build without FTS5, fall back to ``icontains``
+filters with title matches ranked first.
+"""
+
+import re
+
+from django.db import connection as default_connection
+from django.db import OperationalError
+from django.db.models import BooleanField, Case, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'core_scholarship_fts'
+
+# BM25 column weights: title, description, eligibility_criteria.
+RANK_WEIGHTS = (10.0, 2.0, 4.0)
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, eligibility_criteria,
+        content='core_scholarship', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON core_scholarship BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, eligibility_criteria)
+        VALUES (new.id, new.title, new.description, new.eligibility_criteria);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON core_scholarship BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, eligibility_criteria)
+        VALUES ('delete', old.id, old.title, old.description, old.eligibility_criteria);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF title, description, eligibility_criteria ON core_scholarship BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, eligibility_criteria)
+        VALUES ('delete', old.id, old.title, old.description, old.eligibility_criteria);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, eligibility_criteria)
+        VALUES (new.id, new.title, new.description, new.eligibility_criteria);
+    END
+    """,
+]
+
+# Databases (by alias and name) already checked for the FTS table.
+_available = {}
+
+
+def install_search_index(connection=None):
+    """Create the FTS table and its triggers if they are missing.
+
+    Safe to run repeatedly: Django drops the triggers whenever a migration
+    rebuilds ``core_scholarship`` on SQLite, so this also runs after every
+    ``migrate``. Returns False when the backend has no FTS5 support.
+    """
+    connection = connection or default_connection
+    _available.pop(_cache_key(connection), None)
+    if connection.vendor != 'sqlite':
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        created = cursor.fetchone() is None
+        try:
+            for statement in _SCHEMA:
+                cursor.execute(statement)
+        except OperationalError:
+            # SQLite compiled without FTS5.
+            return False
+        if created:
+            weights = ', '.join(str(weight) for weight in RANK_WEIGHTS)
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', %s)",
+                [f'bm25({weights})']
+            )
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def rebuild_search_index(connection=None):
+    """Re-index every scholarship from ``core_scholarship``."""
+    connection = connection or default_connection
+    if not install_search_index(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def _cache_key(connection):
+    return (connection.alias, str(connection.settings_dict.get('NAME')))
+
+
+def fts_available(connection=None):
+    """Return True when the FTS table exists on this database."""
+    connection = connection or default_connection
+    if connection.vendor != 'sqlite':
+        return False
+    key = _cache_key(connection)
+    if key not in _available:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _available[key] = cursor.fetchone() is not None
+    return _available[key]
+
+
+def search_terms(text):
+    """Split user input into lowercase search terms."""
+    return _TOKEN.findall(text.lower())
+
+
+def build_match_query(text, prefix=True):
+    """Turn user input into an FTS5 MATCH expression.
+
+    Each term is quoted, so FTS5 operators typed by the user are treated as
+    plain text, and all terms must match. With ``prefix`` every term also
+    matches longer words ("engin" finds "engineering").
+    """
+    star = '*' if prefix else ''
+    return ' '.join(f'"{term}"{star}' for term in search_terms(text))
+
+
+def search_scholarships(queryset, text, prefix=True):
+    """Filter ``queryset`` to scholarships matching ``text``.
+
+    The result is annotated with ``search_rank``; order by it ascending to
+    get the best matches first.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    if fts_available():
+        # Join the index (INNER JOIN via isnull=False) so SQLite runs the
+        # MATCH once and drives the query from the index.
+        match = build_match_query(text, prefix=prefix)
+        return queryset.filter(
+            RawSQL(f'"{FTS_TABLE}" MATCH %s', (match,), output_field=BooleanField()),
+            search_entry__isnull=False,
+        ).annotate(search_rank=F('search_entry__rank'))
+
+    return _fallback_search(queryset, text, terms)
+
+
+def _fallback_search(queryset, text, terms):
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) |
+            Q(description__icontains=term) |
+            Q(eligibility_criteria__icontains=term)
+        )
+    return queryset.annotate(search_rank=Case(
+        When(title__icontains=text.strip(), then=Value(0)),
+        When(title__icontains=terms[0], then=Value(1)),
+        default=Value(2),
+        output_field=IntegerField(),
+    ))
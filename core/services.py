@@ -9,11 +9,21 @@ from django.utils import timezone
 from django.db import transaction, models
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import User
-from django.db.models import Q, Count, Sum, Avg, F
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q, Count, Sum, Avg, F, OuterRef, Subquery, Value
+from django.db.models.functions import Concat
 from datetime import timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, List, Dict, Optional, Tuple, Union
+import logging
+import string
+import threading
+import time
+import uuid
 
-from .models import Scholarship, Application, Notification, UserProfile
+from .models import Scholarship, Application, Notification, UserProfile, EligibilityKeyword, ScholarshipCounter
+
+logger = logging.getLogger(__name__)
 
 
 class ScholarshipService:
@@ -105,6 +115,33 @@ class ScholarshipService:
         
         return scholarship
     
+    DEPARTMENT_KEYWORDS_CACHE_KEY = 'scholarships:department_keywords'
+    DEPARTMENT_KEYWORDS_CACHED = 50
+    
+    @staticmethod
+    def get_department_keywords(limit: int = 10) -> List[str]:
+        """Top eligibility keywords for the department filter, alphabetically.
+        
+        The top keywords come from the EligibilityKeyword index and are
+        cached until a scholarship is saved or deleted.
+        """
+        keywords = cache.get(ScholarshipService.DEPARTMENT_KEYWORDS_CACHE_KEY)
+        if keywords is None:
+            keywords = [
+                keyword for keyword, _ in
+                EligibilityKeyword.top_keywords(ScholarshipService.DEPARTMENT_KEYWORDS_CACHED)
+            ]
+            cache.set(
+                ScholarshipService.DEPARTMENT_KEYWORDS_CACHE_KEY,
+                keywords,
+                timeout=getattr(settings, 'DEPARTMENT_KEYWORDS_TIMEOUT', 3600),
+            )
+        return sorted(keywords[:limit])
+    
+    @staticmethod
+    def invalidate_department_keywords() -> None:
+        cache.delete(ScholarshipService.DEPARTMENT_KEYWORDS_CACHE_KEY)
+    
     @staticmethod
     def get_available_scholarships(for_user: Optional[User] = None) -> List[Scholarship]:
         """Get scholarships available for application."""
@@ -147,6 +184,108 @@ class ScholarshipService:
 class ApplicationService:
     """Service class for application-related business logic."""
     
+    # OSAS review actions and the status each one sets
+    RECOMMENDATION_STATUSES = {
+        'approve': 'osas_approved',
+        'reject': 'osas_rejected',
+        'request_info': 'additional_info_required',
+    }
+    RECOMMENDATION_MESSAGES = {
+        'approve': 'Recommended for approval.',
+        'reject': 'Recommended for rejection.',
+        'request_info': 'Additional information requested.',
+    }
+    
+    @staticmethod
+    def scope_for_user(queryset: models.QuerySet, user: User) -> models.QuerySet:
+        """Restrict an application queryset to what a user's role can see."""
+        profile = getattr(user, 'profile', None)
+        if profile is None:
+            return queryset.none()
+        if profile.is_student:
+            return queryset.filter(student=user)
+        if profile.is_admin:
+            return queryset.filter(scholarship__created_by=user)
+        if profile.is_osas:
+            return queryset
+        return queryset.none()
+    
+    @staticmethod
+    def awardees(
+        search: str = '',
+        campus: Optional[str] = None,
+        scholarship_id: Optional[Union[int, str]] = None,
+    ) -> models.QuerySet:
+        """Approved applications, latest decision first, for the awardees
+        page and its exports and reports."""
+        awardees = Application.objects.filter(
+            status='approved'
+        ).select_related(
+            'student', 'student__profile', 'scholarship', 'final_decision_by'
+        ).order_by('-final_decision_at')
+        if search:
+            awardees = awardees.filter(
+                Q(student__first_name__icontains=search) |
+                Q(student__last_name__icontains=search) |
+                Q(student__username__icontains=search) |
+                Q(student__profile__student_id__icontains=search)
+            )
+        if campus:
+            awardees = awardees.filter(student__profile__campus=campus)
+        if scholarship_id:
+            awardees = awardees.filter(scholarship_id=scholarship_id)
+        return awardees
+    
+    @staticmethod
+    def final_decisions(
+        decision: str = 'all',
+        campus: Optional[str] = None,
+        decided_by: Optional[Union[User, int]] = None,
+    ) -> models.QuerySet:
+        """Applications with an admin final decision, latest first."""
+        applications = Application.objects.filter(
+            final_decision_by__isnull=False
+        ).select_related(
+            'student', 'student__profile', 'scholarship', 'reviewed_by', 'final_decision_by'
+        ).order_by('-final_decision_at')
+        if decision in ('approved', 'rejected'):
+            applications = applications.filter(status=decision)
+        if campus:
+            applications = applications.filter(student__profile__campus=campus)
+        if decided_by:
+            applications = applications.filter(final_decision_by=decided_by)
+        return applications
+    
+    @staticmethod
+    def get_status_counts(
+        queryset: Optional[models.QuerySet] = None,
+        user: Optional[User] = None,
+        campus: Optional[str] = None,
+        scholarship=None,
+    ) -> Dict[str, int]:
+        """Count applications per status with a single GROUP BY query.
+        
+        The result holds every status in ``Application.STATUS_CHOICES`` (zero
+        when no rows match) plus an ``'all'`` total. Counts can be scoped to a
+        base queryset, a user's role, a campus and/or a scholarship.
+        """
+        applications = queryset if queryset is not None else Application.objects.all()
+        
+        if user is not None:
+            applications = ApplicationService.scope_for_user(applications, user)
+        if campus:
+            applications = applications.filter(student__profile__campus=campus)
+        if scholarship:
+            applications = applications.filter(scholarship=scholarship)
+        
+        counts = {status: 0 for status, _ in Application.STATUS_CHOICES}
+        rows = applications.order_by().values_list('status').annotate(count=Count('id'))
+        for status, count in rows:
+            counts[status] = count
+        counts['all'] = sum(counts.values())
+        
+        return counts
+    
     @staticmethod
     @transaction.atomic
     def submit_application(user: User, scholarship: Scholarship, **application_data) -> Application:
@@ -193,6 +332,128 @@ class ApplicationService:
         
         return application
     
+    @staticmethod
+    def claim_lease() -> timedelta:
+        """How long a reviewer's claim lasts before it returns to the queue."""
+        return timedelta(seconds=getattr(settings, 'REVIEW_CLAIM_LEASE_SECONDS', 1800))
+    
+    @staticmethod
+    def _claim_pending(application_id: int, scholarship_id: int, reviewer: User) -> bool:
+        """Conditional UPDATE that claims one still-pending application."""
+        now = timezone.now()
+        claimed = Application.objects.filter(id=application_id, status='pending').update(
+            status='under_review',
+            reviewed_by=reviewer,
+            reviewed_at=now,
+            claim_expires_at=now + ApplicationService.claim_lease()
+        )
+        if claimed:
+            ScholarshipCounter.record_transition(scholarship_id, 'pending', 'under_review')
+        return bool(claimed)
+    
+    @staticmethod
+    def release_expired_claims() -> int:
+        """Put applications whose claim has lapsed back in the pending queue.
+        
+        Returns the number of claims released.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            expired = list(
+                Application.objects.select_for_update(skip_locked=True, of=('self',)).filter(
+                    status='under_review', claim_expires_at__lt=now
+                ).values_list('id', 'scholarship_id', 'student_id')
+            )
+            if not expired:
+                return 0
+            released = Application.objects.filter(
+                id__in=[row[0] for row in expired], status='under_review', claim_expires_at__lt=now
+            ).update(status='pending', reviewed_by=None, reviewed_at=None, claim_expires_at=None)
+            if released == len(expired):
+                deltas = {}
+                for _, scholarship_id, _ in expired:
+                    delta = deltas.setdefault(scholarship_id, {'under_review': 0, 'pending': 0})
+                    delta['under_review'] -= 1
+                    delta['pending'] += 1
+                ScholarshipCounter.apply_deltas(deltas)
+            else:
+                # Some were finished in the meantime; recount rather than guess.
+                ScholarshipCounter.rebuild(scholarship_ids={row[1] for row in expired})
+        
+        DashboardStatsService.invalidate('applications', user_ids={row[2] for row in expired})
+        logger.info('Released %d lapsed review claim(s)', released)
+        return released
+    
+    @staticmethod
+    def claim_application(application: Application, reviewer: User) -> bool:
+        """Assign a pending ``application`` to ``reviewer`` unless someone else got it first.
+        
+        The claim is a lease of ``REVIEW_CLAIM_LEASE_SECONDS``; if the review
+        is not finished by then the application goes back to the queue.
+        Returns False when the application is no longer pending.
+        """
+        ApplicationService.release_expired_claims()
+        with transaction.atomic():
+            claimed = ApplicationService._claim_pending(application.pk, application.scholarship_id, reviewer)
+        if not claimed:
+            return False
+        
+        application.refresh_from_db(fields=['status', 'reviewed_by', 'reviewed_at', 'claim_expires_at'])
+        # The counters already record the claim.
+        application._loaded_status = application.status
+        DashboardStatsService.invalidate('applications', user_ids=[application.student_id])
+        return True
+    
+    @staticmethod
+    def claim_next(
+        reviewer: User,
+        scholarship_id: Optional[int] = None,
+        campus: Optional[str] = None,
+        fallback: bool = True
+    ) -> Optional[Application]:
+        """Claim the oldest pending application for ``reviewer``.
+        
+        ``scholarship_id`` and ``campus`` give the reviewer an affinity:
+        matching applications are tried first and, when ``fallback`` is
+        True, any pending application after that. Candidates are read with
+        ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database supports
+        it, so concurrent reviewers each skip to a different row instead of
+        waiting on one another, and taken with the same conditional UPDATE
+        as ``claim_application``. Returns None when nothing is left.
+        """
+        if not reviewer.profile.is_osas:
+            raise ValidationError("Only OSAS staff can claim applications for review.")
+        
+        ApplicationService.release_expired_claims()
+        
+        affinity = {}
+        if scholarship_id:
+            affinity['scholarship_id'] = scholarship_id
+        if campus:
+            affinity['student__profile__campus'] = campus
+        attempts = [affinity, {}] if affinity and fallback else [affinity]
+        
+        for filters in attempts:
+            taken = set()
+            while True:
+                with transaction.atomic():
+                    candidate = Application.objects.select_for_update(skip_locked=True, of=('self',)).filter(
+                        status='pending', **filters
+                    ).exclude(id__in=taken).order_by('submitted_at', 'id').values_list(
+                        'id', 'scholarship_id'
+                    ).first()
+                    if candidate is None:
+                        break
+                    if not ApplicationService._claim_pending(*candidate, reviewer):
+                        # Another reviewer won this one; try the next.
+                        taken.add(candidate[0])
+                        continue
+                
+                application = Application.objects.select_related('student', 'scholarship').get(id=candidate[0])
+                DashboardStatsService.invalidate('applications', user_ids=[application.student_id])
+                return application
+        return None
+    
     @staticmethod
     @transaction.atomic
     def assign_application(application: Application, reviewer: User) -> Application:
@@ -200,16 +461,12 @@ class ApplicationService:
         if not reviewer.profile.is_osas:
             raise ValidationError("Only OSAS staff can be assigned to review applications.")
         
-        if application.status != 'pending':
+        if not ApplicationService.claim_application(application, reviewer):
             raise ValidationError("Only pending applications can be assigned.")
         
-        application.reviewer = reviewer
-        application.status = 'under_review'
-        application.save()
-        
         # Notify student
         NotificationService.create_notification(
-            recipient=application.user,
+            recipient=application.student,
             title="Application Under Review",
             message=f"Your application for {application.scholarship.title} is now under review.",
             notification_type='info',
@@ -218,6 +475,358 @@ class ApplicationService:
         
         return application
     
+    @staticmethod
+    def decide(
+        application: Application,
+        new_status: str,
+        from_statuses: Iterable[str],
+        **fields
+    ) -> Application:
+        """Move ``application`` to ``new_status`` without racing other reviewers.
+        
+        The status change is one conditional UPDATE that only applies while
+        the application still has the status it was loaded with, so two
+        people deciding the same application cannot both succeed. Approvals
+        also reserve a scholarship slot with ``ScholarshipCounter.reserve_slot``
+        in the same transaction; when none is left nothing is saved.
+        ``fields`` are saved along with the status.
+        
+        Raises ``ValidationError`` with code ``already_decided`` or
+        ``no_slots``.
+        """
+        old_status = application.status
+        if old_status not in from_statuses:
+            raise ValidationError("This application has already been decided.", code='already_decided')
+        
+        fields['status'] = new_status
+        with transaction.atomic():
+            # Reserve the slot first, as bulk_final_decision does, so a
+            # counter rebuilt by reserve_slot still sees the old status.
+            if new_status == 'approved' and not ScholarshipCounter.reserve_slot(
+                application.scholarship_id, application.scholarship.available_slots, old_status
+            ):
+                raise ValidationError("No more slots available for this scholarship.", code='no_slots')
+            if not Application.objects.filter(pk=application.pk, status=old_status).update(**fields):
+                # Rolls back the slot reserved above.
+                raise ValidationError(
+                    "This application was decided by someone else in the meantime.",
+                    code='already_decided'
+                )
+            if new_status != 'approved':
+                ScholarshipCounter.record_transition(application.scholarship_id, old_status, new_status)
+        
+        for name, value in fields.items():
+            setattr(application, name, value)
+        # The counters are already up to date; keep the save signal from
+        # counting this transition again if the instance is saved later.
+        application._loaded_status = new_status
+        DashboardStatsService.invalidate('applications', user_ids=[application.student_id])
+        return application
+    
+    @staticmethod
+    def final_decision_notifications(application: Application, admin: User) -> List[Notification]:
+        """Unsaved notifications for the student and the OSAS reviewer of a final decision."""
+        if application.status == 'approved':
+            notifications = [Notification(
+                recipient=application.student,
+                title='Scholarship Application Approved!',
+                message=f'Congratulations! Your application for {application.scholarship.title} has been approved by the administrator.',
+                notification_type='success',
+                related_application=application
+            )]
+            if application.reviewed_by:
+                notifications.append(Notification(
+                    recipient=application.reviewed_by,
+                    title='Application Approved by Admin',
+                    message=f'The application you recommended for {application.scholarship.title} has been approved by {admin.get_full_name()}.',
+                    notification_type='success',
+                    related_application=application
+                ))
+        else:
+            notifications = [Notification(
+                recipient=application.student,
+                title='Scholarship Application Decision',
+                message=f'Your application for {application.scholarship.title} has been reviewed.',
+                notification_type='info',
+                related_application=application
+            )]
+            if application.reviewed_by:
+                notifications.append(Notification(
+                    recipient=application.reviewed_by,
+                    title='Application Rejected by Admin',
+                    message=f'The application you reviewed for {application.scholarship.title} has been rejected by {admin.get_full_name()}.',
+                    notification_type='info',
+                    related_application=application
+                ))
+        return notifications
+    
+    @staticmethod
+    def bulk_final_decision(
+        application_ids: Iterable[int],
+        decision: str,
+        admin: User,
+        comments: str = ""
+    ) -> List[Dict]:
+        """Approve or reject many OSAS-reviewed applications in one transaction.
+        
+        The applications are read (and locked where the database supports
+        it) in one query. Slots are reserved per scholarship with
+        ``ScholarshipCounter.reserve_slots``; approvals beyond the free
+        slots are left pending, in the order the ids were given. The
+        decided applications are saved with one UPDATE per previous status
+        and their notifications with one ``bulk_create``.
+        
+        Returns one ``{'id', 'result', 'message'}`` dict per requested id,
+        where ``result`` is ``approved``, ``rejected``, ``no_slots``,
+        ``already_decided`` or ``not_found``.
+        """
+        statuses = {'approve': 'approved', 'reject': 'rejected'}
+        if decision not in statuses:
+            raise ValidationError(f"Invalid decision. Must be one of: {list(statuses)}")
+        new_status = statuses[decision]
+        
+        ids = list(dict.fromkeys(int(application_id) for application_id in application_ids))
+        position = {application_id: index for index, application_id in enumerate(ids)}
+        results = {
+            application_id: {'id': application_id, 'result': 'not_found', 'message': 'Application not found.'}
+            for application_id in ids
+        }
+        now = timezone.now()
+        
+        with transaction.atomic():
+            applications = sorted(
+                Application.objects.select_for_update(of=('self',)).filter(id__in=ids).select_related(
+                    'student', 'scholarship', 'reviewed_by'
+                ).order_by('id'),
+                key=lambda application: position[application.id]
+            )
+            pending = []
+            for application in applications:
+                if application.status in ('osas_approved', 'osas_rejected'):
+                    pending.append(application)
+                else:
+                    results[application.id].update(
+                        result='already_decided', message='This application has already been decided.'
+                    )
+            
+            if new_status == 'approved':
+                by_scholarship = {}
+                for application in pending:
+                    by_scholarship.setdefault(application.scholarship_id, []).append(application)
+                decided = []
+                for scholarship_id, group in by_scholarship.items():
+                    granted = ScholarshipCounter.reserve_slots(
+                        scholarship_id, group[0].scholarship.available_slots,
+                        [application.status for application in group]
+                    )
+                    decided.extend(group[:granted])
+                    for application in group[granted:]:
+                        results[application.id].update(
+                            result='no_slots', message='No more slots available for this scholarship.'
+                        )
+            else:
+                decided = pending
+                deltas = {}
+                for application in decided:
+                    delta = deltas.setdefault(application.scholarship_id, {})
+                    delta[application.status] = delta.get(application.status, 0) - 1
+                    delta[new_status] = delta.get(new_status, 0) + 1
+                ScholarshipCounter.apply_deltas(deltas)
+            
+            by_status = {}
+            for application in decided:
+                by_status.setdefault(application.status, []).append(application.id)
+            for old_status, group_ids in by_status.items():
+                updated = Application.objects.filter(id__in=group_ids, status=old_status).update(
+                    status=new_status,
+                    final_decision_by=admin,
+                    final_decision_at=now,
+                    final_decision_comments=comments
+                )
+                if updated != len(group_ids):
+                    # Only possible without row locks; undo the whole batch.
+                    raise ValidationError(
+                        "Some applications were decided by someone else in the meantime. Please try again.",
+                        code='already_decided'
+                    )
+            
+            notifications = []
+            for application in decided:
+                application.status = new_status
+                application.final_decision_by = admin
+                application.final_decision_at = now
+                application.final_decision_comments = comments
+                application._loaded_status = new_status
+                notifications.extend(ApplicationService.final_decision_notifications(application, admin))
+                results[application.id].update(result=new_status, message=f'Application {new_status}.')
+            Notification.objects.bulk_create(notifications)
+        
+        if decided:
+            # update() and bulk_create() skip the signals that expire these.
+            DashboardStatsService.invalidate(
+                'applications', user_ids={notification.recipient_id for notification in notifications}
+            )
+        return [results[application_id] for application_id in ids]
+    
+    @staticmethod
+    def review_comment_expression(template: str):
+        """Database expression that renders a shared review comment per row.
+        
+        ``template`` may use ``{student}``, ``{first_name}`` and
+        ``{scholarship}``; they are filled in by subqueries so one UPDATE
+        can give every application its own comment. Use ``{{``/``}}`` for
+        literal braces.
+        """
+        students = User.objects.filter(pk=OuterRef('student_id'))
+        placeholders = {
+            'student': Subquery(students.annotate(
+                full_name=Concat('first_name', Value(' '), 'last_name', output_field=models.TextField())
+            ).values('full_name')[:1]),
+            'first_name': Subquery(students.values('first_name')[:1]),
+            'scholarship': Subquery(Scholarship.objects.filter(pk=OuterRef('scholarship_id')).values('title')[:1]),
+        }
+        parts = []
+        try:
+            for literal, field, _, _ in string.Formatter().parse(template):
+                if literal:
+                    parts.append(Value(literal))
+                if field is None:
+                    continue
+                if field not in placeholders:
+                    raise ValidationError(
+                        f"Unknown placeholder {{{field}}} in comment. Use one of: "
+                        + ', '.join(f'{{{name}}}' for name in placeholders)
+                    )
+                parts.append(placeholders[field])
+        except ValueError as e:
+            raise ValidationError(f"Invalid comment template: {e}")
+        
+        if not parts:
+            return Value('')
+        if len(parts) == 1:
+            return parts[0]
+        return Concat(*parts, output_field=models.TextField())
+    
+    @staticmethod
+    def bulk_recommend(
+        application_ids: Iterable[int],
+        action: str,
+        reviewer: User,
+        comments: str = ""
+    ) -> List[Dict]:
+        """Record one OSAS recommendation for many applications at once.
+        
+        Applies ``Application.mark_as_reviewed`` to every application that
+        OSAS can still act on with a single UPDATE; ``comments`` is a shared
+        template (see ``review_comment_expression``) and, as with
+        ``mark_as_reviewed``, existing comments are kept when it is empty.
+        Admins get one summary notification per batch instead of one per
+        application; students asked for more information each get their
+        own notification.
+        
+        Returns one ``{'id', 'result', 'message'}`` dict per requested id,
+        where ``result`` is the new status, ``already_reviewed`` or
+        ``not_found``.
+        """
+        if not reviewer.profile.is_osas:
+            raise ValidationError("Only OSAS staff can review applications.")
+        if action not in ApplicationService.RECOMMENDATION_STATUSES:
+            raise ValidationError(
+                f"Invalid action. Must be one of: {list(ApplicationService.RECOMMENDATION_STATUSES)}"
+            )
+        new_status = ApplicationService.RECOMMENDATION_STATUSES[action]
+        comment = ApplicationService.review_comment_expression(comments) if comments else None
+        
+        ids = list(dict.fromkeys(int(application_id) for application_id in application_ids))
+        results = {
+            application_id: {'id': application_id, 'result': 'not_found', 'message': 'Application not found.'}
+            for application_id in ids
+        }
+        
+        with transaction.atomic():
+            rows = Application.objects.select_for_update(of=('self',)).filter(id__in=ids).order_by('id').values_list(
+                'id', 'status', 'scholarship_id', 'student_id',
+                'student__first_name', 'student__last_name', 'scholarship__title'
+            )
+            reviewed = []
+            deltas = {}
+            for row in rows:
+                application_id, status, scholarship_id = row[:3]
+                if status not in Application.REVIEWABLE_STATUSES:
+                    results[application_id].update(
+                        result='already_reviewed',
+                        message='This application has already been reviewed.'
+                    )
+                    continue
+                reviewed.append(row)
+                delta = deltas.setdefault(scholarship_id, {})
+                delta[status] = delta.get(status, 0) - 1
+                delta[new_status] = delta.get(new_status, 0) + 1
+            
+            if reviewed:
+                fields = {
+                    'status': new_status,
+                    'reviewed_by': reviewer,
+                    'reviewed_at': timezone.now(),
+                    'claim_expires_at': None,
+                }
+                if comment is not None:
+                    fields['reviewer_comments'] = comment
+                updated = Application.objects.filter(
+                    id__in=[row[0] for row in reviewed],
+                    status__in=Application.REVIEWABLE_STATUSES
+                ).update(**fields)
+                if updated != len(reviewed):
+                    # Only possible without row locks; undo the whole batch.
+                    raise ValidationError(
+                        "Some applications were reviewed by someone else in the meantime. Please try again.",
+                        code='already_reviewed'
+                    )
+                ScholarshipCounter.apply_deltas(deltas)
+                ApplicationService._notify_recommendations(reviewed, action, reviewer)
+        
+        if reviewed:
+            # update() and bulk_create() skip the signals that expire these.
+            DashboardStatsService.invalidate('applications', user_ids={row[3] for row in reviewed})
+        for row in reviewed:
+            results[row[0]].update(result=new_status, message=ApplicationService.RECOMMENDATION_MESSAGES[action])
+        return [results[application_id] for application_id in ids]
+    
+    @staticmethod
+    def _notify_recommendations(rows: List[Tuple], action: str, reviewer: User) -> None:
+        """Notifications for a ``bulk_recommend`` batch."""
+        if action == 'request_info':
+            Notification.objects.bulk_create([
+                Notification(
+                    recipient_id=student_id,
+                    title='Additional Information Required',
+                    message=f'Please provide additional information for your {title} application.',
+                    notification_type='warning',
+                    related_application_id=application_id
+                )
+                for application_id, _, _, student_id, _, _, title in rows
+            ])
+            return
+        
+        verb = 'approval' if action == 'approve' else 'rejection'
+        if len(rows) == 1:
+            application_id, _, _, _, first_name, last_name, title = rows[0]
+            subject = f"{f'{first_name} {last_name}'.strip()}'s application to {title}"
+            heading = f'New Application Recommended for {verb.title()}'
+            related_application = Application(pk=application_id)
+        else:
+            subject = f'{len(rows)} applications'
+            heading = f'{len(rows)} Applications Recommended for {verb.title()}'
+            related_application = None
+        
+        NotificationService.fan_out(
+            User.objects.filter(profile__user_type='admin'),
+            title=heading,
+            message=f'OSAS staff {reviewer.get_full_name()} recommends {verb} for {subject}.',
+            notification_type='info' if action == 'approve' else 'warning',
+            related_application=related_application
+        )
+    
     @staticmethod
     @transaction.atomic
     def process_review_decision(
@@ -230,23 +839,25 @@ class ApplicationService:
         if not reviewer.profile.is_osas:
             raise ValidationError("Only OSAS staff can review applications.")
         
-        if application.status not in ['pending', 'under_review', 'additional_info_required']:
-            raise ValidationError("This application has already been reviewed.")
-        
         valid_decisions = ['approved', 'rejected', 'additional_info_required']
         if decision not in valid_decisions:
             raise ValidationError(f"Invalid decision. Must be one of: {valid_decisions}")
         
-        # Check available slots for approval
-        if decision == 'approved' and application.scholarship.available_slots_remaining <= 0:
-            raise ValidationError("No more slots available for this scholarship.")
-        
-        # Update application
-        application.status = decision
-        application.reviewer = reviewer
-        application.review_comments = comments
-        application.reviewed_at = timezone.now()
-        application.save()
+        # Checks the status and, for approvals, takes a slot atomically
+        try:
+            ApplicationService.decide(
+                application,
+                decision,
+                ['pending', 'under_review', 'additional_info_required'],
+                reviewed_by=reviewer,
+                reviewer_comments=comments,
+                reviewed_at=timezone.now(),
+                claim_expires_at=None
+            )
+        except ValidationError as e:
+            if e.code == 'already_decided':
+                raise ValidationError("This application has already been reviewed.", code=e.code)
+            raise
         
         # Create appropriate notification
         if decision == 'approved':
@@ -263,7 +874,7 @@ class ApplicationService:
             notification_type = 'warning'
         
         NotificationService.create_notification(
-            recipient=application.user,
+            recipient=application.student,
             title=title,
             message=message,
             notification_type=notification_type,
@@ -275,41 +886,18 @@ class ApplicationService:
     @staticmethod
     def get_application_analytics(user: User) -> Dict:
         """Get application analytics for a user."""
-        if user.profile.is_student:
-            applications = Application.objects.filter(user=user)
-        elif user.profile.is_admin:
-            applications = Application.objects.filter(scholarship__created_by=user)
-        elif user.profile.is_osas:
-            applications = Application.objects.all()
-        else:
-            applications = Application.objects.none()
-        
-        total_count = applications.count()
-        
-        if total_count == 0:
-            return {
-                'total_applications': 0,
-                'pending': 0,
-                'under_review': 0,
-                'approved': 0,
-                'rejected': 0,
-                'additional_info_required': 0,
-                'success_rate': 0.0,
-            }
-        
-        status_counts = applications.values('status').annotate(count=Count('id'))
-        status_dict = {item['status']: item['count'] for item in status_counts}
-        
-        approved_count = status_dict.get('approved', 0)
+        status_counts = ApplicationService.get_status_counts(user=user)
+        total_count = status_counts['all']
+        approved_count = status_counts['approved']
         success_rate = (approved_count / total_count) * 100 if total_count > 0 else 0
         
         return {
             'total_applications': total_count,
-            'pending': status_dict.get('pending', 0),
-            'under_review': status_dict.get('under_review', 0),
+            'pending': status_counts['pending'],
+            'under_review': status_counts['under_review'],
             'approved': approved_count,
-            'rejected': status_dict.get('rejected', 0),
-            'additional_info_required': status_dict.get('additional_info_required', 0),
+            'rejected': status_counts['rejected'],
+            'additional_info_required': status_counts['additional_info_required'],
             'success_rate': round(success_rate, 1),
         }
     
@@ -336,6 +924,213 @@ class ApplicationService:
         return list(priority_applications)
 
 
+class ReviewerAssignmentService:
+    """Spread pending applications across OSAS reviewers by workload.
+    
+    Each active OSAS user gets a capacity from how many reviews they
+    finished recently, and every application goes to the reviewer whose
+    open reviews are lowest relative to that capacity. Reviewers on the
+    applicant's campus are preferred while they stay within
+    ``CAMPUS_AFFINITY_SLACK`` of the least loaded reviewer.
+    """
+    
+    # A reviewer on the applicant's campus keeps getting its applications
+    # until their load is this fraction (plus one application) above the
+    # least loaded reviewer's.
+    CAMPUS_AFFINITY_SLACK = 0.5
+    
+    # Statuses an OSAS review has finished with.
+    REVIEWED_STATUSES = [
+        status for status, _ in Application.STATUS_CHOICES
+        if status not in ('pending', 'under_review')
+    ]
+    
+    @staticmethod
+    def reviewer_workloads(throughput_days: int = 14) -> List[Dict]:
+        """Open and recently finished reviews for every active OSAS user."""
+        since = timezone.now() - timedelta(days=throughput_days)
+        reviewers = User.objects.filter(is_active=True, profile__user_type='osas').annotate(
+            open_reviews=Count(
+                'reviewed_applications', filter=Q(reviewed_applications__status='under_review')
+            ),
+            recent_reviews=Count('reviewed_applications', filter=Q(
+                reviewed_applications__status__in=ReviewerAssignmentService.REVIEWED_STATUSES,
+                reviewed_applications__reviewed_at__gte=since
+            ))
+        ).order_by('id').values_list('id', 'username', 'profile__campus', 'open_reviews', 'recent_reviews')
+        
+        return [
+            {
+                'id': reviewer_id,
+                'username': username,
+                'campus': campus,
+                'open': open_reviews,
+                'throughput': recent_reviews,
+                # Recent reviews per period, plus one so new reviewers still
+                # get a share.
+                'capacity': recent_reviews + 1,
+                'assigned': 0,
+                'campus_matches': 0,
+            }
+            for reviewer_id, username, campus, open_reviews, recent_reviews in reviewers
+        ]
+    
+    @staticmethod
+    def plan(pending: List[Tuple], workloads: List[Dict], max_open: Optional[int] = None) -> Dict[int, List[Tuple]]:
+        """Choose a reviewer for each ``(id, scholarship_id, student_id, campus)`` row.
+        
+        Rows are taken in order, so pass them oldest first. ``workloads``
+        (from ``reviewer_workloads``) is updated in place with the counts
+        assigned. Returns ``{reviewer_id: [row, ...]}``; rows left over
+        once every reviewer has ``max_open`` open reviews are not included.
+        """
+        slack = ReviewerAssignmentService.CAMPUS_AFFINITY_SLACK
+        
+        def load(reviewer):
+            return (reviewer['open'] + reviewer['assigned']) / reviewer['capacity']
+        
+        plan = {}
+        for row in pending:
+            available = [
+                reviewer for reviewer in workloads
+                if max_open is None or reviewer['open'] + reviewer['assigned'] < max_open
+            ]
+            if not available:
+                break
+            
+            best = min(available, key=load)
+            campus = row[3]
+            if campus and best['campus'] != campus:
+                local = [reviewer for reviewer in available if reviewer['campus'] == campus]
+                if local:
+                    nearest = min(local, key=load)
+                    if load(nearest) <= load(best) * (1 + slack) + 1 / nearest['capacity']:
+                        best = nearest
+            
+            best['assigned'] += 1
+            if campus and best['campus'] == campus:
+                best['campus_matches'] += 1
+            plan.setdefault(best['id'], []).append(row)
+        return plan
+    
+    @staticmethod
+    def assign_pending(
+        limit: Optional[int] = None,
+        throughput_days: int = 14,
+        max_open: Optional[int] = None,
+        dry_run: bool = False,
+        batch_size: int = 500
+    ) -> Dict:
+        """Assign unclaimed pending applications to OSAS reviewers.
+        
+        Pending applications are read once, oldest first, and planned with
+        ``plan``; each reviewer's share is then written with one conditional
+        UPDATE per ``batch_size`` applications, so applications claimed by
+        someone else in the meantime are skipped. Assignments carry the
+        ``REVIEW_ASSIGNMENT_LEASE_SECONDS`` lease, or none when it is unset.
+        Students and reviewers are notified with one ``bulk_create``.
+        
+        Returns a distribution report: the per-reviewer workloads plus
+        ``pending``, ``assigned`` and ``unassigned`` totals.
+        """
+        ApplicationService.release_expired_claims()
+        
+        workloads = ReviewerAssignmentService.reviewer_workloads(throughput_days)
+        pending = Application.objects.filter(status='pending').order_by('submitted_at', 'id').values_list(
+            'id', 'scholarship_id', 'student_id', 'student__profile__campus', 'scholarship__title'
+        )
+        if limit:
+            pending = pending[:limit]
+        pending = list(pending)
+        plan = ReviewerAssignmentService.plan(pending, workloads, max_open=max_open)
+        
+        report = {
+            'dry_run': dry_run,
+            'pending': len(pending),
+            'assigned': sum(len(rows) for rows in plan.values()),
+            'reviewers': workloads,
+        }
+        if dry_run or not plan:
+            report['unassigned'] = report['pending'] - report['assigned']
+            return report
+        
+        lease = getattr(settings, 'REVIEW_ASSIGNMENT_LEASE_SECONDS', None)
+        now = timezone.now()
+        reviewers = {reviewer['id']: reviewer for reviewer in workloads}
+        assigned = []
+        rebuild = set()
+        for reviewer_id, rows in plan.items():
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                with transaction.atomic():
+                    updated = Application.objects.filter(
+                        id__in=[row[0] for row in batch], status='pending'
+                    ).update(
+                        status='under_review',
+                        reviewed_by_id=reviewer_id,
+                        reviewed_at=now,
+                        claim_expires_at=now + timedelta(seconds=lease) if lease else None
+                    )
+                    if updated == len(batch):
+                        deltas = {}
+                        for row in batch:
+                            delta = deltas.setdefault(row[1], {'pending': 0, 'under_review': 0})
+                            delta['pending'] -= 1
+                            delta['under_review'] += 1
+                        ScholarshipCounter.apply_deltas(deltas)
+                    else:
+                        # Some were claimed in the meantime; keep only ours.
+                        ours = set(Application.objects.filter(
+                            id__in=[row[0] for row in batch], reviewed_by_id=reviewer_id,
+                            status='under_review', reviewed_at=now
+                        ).values_list('id', flat=True))
+                        batch = [row for row in batch if row[0] in ours]
+                        rebuild.update(row[1] for row in batch)
+                assigned.extend((reviewer_id, row) for row in batch)
+        if rebuild:
+            ScholarshipCounter.rebuild(scholarship_ids=rebuild)
+        
+        # Recount from what was written, in case some were claimed meanwhile.
+        for reviewer in workloads:
+            reviewer['assigned'] = reviewer['campus_matches'] = 0
+        for reviewer_id, row in assigned:
+            reviewer = reviewers[reviewer_id]
+            reviewer['assigned'] += 1
+            if row[3] and row[3] == reviewer['campus']:
+                reviewer['campus_matches'] += 1
+        
+        notifications = [
+            Notification(
+                recipient_id=row[2],
+                title='Application Under Review',
+                message=f'Your application for {row[4]} is now under review.',
+                notification_type='info',
+                related_application_id=row[0]
+            )
+            for _, row in assigned
+        ]
+        notifications.extend(
+            Notification(
+                recipient_id=reviewer['id'],
+                title='Applications Assigned to You',
+                message=f"{reviewer['assigned']} pending application(s) were assigned to you for review.",
+                notification_type='info'
+            )
+            for reviewer in workloads if reviewer['assigned']
+        )
+        Notification.objects.bulk_create(notifications)
+        
+        # update() and bulk_create() skip the signals that expire these.
+        DashboardStatsService.invalidate('applications', user_ids={
+            user_id for reviewer_id, row in assigned for user_id in (reviewer_id, row[2])
+        })
+        report['assigned'] = len(assigned)
+        report['unassigned'] = report['pending'] - report['assigned']
+        logger.info('Assigned %d of %d pending application(s) to %d reviewer(s)',
+                    report['assigned'], report['pending'], len(plan))
+        return report
+
+
 class NotificationService:
     """Service class for notification-related business logic."""
     
@@ -357,29 +1152,94 @@ class NotificationService:
         )
         return notification
     
+    @staticmethod
+    def fan_out(
+        recipients: Union[models.QuerySet, Iterable[int]],
+        title: str,
+        message: str,
+        notification_type: str = 'info',
+        related_application: Optional[Application] = None,
+        batch_size: int = 1000
+    ) -> Dict:
+        """Create the same notification for many recipients with bulk_create.
+        
+        ``recipients`` is either a User queryset, whose IDs are streamed with
+        ``iterator()`` so no User objects are built, or an iterable of user
+        IDs. Rows are inserted in batches of ``batch_size`` inside a single
+        transaction. Returns the number of rows and batches written and the
+        elapsed time in seconds.
+        """
+        started = time.perf_counter()
+        
+        if isinstance(recipients, models.QuerySet):
+            recipient_ids = recipients.order_by().values_list('id', flat=True).iterator(chunk_size=batch_size)
+        else:
+            recipient_ids = iter(recipients)
+        
+        related_application_id = related_application.pk if related_application else None
+        created = 0
+        batches = 0
+        batch = []
+        # bulk_create skips signals; remember small recipient lists so their
+        # cached dashboard stats can be expired one by one.
+        notified_ids = []
+        
+        with transaction.atomic():
+            for recipient_id in recipient_ids:
+                if len(notified_ids) <= DashboardStatsService.FAN_OUT_USER_LIMIT:
+                    notified_ids.append(recipient_id)
+                batch.append(Notification(
+                    recipient_id=recipient_id,
+                    title=title,
+                    message=message,
+                    notification_type=notification_type,
+                    related_application_id=related_application_id
+                ))
+                if len(batch) >= batch_size:
+                    Notification.objects.bulk_create(batch)
+                    created += len(batch)
+                    batches += 1
+                    batch = []
+            if batch:
+                Notification.objects.bulk_create(batch)
+                created += len(batch)
+                batches += 1
+        
+        if created > DashboardStatsService.FAN_OUT_USER_LIMIT:
+            DashboardStatsService.invalidate('notifications')
+        else:
+            DashboardStatsService.invalidate(user_ids=notified_ids)
+        
+        elapsed = time.perf_counter() - started
+        logger.info(
+            'Notification fan-out "%s": %d rows in %d batch(es) in %.3fs',
+            title, created, batches, elapsed
+        )
+        
+        return {
+            'created': created,
+            'batches': batches,
+            'elapsed_seconds': elapsed,
+        }
+    
     @staticmethod
     def notify_all_students(
         title: str,
         message: str,
         notification_type: str = 'info'
-    ) -> List[Notification]:
+    ) -> Dict:
         """Send notification to all active students."""
         students = User.objects.filter(
             profile__user_type='student',
             is_active=True
         )
         
-        notifications = []
-        for student in students:
-            notification = NotificationService.create_notification(
-                recipient=student,
-                title=title,
-                message=message,
-                notification_type=notification_type
-            )
-            notifications.append(notification)
-        
-        return notifications
+        return NotificationService.fan_out(
+            students,
+            title=title,
+            message=message,
+            notification_type=notification_type
+        )
     
     @staticmethod
     def mark_as_read(notification: Notification, user: User) -> Notification:
@@ -415,7 +1275,7 @@ class NotificationService:
         return deleted_count
     
     @staticmethod
-    def send_deadline_reminders() -> List[Notification]:
+    def send_deadline_reminders() -> int:
         """Send deadline reminders for scholarships closing soon."""
         # Find scholarships closing in the next 3 days
         reminder_date = timezone.now() + timedelta(days=3)
@@ -425,11 +1285,11 @@ class NotificationService:
             application_deadline__gt=timezone.now()
         )
         
-        notifications = []
+        total_notifications = 0
         
         for scholarship in scholarships_closing:
             # Get students who haven't applied yet
-            applied_users = scholarship.applications.values_list('user_id', flat=True)
+            applied_users = scholarship.applications.values_list('student_id', flat=True)
             students_to_notify = User.objects.filter(
                 profile__user_type='student',
                 is_active=True
@@ -437,16 +1297,15 @@ class NotificationService:
             
             days_left = (scholarship.application_deadline - timezone.now()).days
             
-            for student in students_to_notify:
-                notification = NotificationService.create_notification(
-                    recipient=student,
-                    title="Scholarship Deadline Reminder",
-                    message=f"Only {days_left} days left to apply for {scholarship.title}!",
-                    notification_type='warning'
-                )
-                notifications.append(notification)
+            result = NotificationService.fan_out(
+                students_to_notify,
+                title="Scholarship Deadline Reminder",
+                message=f"Only {days_left} days left to apply for {scholarship.title}!",
+                notification_type='warning'
+            )
+            total_notifications += result['created']
         
-        return notifications
+        return total_notifications
 
 
 class AnalyticsService:
@@ -474,26 +1333,31 @@ class AnalyticsService:
     @staticmethod
     def get_scholarship_performance_report() -> List[Dict]:
         """Get performance report for all scholarships."""
-        scholarships = Scholarship.objects.annotate(
-            total_applications=Count('applications'),
-            approved_applications=Count('applications', filter=Q(applications__status='approved')),
-            pending_applications=Count('applications', filter=Q(applications__status='pending'))
-        ).order_by('-total_applications')
+        scholarships = Scholarship.objects.select_related('counter').order_by('-counter__total')
         
         report = []
         for scholarship in scholarships:
+            counter = scholarship.get_counter()
+            total_applications = counter.total if counter else 0
+            approved_applications = counter.approved if counter else 0
+            pending_applications = counter.pending if counter else 0
+            
             success_rate = 0
-            if scholarship.total_applications > 0:
-                success_rate = (scholarship.approved_applications / scholarship.total_applications) * 100
+            if total_applications > 0:
+                success_rate = (approved_applications / total_applications) * 100
+            
+            completion_rate = 0
+            if scholarship.available_slots > 0:
+                completion_rate = min(100, (approved_applications / scholarship.available_slots) * 100)
             
             report.append({
                 'scholarship': scholarship,
-                'total_applications': scholarship.total_applications,
-                'approved_applications': scholarship.approved_applications,
-                'pending_applications': scholarship.pending_applications,
+                'total_applications': total_applications,
+                'approved_applications': approved_applications,
+                'pending_applications': pending_applications,
                 'success_rate': round(success_rate, 1),
-                'available_slots': scholarship.available_slots_remaining,
-                'completion_rate': scholarship.completion_percentage,
+                'available_slots': max(0, scholarship.available_slots - approved_applications),
+                'completion_rate': round(completion_rate, 1),
             })
         
         return report
@@ -514,4 +1378,196 @@ class AnalyticsService:
                 last_login__gte=cutoff_date,
                 is_active=True
             ).count(),
-        }
\ No newline at end of file
+        }
+
+class DashboardStatsService:
+    """Cached dashboard statistics, invalidated through signals.
+    
+    Stats are cached per panel, role and user. Each entry records the
+    versions of the data it was computed from: ``applications`` and
+    ``scholarships`` (any change), ``notifications`` (bulk fan-outs) and
+    one version per user (their own applications and notifications). A read
+    fetches the entry and the versions it depends on in a single
+    ``get_many`` call and only recomputes when one of them changed.
+    """
+    
+    CACHE_PREFIX = 'dashboard_stats'
+    
+    # Version scopes each role's stats depend on, besides the per-user one.
+    ROLE_SCOPES = {
+        'student': ('scholarships', 'notifications'),
+        'admin': ('applications', 'scholarships'),
+        'osas': ('applications',),
+    }
+    
+    # Fan-outs to more users than this expire every student's stats at once
+    # instead of bumping one version per recipient.
+    FAN_OUT_USER_LIMIT = 100
+    
+    # (role, panel) -> method that computes the stats
+    PANELS = {
+        ('student', 'dashboard'): '_student_stats',
+        ('student', 'live'): '_student_stats',
+        ('admin', 'dashboard'): '_admin_dashboard_stats',
+        ('admin', 'live'): '_admin_live_stats',
+        ('osas', 'dashboard'): '_osas_dashboard_stats',
+        ('osas', 'live'): '_osas_live_stats',
+    }
+    
+    _counter_lock = threading.Lock()
+    _counters = {'hits': 0, 'misses': 0}
+    
+    @classmethod
+    def _scope_key(cls, scope: str) -> str:
+        return f'{cls.CACHE_PREFIX}:version:{scope}'
+    
+    @classmethod
+    def _user_key(cls, user_id: int) -> str:
+        return f'{cls.CACHE_PREFIX}:version:user:{user_id}'
+    
+    @classmethod
+    def version_keys(cls, *scopes: str) -> List[str]:
+        """Cache keys holding the current version of each scope."""
+        return [cls._scope_key(scope) for scope in scopes]
+    
+    @classmethod
+    def _count(cls, outcome: str) -> None:
+        with cls._counter_lock:
+            cls._counters[outcome] += 1
+    
+    @classmethod
+    def counters(cls) -> Dict[str, int]:
+        """Return this process's cache hit and miss counts."""
+        with cls._counter_lock:
+            return dict(cls._counters)
+    
+    @classmethod
+    def reset_counters(cls) -> None:
+        with cls._counter_lock:
+            cls._counters = {'hits': 0, 'misses': 0}
+    
+    @classmethod
+    def invalidate(cls, *scopes: str, user_ids: Iterable[int] = ()) -> None:
+        """Bump the given scopes and per-user versions.
+        
+        Versions are random tokens rather than counters so that a version
+        evicted from the cache can never come back with an old value. Inside
+        a transaction the bump waits until it commits: bumped any earlier, a
+        concurrent reader could cache stats computed from the old rows under
+        the new version.
+        """
+        keys = [cls._scope_key(scope) for scope in scopes]
+        keys += [cls._user_key(user_id) for user_id in set(user_ids) if user_id]
+        if keys:
+            transaction.on_commit(lambda: cache.set_many(dict.fromkeys(keys, uuid.uuid4().hex), timeout=None))
+    
+    @classmethod
+    def get_stats(cls, user: User, panel: str = 'dashboard') -> Dict:
+        """Return the ``panel`` stats (``'dashboard'`` or ``'live'``) for ``user``."""
+        role = user.profile.user_type
+        method = cls.PANELS.get((role, panel))
+        if method is None:
+            return {}
+        
+        stats_key = f'{cls.CACHE_PREFIX}:{panel}:{role}:{user.pk}'
+        version_keys = cls.version_keys(*cls.ROLE_SCOPES[role])
+        version_keys.append(cls._user_key(user.pk))
+        
+        cached = cache.get_many([stats_key, *version_keys])
+        versions = [cached.get(key) for key in version_keys]
+        entry = cached.get(stats_key)
+        if entry is not None and entry['versions'] == versions:
+            cls._count('hits')
+            return entry['stats']
+        
+        cls._count('misses')
+        stats = getattr(cls, method)(user)
+        # Versions were read before computing, so a change that lands while
+        # computing leaves this entry stale and the next read recomputes.
+        cache.set(
+            stats_key,
+            {'versions': versions, 'stats': stats},
+            timeout=getattr(settings, 'DASHBOARD_STATS_TIMEOUT', 300),
+        )
+        return stats
+    
+    @staticmethod
+    def _student_stats(user: User) -> Dict:
+        counts = ApplicationService.get_status_counts(user=user)
+        return {
+            'total_applications': counts['all'],
+            'pending_applications': counts['pending'],
+            'approved_applications': counts['approved'],
+            'available_scholarships': Scholarship.objects.filter(
+                is_active=True,
+                application_deadline__gt=timezone.now()
+            ).exclude(
+                id__in=Application.objects.filter(student=user).values_list('scholarship_id', flat=True)
+            ).count(),
+            'unread_notifications': Notification.objects.filter(recipient=user, is_read=False).count(),
+        }
+    
+    @staticmethod
+    def _admin_scholarship_stats(user: User) -> Dict:
+        now = timezone.now()
+        return Scholarship.objects.filter(created_by=user).aggregate(
+            total_scholarships=Count('id'),
+            active_scholarships=Count('id', filter=Q(is_active=True)),
+            scholarships_closing_soon=Count('id', filter=Q(
+                is_active=True,
+                application_deadline__lt=now + timedelta(days=7),
+                application_deadline__gt=now
+            )),
+        )
+    
+    @staticmethod
+    def _admin_dashboard_stats(user: User) -> Dict:
+        counts = ApplicationService.get_status_counts()
+        stats = DashboardStatsService._admin_scholarship_stats(user)
+        stats.update({
+            'total_applications': counts['all'],
+            'pending_applications': counts['pending'],
+            'approved_applications': counts['approved'],
+        })
+        return stats
+    
+    @staticmethod
+    def _admin_live_stats(user: User) -> Dict:
+        counts = ApplicationService.get_status_counts(user=user)
+        stats = DashboardStatsService._admin_scholarship_stats(user)
+        return {
+            'total_scholarships': stats['total_scholarships'],
+            'active_scholarships': stats['active_scholarships'],
+            'total_applications': counts['all'],
+            'pending_reviews': counts['pending'],
+        }
+    
+    @staticmethod
+    def _osas_dashboard_stats(user: User) -> Dict:
+        counts = ApplicationService.get_status_counts()
+        mine = ApplicationService.get_status_counts(Application.objects.filter(reviewed_by=user))
+        today = ApplicationService.get_status_counts(
+            Application.objects.filter(reviewed_by=user, reviewed_at__date=timezone.now().date())
+        )
+        return {
+            'pending_applications': counts['pending'],
+            'my_under_review': mine['under_review'],
+            'total_reviews_completed': mine['approved'] + mine['rejected'],
+            'approved_today': today['approved'],
+            'rejected_today': today['rejected'],
+            'total_pending_system': counts['pending'],
+        }
+    
+    @staticmethod
+    def _osas_live_stats(user: User) -> Dict:
+        counts = ApplicationService.get_status_counts()
+        return {
+            'pending_applications': counts['pending'],
+            'under_review': counts['under_review'],
+            'my_assigned': Application.objects.filter(reviewed_by=user, status='under_review').count(),
+            'approved_today': Application.objects.filter(
+                status='approved',
+                reviewed_at__date=timezone.now().date()
+            ).count(),
+        }
+
@@ -1,7 +1,13 @@
-from django.db.models.signals import post_save
+from django.db import connections
+from django.db.models.signals import pre_save, post_save, post_delete, post_migrate
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserProfile
+from .models import (
+    UserProfile, Scholarship, Application, ApplicationDocument, DocumentBlob, Notification, ScholarshipCounter,
+    EligibilityKeyword
+)
+from .services import DashboardStatsService, ScholarshipService
+from .search import install_search_index
 
 
 @receiver(post_save, sender=User)
@@ -12,10 +18,134 @@ def create_user_profile(sender, instance, created, **kwargs):
             user=instance,
             user_type='student'  # Default to student, can be changed later
         )
+        # Never serve a cached entry left behind under a reused primary key.
+        DashboardStatsService.invalidate(user_ids=[instance.pk])
 
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     """Save the UserProfile when User is saved."""
     if hasattr(instance, 'profile'):
-        instance.profile.save()
\ No newline at end of file
+        instance.profile.save()
+
+
+@receiver(post_save, sender=Scholarship)
+def create_scholarship_counter(sender, instance, created, **kwargs):
+    """Create the denormalized counter row for a new Scholarship."""
+    if created:
+        ScholarshipCounter.objects.get_or_create(scholarship_id=instance.pk)
+
+
+@receiver(post_save, sender=Scholarship)
+def index_eligibility_keywords(sender, instance, created, update_fields=None, **kwargs):
+    """Refresh the scholarship's keyword index and the cached filter chips."""
+    if kwargs.get('raw'):
+        return
+    if update_fields is None or 'eligibility_criteria' in update_fields:
+        EligibilityKeyword.index_scholarship(instance)
+    # Chips only count active scholarships, so any save can change them.
+    ScholarshipService.invalidate_department_keywords()
+
+
+@receiver(post_delete, sender=Scholarship)
+def invalidate_keywords_on_scholarship_delete(sender, instance, **kwargs):
+    """Drop the cached filter chips; the keyword rows cascade."""
+    ScholarshipService.invalidate_department_keywords()
+
+
+@receiver(post_save, sender=Application)
+def update_counter_on_application_save(sender, instance, created, update_fields=None, **kwargs):
+    """Keep ScholarshipCounter in step with Application status changes."""
+    if kwargs.get('raw'):
+        return
+    
+    old_status = getattr(instance, '_loaded_status', None)
+    old_scholarship_id = getattr(instance, '_loaded_scholarship_id', None)
+    
+    if created:
+        ScholarshipCounter.record_transition(instance.scholarship_id, None, instance.status)
+    elif old_scholarship_id is None:
+        # Saved without being loaded from the database: the previous status
+        # is unknown, so recount this scholarship.
+        ScholarshipCounter.rebuild(scholarship_ids=[instance.scholarship_id])
+    elif update_fields is not None and not {'status', 'scholarship', 'scholarship_id'} & set(update_fields):
+        return
+    elif old_scholarship_id != instance.scholarship_id:
+        ScholarshipCounter.record_transition(old_scholarship_id, old_status, None)
+        ScholarshipCounter.record_transition(instance.scholarship_id, None, instance.status)
+    elif old_status != instance.status:
+        ScholarshipCounter.record_transition(instance.scholarship_id, old_status, instance.status)
+    
+    instance._loaded_status = instance.status
+    instance._loaded_scholarship_id = instance.scholarship_id
+
+
+@receiver(post_delete, sender=Application)
+def update_counter_on_application_delete(sender, instance, **kwargs):
+    """Remove a deleted Application from its scholarship's counters."""
+    status = getattr(instance, '_loaded_status', None) or instance.status
+    scholarship_id = getattr(instance, '_loaded_scholarship_id', None) or instance.scholarship_id
+    # The counter may already be gone when the scholarship itself is being
+    # deleted; never recreate it from here.
+    ScholarshipCounter.record_transition(scholarship_id, status, None, rebuild_missing=False)
+
+
+@receiver([post_save, post_delete], sender=Application)
+def invalidate_stats_on_application_change(sender, instance, **kwargs):
+    """Expire cached dashboard stats that count this application."""
+    DashboardStatsService.invalidate('applications', user_ids=[instance.student_id])
+
+
+@receiver(pre_save, sender=ApplicationDocument)
+def remember_uploaded_file(sender, instance, **kwargs):
+    """Keep hold of a file being uploaded so it can be written again if needed."""
+    if instance.file and not instance.file._committed:
+        instance._uploaded_file = instance.file.file
+
+
+@receiver(post_save, sender=ApplicationDocument)
+def acquire_document_blob(sender, instance, created, **kwargs):
+    """Count the new reference to the document's file (and drop a replaced one)."""
+    if kwargs.get('raw'):
+        return
+    new_name = instance.file.name
+    uploaded = instance.__dict__.pop('_uploaded_file', None)
+    if created:
+        if new_name:
+            DocumentBlob.acquire(new_name, instance.file_size, storage=instance.file.storage, content=uploaded)
+    elif hasattr(instance, '_loaded_file_name') and instance._loaded_file_name != new_name:
+        if new_name:
+            DocumentBlob.acquire(new_name, instance.file_size, storage=instance.file.storage, content=uploaded)
+        if instance._loaded_file_name:
+            DocumentBlob.release(instance._loaded_file_name, instance.file.storage)
+    instance._loaded_file_name = new_name
+
+
+@receiver(post_delete, sender=ApplicationDocument)
+def release_document_blob(sender, instance, **kwargs):
+    """Delete the document's file once no other document uses it."""
+    if instance.file.name:
+        DocumentBlob.release(instance.file.name, instance.file.storage)
+
+
+@receiver([post_save, post_delete], sender=Scholarship)
+def invalidate_stats_on_scholarship_change(sender, instance, **kwargs):
+    """Expire cached dashboard stats that count scholarships."""
+    DashboardStatsService.invalidate('scholarships')
+
+
+@receiver([post_save, post_delete], sender=Notification)
+def invalidate_stats_on_notification_change(sender, instance, **kwargs):
+    """Expire the recipient's cached unread-notification count."""
+    DashboardStatsService.invalidate(user_ids=[instance.recipient_id])
+
+
+@receiver(post_migrate)
+def ensure_scholarship_search_index(sender, using, **kwargs):
+    """Restore the FTS table and triggers after migrations.
+    
+    Django rebuilds ``core_scholarship`` on SQLite when a column changes,
+    which silently drops the triggers that keep the search index in sync.
+    """
+    if sender.name == 'core':
+        install_search_index(connections[using])
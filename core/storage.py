@@ -0,0 +1,105 @@
+"""
+Content-addressed storage for application documents.
+
+``ContentAddressedStorage`` files every upload under the SHA-256 of its
+contents (``documents/ab/cd/<sha256>.<ext>``), so a birth certificate that
+a student attaches to five applications is written to disk once. The file
+is hashed while it is copied to a temporary file, which is then hard-linked
+into place; if a file with the same hash already exists the copy is simply
+dropped. ``DocumentBlob`` counts the documents that point at each file, and
+the file is deleted when the last of them goes.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+# Matches names produced by ContentAddressedStorage.
+BLOB_NAME_RE = re.compile(r'(?:^|/)[0-9a-f]{2}/[0-9a-f]{2}/(?P<sha256>[0-9a-f]{64})(?:\.\w+)?$')
+
+CHUNK_SIZE = 64 * 1024
+
+
+def blob_name(directory, sha256, extension=''):
+    """Storage name of the file with digest ``sha256`` under ``directory``."""
+    return os.path.join(directory, sha256[:2], sha256[2:4], sha256 + extension.lower())
+
+
+def blob_sha256(name):
+    """The digest in a content-addressed ``name``, or None for other names."""
+    match = BLOB_NAME_RE.search(name or '')
+    return match.group('sha256') if match else None
+
+
+def file_sha256(fileobj):
+    """SHA-256 hex digest of a Django ``File``, read a chunk at a time."""
+    digest = hashlib.sha256()
+    for chunk in fileobj.chunks(CHUNK_SIZE):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """``FileSystemStorage`` that names files after the SHA-256 of their contents.
+
+    The directory of the name passed to ``save`` (the field's ``upload_to``)
+    is kept, as is the extension; the rest of the name is replaced by the
+    digest. Saving under a name that is already content-addressed keeps
+    its directory. Saving content that is already stored returns the
+    existing name without writing anything. When the content's digest is
+    known up front (``content.sha256``, set by
+    ``FileUploadValidator.validate_file``) a duplicate is not even copied
+    to a temporary file.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Equal content must always map to the same name.
+        return name
+
+    def _save(self, name, content):
+        directory, basename = os.path.split(name)
+        extension = os.path.splitext(basename)[1]
+        match = BLOB_NAME_RE.search(name)
+        if match:
+            # Writing a file back under its own content-addressed name.
+            directory = name[:match.start()]
+
+        known = getattr(content, 'sha256', None)
+        if known and self.exists(blob_name(directory, known, extension)):
+            return blob_name(directory, known, extension)
+
+        staging = self.path(directory)
+        os.makedirs(staging, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=staging, prefix='.upload-')
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as temp:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    digest.update(chunk)
+                    temp.write(chunk)
+            os.chmod(temp_path, self.file_permissions_mode or 0o644)
+
+            name = blob_name(directory, digest.hexdigest(), extension)
+            full_path = self.path(name)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            try:
+                # Fails if the file exists, so a concurrent save of the same
+                # content never exposes a half-written file.
+                os.link(temp_path, full_path)
+            except FileExistsError:
+                pass
+            except OSError:
+                # No hard links on this filesystem; rename into place instead.
+                if not os.path.exists(full_path):
+                    os.replace(temp_path, full_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return name
+
+
+def document_storage():
+    return ContentAddressedStorage()
@@ -1,4 +1,9 @@
-from django.test import TestCase, Client
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from django.db import connection
+from unittest import skipUnless
+import re
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils import timezone
@@ -985,3 +990,2493 @@ class ScholarshipRequirementIntegrationTest(TestCase):
         # Verify notes are displayed
         self.assertContains(response, 'Based on cumulative GPA')
         self.assertContains(response, 'Must be sealed and signed by registrar')
+
+
+class ApplicationStatusCountsTest(TestCase):
+    """Test cases for the single-query application status counts."""
+    
+    def setUp(self):
+        self.client = Client()
+        
+        self.admin_user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123'
+        )
+        self.admin_user.profile.user_type = 'admin'
+        self.admin_user.profile.save()
+        
+        self.osas_user = User.objects.create_user(
+            username='osas',
+            email='osas@example.com',
+            password='testpass123'
+        )
+        self.osas_user.profile.user_type = 'osas'
+        self.osas_user.profile.save()
+        
+        self.other_admin = User.objects.create_user(username='admin2', email='admin2@example.com')
+        self.other_admin.profile.user_type = 'admin'
+        self.other_admin.profile.save()
+        
+        self.scholarship = Scholarship.objects.create(
+            title='Own Scholarship',
+            description='Test description',
+            eligibility_criteria='Test criteria',
+            award_amount=Decimal('1000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=5,
+            created_by=self.admin_user
+        )
+        self.other_scholarship = Scholarship.objects.create(
+            title='Other Scholarship',
+            description='Test description',
+            eligibility_criteria='Test criteria',
+            award_amount=Decimal('1000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=5,
+            created_by=self.other_admin
+        )
+        
+        statuses = ['pending', 'pending', 'under_review', 'osas_approved', 'approved']
+        for i, status in enumerate(statuses):
+            student = User.objects.create_user(username=f'student{i}', email=f'student{i}@example.com')
+            student.profile.campus = 'mati' if i % 2 else 'canuto'
+            student.profile.save()
+            Application.objects.create(
+                student=student,
+                scholarship=self.scholarship,
+                personal_statement='Test statement',
+                gpa=Decimal('3.5'),
+                status=status
+            )
+            Application.objects.create(
+                student=student,
+                scholarship=self.other_scholarship,
+                personal_statement='Test statement',
+                gpa=Decimal('3.5'),
+                status='rejected'
+            )
+    
+    def test_counts_every_status_in_one_query(self):
+        """All status buckets are computed by a single aggregate query."""
+        from .services import ApplicationService
+        
+        with self.assertNumQueries(1):
+            counts = ApplicationService.get_status_counts()
+        
+        self.assertEqual(counts['all'], 10)
+        self.assertEqual(counts['pending'], 2)
+        self.assertEqual(counts['under_review'], 1)
+        self.assertEqual(counts['osas_approved'], 1)
+        self.assertEqual(counts['approved'], 1)
+        self.assertEqual(counts['rejected'], 5)
+        self.assertEqual(counts['osas_rejected'], 0)
+        self.assertEqual(counts['additional_info_required'], 0)
+    
+    def test_counts_scoping(self):
+        """Counts honour role, campus and scholarship scoping."""
+        from .services import ApplicationService
+        
+        admin_counts = ApplicationService.get_status_counts(user=self.admin_user)
+        self.assertEqual(admin_counts['all'], 5)
+        self.assertEqual(admin_counts['rejected'], 0)
+        
+        osas_counts = ApplicationService.get_status_counts(user=self.osas_user)
+        self.assertEqual(osas_counts['all'], 10)
+        
+        campus_counts = ApplicationService.get_status_counts(campus='mati')
+        self.assertEqual(campus_counts['all'], 4)
+        self.assertEqual(campus_counts['pending'], 1)
+        
+        scholarship_counts = ApplicationService.get_status_counts(scholarship=self.other_scholarship)
+        self.assertEqual(scholarship_counts['all'], 5)
+        self.assertEqual(scholarship_counts['rejected'], 5)
+    
+    def test_application_analytics_uses_status_counts(self):
+        """Analytics are derived from the aggregated counts."""
+        from .services import ApplicationService
+        
+        analytics = ApplicationService.get_application_analytics(self.admin_user)
+        self.assertEqual(analytics['total_applications'], 5)
+        self.assertEqual(analytics['pending'], 2)
+        self.assertEqual(analytics['success_rate'], 20.0)
+    
+    def test_view_tab_counts(self):
+        """Review queue and view applications render the aggregated counts."""
+        self.client.login(username='osas', password='testpass123')
+        response = self.client.get(reverse('core:review_queue'))
+        self.assertEqual(response.context['status_counts']['all'], 10)
+        self.assertEqual(response.context['status_counts']['pending'], 2)
+        
+        self.client.login(username='admin', password='testpass123')
+        response = self.client.get(reverse('core:view_applications'))
+        self.assertEqual(response.context['status_counts']['all'], 5)
+        self.assertEqual(response.context['status_counts']['rejected'], 0)
+
+
+class ScholarshipCounterTest(TestCase):
+    """Test cases for the denormalized per-scholarship counters."""
+    
+    def setUp(self):
+        self.admin_user = User.objects.create_user(username='admin', email='admin@example.com')
+        self.admin_user.profile.user_type = 'admin'
+        self.admin_user.profile.save()
+        
+        self.scholarship = Scholarship.objects.create(
+            title='Counter Scholarship',
+            description='Test description',
+            eligibility_criteria='Test criteria',
+            award_amount=Decimal('1000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=2,
+            created_by=self.admin_user
+        )
+        self.student = User.objects.create_user(username='student', email='student@example.com')
+    
+    def _create_application(self, student=None, status='pending'):
+        return Application.objects.create(
+            student=student or self.student,
+            scholarship=self.scholarship,
+            personal_statement='Test statement',
+            gpa=Decimal('3.5'),
+            status=status
+        )
+    
+    def _counter(self):
+        from .models import ScholarshipCounter
+        return ScholarshipCounter.objects.get(scholarship=self.scholarship)
+    
+    def test_counter_created_with_scholarship(self):
+        """A zeroed counter row exists as soon as the scholarship is created."""
+        counter = self._counter()
+        self.assertEqual(counter.total, 0)
+        self.assertEqual(counter.pending, 0)
+    
+    def test_counter_tracks_status_changes(self):
+        """Creating, re-statusing and deleting applications updates the counters."""
+        application = self._create_application()
+        counter = self._counter()
+        self.assertEqual((counter.total, counter.pending), (1, 1))
+        
+        application = Application.objects.get(pk=application.pk)
+        application.status = 'osas_approved'
+        application.save()
+        application.status = 'approved'
+        application.save()
+        counter = self._counter()
+        self.assertEqual(
+            (counter.total, counter.pending, counter.osas_approved, counter.approved),
+            (1, 0, 0, 1)
+        )
+        self.assertEqual(self.scholarship.available_slots_remaining, 1)
+        
+        application.delete()
+        counter = self._counter()
+        self.assertEqual((counter.total, counter.approved), (0, 0))
+    
+    def test_rebuild_command(self):
+        """The management command recomputes drifted counters."""
+        from django.core.management import call_command
+        from io import StringIO
+        
+        self._create_application(status='approved')
+        Application.objects.update(status='rejected')  # bypasses signals
+        self.assertEqual(self._counter().approved, 1)
+        
+        call_command('rebuild_scholarship_counters', stdout=StringIO())
+        counter = self._counter()
+        self.assertEqual((counter.total, counter.approved, counter.rejected), (1, 0, 1))
+    
+    def test_deleting_scholarship_with_applications(self):
+        """Cascading deletes do not resurrect the counter row."""
+        from .models import ScholarshipCounter
+        
+        self._create_application()
+        self.scholarship.delete()
+        self.assertFalse(ScholarshipCounter.objects.exists())
+    
+    def test_scholarships_list_queries_do_not_scale_with_rows(self):
+        """Slot and application counts on the list page come from the counters."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        self.student.set_password('testpass123')
+        self.student.save()
+        self.client.login(username='student', password='testpass123')
+        
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(reverse('core:scholarships_list'))
+        
+        for i in range(8):
+            Scholarship.objects.create(
+                title=f'Extra Scholarship {i}',
+                description='Test description',
+                eligibility_criteria='Test criteria',
+                award_amount=Decimal('1000.00'),
+                application_deadline=timezone.now() + timedelta(days=30),
+                available_slots=2,
+                created_by=self.admin_user
+            )
+        
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(reverse('core:scholarships_list'))
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(few), len(many))
+
+
+class SlotReservationTest(TransactionTestCase):
+    """Test that final approvals never award more slots than available."""
+    
+    def setUp(self):
+        self.admin = User.objects.create_user(username='slotadmin', password='testpass123')
+        self.admin.profile.user_type = 'admin'
+        self.admin.profile.save()
+        self.scholarship = Scholarship.objects.create(
+            title='Slot Scholarship',
+            description='Test description',
+            eligibility_criteria='Test criteria',
+            award_amount=Decimal('1000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=5,
+            created_by=self.admin
+        )
+        self.applications = [
+            Application.objects.create(
+                student=User.objects.create_user(username=f'slotstudent{i}'),
+                scholarship=self.scholarship,
+                personal_statement='Test statement',
+                gpa=Decimal('3.5'),
+                status='osas_approved'
+            )
+            for i in range(20)
+        ]
+    
+    def _approve(self, application):
+        from .services import ApplicationService
+        
+        return ApplicationService.decide(
+            application, 'approved', ['osas_approved', 'osas_rejected'],
+            final_decision_by=self.admin, final_decision_at=timezone.now()
+        )
+    
+    def test_approval_with_missing_counter_row_takes_one_slot(self):
+        from .models import ScholarshipCounter
+        
+        ScholarshipCounter.objects.filter(scholarship=self.scholarship).delete()
+        application = Application.objects.select_related('scholarship').get(pk=self.applications[0].pk)
+        self._approve(application)
+        
+        counter = ScholarshipCounter.objects.get(scholarship=self.scholarship)
+        self.assertEqual((counter.approved, counter.osas_approved, counter.total), (1, 19, 20))
+    
+    def test_review_page_approvals_stop_at_available_slots(self):
+        from .models import ScholarshipCounter
+        
+        self.client.force_login(self.admin)
+        for application in self.applications[:6]:
+            response = self.client.post(
+                reverse('core:admin_review_application', args=[application.pk]),
+                {'decision': 'approved', 'comments': 'Well done'},
+                follow=True
+            )
+        
+        self.assertContains(response, 'no more slots available')
+        self.assertEqual(Application.objects.filter(status='approved').count(), 5)
+        self.assertEqual(Application.objects.get(pk=self.applications[5].pk).status, 'osas_approved')
+        approved = Application.objects.get(pk=self.applications[0].pk)
+        self.assertEqual(approved.final_decision_by, self.admin)
+        self.assertIsNotNone(approved.final_decision_at)
+        counter = ScholarshipCounter.objects.get(scholarship=self.scholarship)
+        self.assertEqual((counter.approved, counter.osas_approved), (5, 15))
+        
+        # A decided application is not decided again.
+        response = self.client.post(
+            reverse('core:admin_review_application', args=[self.applications[0].pk]),
+            {'decision': 'rejected'},
+            follow=True
+        )
+        self.assertContains(response, 'already been decided')
+        self.assertEqual(Application.objects.get(pk=self.applications[0].pk).status, 'approved')
+    
+    def test_concurrent_approvals_stop_at_available_slots(self):
+        import threading
+        from django.core.exceptions import ValidationError
+        from django.db import OperationalError, connections
+        from .models import ScholarshipCounter
+        
+        results = []
+        start = threading.Barrier(len(self.applications))
+        
+        def approve(application_id):
+            try:
+                application = Application.objects.select_related('scholarship').get(pk=application_id)
+                start.wait()
+                while True:
+                    try:
+                        self._approve(application)
+                        results.append('approved')
+                    except ValidationError as e:
+                        results.append(e.code)
+                    except OperationalError:
+                        # The shared in-memory test database reports lock
+                        # contention instead of waiting for it.
+                        continue
+                    break
+            finally:
+                connections.close_all()
+        
+        threads = [threading.Thread(target=approve, args=[app.pk]) for app in self.applications]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(results.count('approved'), 5)
+        self.assertEqual(results.count('no_slots'), 15)
+        self.assertEqual(Application.objects.filter(status='approved').count(), 5)
+        counter = ScholarshipCounter.objects.get(scholarship=self.scholarship)
+        self.assertEqual((counter.approved, counter.osas_approved, counter.total), (5, 15, 20))
+    
+    def test_same_application_is_decided_once(self):
+        from django.core.exceptions import ValidationError
+        from .models import ScholarshipCounter
+        
+        first = Application.objects.get(pk=self.applications[0].pk)
+        second = Application.objects.get(pk=self.applications[0].pk)
+        self._approve(first)
+        with self.assertRaises(ValidationError) as raised:
+            self._approve(second)
+        self.assertEqual(raised.exception.code, 'already_decided')
+        
+        # A later save of the decided instance does not count it twice.
+        first.save()
+        self.assertEqual(ScholarshipCounter.objects.get(scholarship=self.scholarship).approved, 1)
+    
+    def test_final_decision_view_reports_full_scholarship(self):
+        self.scholarship.available_slots = 1
+        self.scholarship.save()
+        self.client.force_login(self.admin)
+        
+        first, second = [reverse('core:admin_final_decision', args=[app.pk]) for app in self.applications[:2]]
+        self.client.post(first, {'decision': 'approve'})
+        response = self.client.post(second, {'decision': 'approve'}, follow=True)
+        self.assertContains(response, 'no more slots available')
+        
+        self.applications[1].refresh_from_db()
+        self.assertEqual(self.applications[1].status, 'osas_approved')
+        self.assertEqual(Application.objects.filter(status='approved').count(), 1)
+        
+        # Rejections never need a slot.
+        self.client.post(second, {'decision': 'reject'})
+        self.applications[1].refresh_from_db()
+        self.assertEqual(self.applications[1].status, 'rejected')
+
+
+class BulkFinalDecisionTest(TestCase):
+    """Test the bulk approve/reject endpoint on the pending-approvals list."""
+    
+    def setUp(self):
+        self.admin = User.objects.create_user(username='bulkadmin', password='testpass123')
+        self.admin.profile.user_type = 'admin'
+        self.admin.profile.save()
+        self.osas = User.objects.create_user(username='bulkosas', first_name='Os', last_name='As')
+        self.osas.profile.user_type = 'osas'
+        self.osas.profile.save()
+        self.scholarships = [
+            Scholarship.objects.create(
+                title=f'Bulk Scholarship {i}',
+                description='Test description',
+                eligibility_criteria='Test criteria',
+                award_amount=Decimal('1000.00'),
+                application_deadline=timezone.now() + timedelta(days=30),
+                available_slots=slots,
+                created_by=self.admin
+            )
+            for i, slots in enumerate([3, 100])
+        ]
+        self.applications = [
+            Application.objects.create(
+                student=User.objects.create_user(username=f'bulkstudent{i}'),
+                scholarship=self.scholarships[i % 2],
+                personal_statement='Test statement',
+                gpa=Decimal('3.5'),
+                status='osas_approved' if i % 3 else 'osas_rejected',
+                reviewed_by=self.osas
+            )
+            for i in range(40)
+        ]
+        self.url = reverse('core:admin_bulk_final_decision')
+        self.client.force_login(self.admin)
+    
+    def test_bulk_approve_respects_slots_and_reports_each_item(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .models import ScholarshipCounter
+        
+        ids = [app.pk for app in self.applications]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'application_ids': ids + [999999], 'decision': 'approve'})
+        data = response.json()
+        
+        results = {item['id']: item['result'] for item in data['results']}
+        self.assertEqual(data['summary'], {'approved': 23, 'no_slots': 17, 'not_found': 1})
+        # The three slots of the small scholarship go to the first three requested.
+        small = [app.pk for app in self.applications if app.scholarship_id == self.scholarships[0].pk]
+        self.assertEqual([results[pk] for pk in small[:4]], ['approved', 'approved', 'approved', 'no_slots'])
+        
+        for scholarship, approved in zip(self.scholarships, [3, 20]):
+            counter = ScholarshipCounter.objects.get(scholarship=scholarship)
+            self.assertEqual(counter.approved, approved)
+            self.assertEqual(counter.approved, scholarship.applications.filter(status='approved').count())
+            self.assertEqual(counter.osas_approved + counter.osas_rejected, 20 - approved)
+        # Student plus OSAS reviewer for every decision.
+        self.assertEqual(Notification.objects.count(), 46)
+        # One read, a couple of queries per scholarship and per previous
+        # status, and batched notification inserts - not one per item.
+        self.assertLess(len(queries), 30)
+    
+    def test_bulk_reject_and_already_decided(self):
+        ids = [app.pk for app in self.applications[:5]]
+        self.client.post(self.url, {'application_ids': ids[:2], 'decision': 'reject', 'final_comments': 'Bulk'})
+        
+        response = self.client.post(self.url, {'application_ids': ids, 'decision': 'reject'}, HTTP_HX_REQUEST='true')
+        self.assertContains(response, '2 already decided')
+        self.assertContains(response, '3 rejected')
+        self.assertEqual(
+            Application.objects.filter(pk__in=ids, status='rejected', final_decision_by=self.admin).count(), 5
+        )
+        self.assertEqual(Application.objects.get(pk=ids[0]).final_decision_comments, 'Bulk')
+    
+    def test_bulk_decision_validation_and_access(self):
+        self.assertEqual(self.client.post(self.url, {'application_ids': [1], 'decision': 'maybe'}).status_code, 400)
+        self.assertEqual(self.client.post(self.url, {'application_ids': ['x'], 'decision': 'approve'}).status_code, 400)
+        self.assertEqual(self.client.post(self.url, {'decision': 'approve'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        
+        self.client.force_login(self.osas)
+        response = self.client.post(self.url, {'application_ids': [self.applications[0].pk], 'decision': 'approve'})
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Application.objects.filter(status='approved').exists())
+
+
+class BulkRecommendationTest(TestCase):
+    """Test bulk OSAS recommendations from the review queue."""
+    
+    def setUp(self):
+        self.osas = User.objects.create_user(username='bulkreviewer', first_name='Rita', last_name='Reviewer')
+        self.osas.profile.user_type = 'osas'
+        self.osas.profile.save()
+        self.admins = []
+        for i in range(3):
+            admin = User.objects.create_user(username=f'bulkrecadmin{i}')
+            admin.profile.user_type = 'admin'
+            admin.profile.save()
+            self.admins.append(admin)
+        self.scholarship = Scholarship.objects.create(
+            title='Queue Scholarship',
+            description='Test description',
+            eligibility_criteria='Test criteria',
+            award_amount=Decimal('1000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=5,
+            created_by=self.admins[0]
+        )
+        self.applications = [
+            Application.objects.create(
+                student=User.objects.create_user(username=f'queuestudent{i}', first_name=f'Ana{i}', last_name='Cruz'),
+                scholarship=self.scholarship,
+                personal_statement='Test statement',
+                gpa=Decimal('3.5'),
+                status='under_review' if i % 2 else 'pending'
+            )
+            for i in range(12)
+        ]
+        self.url = reverse('core:bulk_review_applications')
+        self.client.force_login(self.osas)
+    
+    def test_bulk_recommendation_is_one_update_with_one_notification_per_admin(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .models import ScholarshipCounter
+        
+        self.applications[0].status = 'osas_rejected'
+        self.applications[0].save()
+        ids = [app.pk for app in self.applications]
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {
+                'application_ids': ids,
+                'action': 'approve',
+                'comments': 'Dear {first_name}, {scholarship} looks good.',
+            })
+        data = response.json()
+        self.assertEqual(data['summary'], {'already_reviewed': 1, 'osas_approved': 11})
+        self.assertEqual(data['results'][0]['result'], 'already_reviewed')
+        
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "core_application"')]
+        self.assertEqual(len(updates), 1)
+        application = Application.objects.get(pk=ids[1])
+        self.assertEqual(application.status, 'osas_approved')
+        self.assertEqual(application.reviewed_by, self.osas)
+        self.assertEqual(application.reviewer_comments, 'Dear Ana1, Queue Scholarship looks good.')
+        
+        notifications = Notification.objects.filter(recipient__in=self.admins)
+        self.assertEqual(notifications.count(), 3)
+        self.assertEqual(notifications.first().title, '11 Applications Recommended for Approval')
+        
+        counter = ScholarshipCounter.objects.get(scholarship=self.scholarship)
+        self.assertEqual((counter.osas_approved, counter.pending, counter.under_review), (11, 0, 0))
+    
+    def test_request_info_notifies_each_student_and_keeps_comments(self):
+        Application.objects.filter(pk=self.applications[0].pk).update(reviewer_comments='Earlier note')
+        ids = [app.pk for app in self.applications[:3]]
+        response = self.client.post(self.url, {'application_ids': ids, 'action': 'request_info'}, HTTP_HX_REQUEST='true')
+        self.assertContains(response, '3 asked for more information')
+        
+        self.assertEqual(Application.objects.get(pk=ids[0]).reviewer_comments, 'Earlier note')
+        self.assertEqual(
+            Notification.objects.filter(title='Additional Information Required').count(), 3
+        )
+        self.assertFalse(Notification.objects.filter(recipient__in=self.admins).exists())
+    
+    def test_validation_and_access(self):
+        ids = [self.applications[0].pk]
+        response = self.client.post(self.url, {'application_ids': ids, 'action': 'approve', 'comments': '{gpa}'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('{gpa}', response.json()['error'])
+        self.assertEqual(self.client.post(self.url, {'application_ids': ids, 'action': 'maybe'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        
+        self.client.force_login(self.admins[0])
+        self.assertEqual(self.client.post(self.url, {'application_ids': ids, 'action': 'approve'}).status_code, 403)
+        self.assertEqual(Application.objects.get(pk=ids[0]).status, 'pending')
+
+
+class ClaimNextApplicationTest(TransactionTestCase):
+    """Test the atomic claim-next endpoint and review claim leases."""
+    
+    def setUp(self):
+        self.reviewers = []
+        for i in range(12):
+            reviewer = User.objects.create_user(username=f'claimreviewer{i}', password='testpass123')
+            reviewer.profile.user_type = 'osas'
+            reviewer.profile.save()
+            self.reviewers.append(reviewer)
+        admin = User.objects.create_user(username='claimadmin')
+        self.scholarships = [
+            Scholarship.objects.create(
+                title=f'Claim Scholarship {i}',
+                description='Test description',
+                eligibility_criteria='Test criteria',
+                award_amount=Decimal('1000.00'),
+                application_deadline=timezone.now() + timedelta(days=30),
+                available_slots=5,
+                created_by=admin
+            )
+            for i in range(2)
+        ]
+        self.applications = []
+        for i in range(8):
+            student = User.objects.create_user(username=f'claimstudent{i}')
+            student.profile.campus = 'mati' if i >= 6 else 'dumingag'
+            student.profile.save()
+            self.applications.append(Application.objects.create(
+                student=student,
+                scholarship=self.scholarships[1 if i >= 4 else 0],
+                personal_statement='Test statement',
+                gpa=Decimal('3.5')
+            ))
+            # Distinct submission times, oldest first.
+            Application.objects.filter(pk=self.applications[-1].pk).update(
+                submitted_at=timezone.now() - timedelta(hours=10 - i)
+            )
+        self.url = reverse('core:claim_next_application')
+    
+    def _claim(self, reviewer, **data):
+        self.client.force_login(reviewer)
+        return self.client.post(self.url, data).json()
+    
+    def test_claims_oldest_with_affinity_and_fallback(self):
+        data = self._claim(self.reviewers[0])
+        self.assertEqual(data['application']['id'], self.applications[0].pk)
+        claimed = Application.objects.get(pk=self.applications[0].pk)
+        self.assertEqual((claimed.status, claimed.reviewed_by), ('under_review', self.reviewers[0]))
+        self.assertGreater(claimed.claim_expires_at, timezone.now())
+        
+        data = self._claim(self.reviewers[1], campus='mati')
+        self.assertEqual(data['application']['id'], self.applications[6].pk)
+        data = self._claim(self.reviewers[1], scholarship=self.scholarships[1].pk)
+        self.assertEqual(data['application']['id'], self.applications[4].pk)
+        
+        # Nothing left at the campus: strict affinity finds nothing, the
+        # default falls back to the oldest pending application.
+        Application.objects.filter(pk=self.applications[7].pk).update(status='rejected')
+        self.assertIsNone(self._claim(self.reviewers[2], campus='mati', strict='1')['application'])
+        data = self._claim(self.reviewers[2], campus='mati')
+        self.assertEqual(data['application']['id'], self.applications[1].pk)
+    
+    def test_lapsed_claims_return_to_the_queue(self):
+        from .models import ScholarshipCounter
+        
+        self._claim(self.reviewers[0])
+        Application.objects.filter(pk=self.applications[0].pk).update(
+            claim_expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        
+        data = self._claim(self.reviewers[1])
+        self.assertEqual(data['application']['id'], self.applications[0].pk)
+        self.assertEqual(Application.objects.get(pk=self.applications[0].pk).reviewed_by, self.reviewers[1])
+        counter = ScholarshipCounter.objects.get(scholarship=self.scholarships[0])
+        self.assertEqual((counter.pending, counter.under_review), (3, 1))
+        
+        # Finishing the review ends the lease.
+        application = Application.objects.get(pk=self.applications[0].pk)
+        application.mark_as_reviewed(self.reviewers[1], 'osas_approved')
+        self.assertIsNone(Application.objects.get(pk=application.pk).claim_expires_at)
+    
+    def test_assign_to_me_does_not_steal_a_claim(self):
+        self._claim(self.reviewers[0])
+        self.client.force_login(self.reviewers[1])
+        response = self.client.post(
+            reverse('core:review_application', args=[self.applications[0].pk]), {'action': 'assign_to_me'}, follow=True
+        )
+        self.assertContains(response, 'already been claimed')
+        self.assertEqual(Application.objects.get(pk=self.applications[0].pk).reviewed_by, self.reviewers[0])
+
+    def test_assign_claims_a_pending_application(self):
+        from .models import ScholarshipCounter
+
+        self.client.force_login(self.reviewers[0])
+        response = self.client.post(reverse('core:assign_application', args=[self.applications[1].pk]))
+        self.assertRedirects(response, reverse('core:review_queue'), fetch_redirect_response=False)
+        claimed = Application.objects.get(pk=self.applications[1].pk)
+        self.assertEqual((claimed.status, claimed.reviewed_by), ('under_review', self.reviewers[0]))
+        counter = ScholarshipCounter.objects.get(scholarship=self.scholarships[0])
+        self.assertEqual((counter.pending, counter.under_review), (3, 1))
+
+    def test_htmx_redirects_and_students_are_refused(self):
+        self.client.force_login(self.reviewers[0])
+        response = self.client.post(self.url, HTTP_HX_REQUEST='true')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(
+            response['HX-Redirect'], reverse('core:review_application', args=[self.applications[0].pk])
+        )
+        
+        self.client.force_login(self.applications[0].student)
+        self.assertEqual(self.client.post(self.url).status_code, 403)
+    
+    def test_concurrent_reviewers_never_share_an_application(self):
+        import threading
+        from django.db import OperationalError, connections
+        from .services import ApplicationService
+        
+        claimed = []
+        start = threading.Barrier(len(self.reviewers))
+        
+        def claim(reviewer_id):
+            try:
+                reviewer = User.objects.select_related('profile').get(pk=reviewer_id)
+                start.wait()
+                while True:
+                    try:
+                        application = ApplicationService.claim_next(reviewer)
+                    except OperationalError:
+                        # The shared in-memory test database reports lock
+                        # contention instead of waiting for it.
+                        continue
+                    break
+                if application is not None:
+                    claimed.append((application.pk, reviewer.pk))
+            finally:
+                connections.close_all()
+        
+        threads = [threading.Thread(target=claim, args=[reviewer.pk]) for reviewer in self.reviewers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # A retried call may claim a second application after its first
+        # claim committed, but no application is ever handed out twice.
+        winners = [pk for pk, _ in claimed]
+        self.assertEqual(len(winners), len(set(winners)))
+        self.assertFalse(Application.objects.filter(status='pending').exists())
+        owners = dict(Application.objects.values_list('id', 'reviewed_by_id'))
+        for pk, reviewer_id in claimed:
+            self.assertEqual(owners[pk], reviewer_id)
+
+
+class ReviewerAssignmentTest(TestCase):
+    """Test the workload-balancing reviewer assignment scheduler."""
+    
+    def setUp(self):
+        admin = User.objects.create_user(username='assignadmin')
+        self.scholarship = Scholarship.objects.create(
+            title='Assignment Scholarship',
+            description='Test description',
+            eligibility_criteria='Test criteria',
+            award_amount=Decimal('1000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=50,
+            created_by=admin
+        )
+        self.reviewers = {}
+        for name, campus in [('fast', 'dumingag'), ('slow', 'dumingag'), ('mati', 'mati')]:
+            reviewer = User.objects.create_user(username=f'{name}reviewer')
+            reviewer.profile.user_type = 'osas'
+            reviewer.profile.campus = campus
+            reviewer.profile.save()
+            self.reviewers[name] = reviewer
+        
+        # The fast reviewer finished six reviews this week, the others none.
+        for i in range(6):
+            self._application(f'done{i}', 'dumingag', status='osas_approved', reviewed_by=self.reviewers['fast'])
+        self.pending = [self._application(f'pending{i}', 'dumingag') for i in range(12)]
+        self.pending += [self._application(f'matipending{i}', 'mati') for i in range(2)]
+    
+    def _application(self, username, campus, **fields):
+        student = User.objects.create_user(username=username)
+        student.profile.campus = campus
+        student.profile.save()
+        if 'reviewed_by' in fields:
+            fields['reviewed_at'] = timezone.now()
+        return Application.objects.create(
+            student=student, scholarship=self.scholarship,
+            personal_statement='Test statement', gpa=Decimal('3.5'), **fields
+        )
+    
+    def test_assignment_follows_throughput_and_campus(self):
+        from .models import ScholarshipCounter
+        from .services import ReviewerAssignmentService
+        
+        # Reads, then one UPDATE (and counter update) per reviewer and a
+        # single notification insert, however many applications there are.
+        with self.assertNumQueries(24):
+            report = ReviewerAssignmentService.assign_pending()
+        
+        self.assertEqual((report['pending'], report['assigned'], report['unassigned']), (14, 14, 0))
+        assigned = {reviewer['username']: reviewer for reviewer in report['reviewers']}
+        self.assertGreater(assigned['fastreviewer']['assigned'], assigned['slowreviewer']['assigned'])
+        self.assertGreaterEqual(assigned['matireviewer']['campus_matches'], 2)
+        self.assertFalse(Application.objects.filter(status='pending').exists())
+        for name, reviewer in self.reviewers.items():
+            self.assertEqual(
+                Application.objects.filter(reviewed_by=reviewer, status='under_review').count(),
+                assigned[reviewer.username]['assigned']
+            )
+        
+        counter = ScholarshipCounter.objects.get(scholarship=self.scholarship)
+        self.assertEqual((counter.pending, counter.under_review), (0, 14))
+        self.assertEqual(
+            Notification.objects.filter(recipient=self.pending[0].student, title='Application Under Review').count(), 1
+        )
+        self.assertTrue(Notification.objects.filter(recipient=self.reviewers['slow']).exists())
+    
+    def test_dry_run_and_open_review_cap(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db.models import Count, Q
+        
+        out = StringIO()
+        call_command('assign_reviewers', '--dry-run', stdout=out)
+        self.assertIn('Would assign 14 of 14', out.getvalue())
+        self.assertEqual(Application.objects.filter(status='pending').count(), 14)
+        
+        out = StringIO()
+        call_command('assign_reviewers', '--max-open', '3', stdout=out)
+        self.assertIn('Assigned 9 of 14 pending application(s); 5 left unassigned', out.getvalue())
+        self.assertIn('fastreviewer', out.getvalue())
+        self.assertFalse(
+            User.objects.annotate(
+                open_reviews=Count('reviewed_applications', filter=Q(reviewed_applications__status='under_review'))
+            ).filter(open_reviews__gt=3).exists()
+        )
+
+
+class FileUploadValidationTest(TestCase):
+    """Test single-pass upload validation and the upload size limit."""
+    
+    PNG = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde'
+    
+    def setUp(self):
+        import shutil
+        import tempfile
+        
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+    
+    def test_validate_file_hashes_and_sniffs_in_one_pass(self):
+        import hashlib
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .forms import FileUploadValidator
+        
+        content = b'plain text line\n' * 10000
+        upload = SimpleUploadedFile('notes.txt', content, content_type='text/plain')
+        info = FileUploadValidator.validate_file(upload)
+        
+        self.assertEqual(info['size'], len(content))
+        self.assertEqual(info['sha256'], hashlib.sha256(content).hexdigest())
+        self.assertIn(info['mime_type'], ('text/plain', None))
+        self.assertEqual(upload.read(), content)
+    
+    def test_streamed_size_is_checked_not_the_declared_one(self):
+        from django.core.exceptions import ValidationError
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .forms import FileUploadValidator
+        
+        upload = SimpleUploadedFile('notes.txt', b'x' * 2048, content_type='text/plain')
+        upload.size = 10
+        with self.assertRaisesMessage(ValidationError, 'File size must be less than'):
+            FileUploadValidator.validate_file(upload, max_size=1024)
+    
+    def test_content_must_match_extension(self):
+        from django.core.exceptions import ValidationError
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .forms import FileUploadValidator
+        
+        if FileUploadValidator.sniff_mime_type(self.PNG) is None:
+            self.skipTest('python-magic is not installed')
+        upload = SimpleUploadedFile('transcript.pdf', self.PNG, content_type='application/pdf')
+        with self.assertRaisesMessage(ValidationError, "does not match expected type for 'pdf'"):
+            FileUploadValidator.validate_file(upload)
+    
+    def test_oversized_uploads_are_dropped_while_received(self):
+        from unittest import mock
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .forms import FileUploadValidator
+        from .models import ApplicationDocument
+        
+        admin = User.objects.create_user(username='uploadadmin')
+        student = User.objects.create_user(username='uploadstudent', password='testpass123')
+        scholarship = Scholarship.objects.create(
+            title='Upload Scholarship',
+            description='Test description',
+            eligibility_criteria='Test criteria',
+            award_amount=Decimal('1000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=5,
+            created_by=admin
+        )
+        application = Application.objects.create(
+            student=student, scholarship=scholarship, personal_statement='Test statement', gpa=Decimal('3.5')
+        )
+        self.client.force_login(student)
+        
+        with mock.patch.object(FileUploadValidator, 'MAX_FILE_SIZE', 1024 * 1024):
+            response = self.client.post(
+                reverse('core:bulk_upload_documents', args=[application.pk]),
+                {'files': [
+                    SimpleUploadedFile('big.txt', b'x' * (3 * 1024 * 1024), content_type='text/plain'),
+                    SimpleUploadedFile('small.txt', b'small file\n', content_type='text/plain'),
+                ]},
+                follow=True
+            )
+        
+        messages_text = [str(message) for message in response.context['messages']]
+        self.assertIn('Error uploading big.txt: File size must be less than 1MB.', messages_text)
+        self.assertEqual(
+            list(ApplicationDocument.objects.filter(application=application).values_list('name', 'file_size')),
+            [('small.txt', 11)]
+        )
+
+
+class DocumentStorageTest(TestCase):
+    """Test content-addressed, reference-counted document storage."""
+    
+    def setUp(self):
+        import shutil
+        import tempfile
+        
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        
+        admin = User.objects.create_user(username='storageadmin')
+        self.student = User.objects.create_user(username='storagestudent')
+        self.applications = []
+        for i in range(2):
+            scholarship = Scholarship.objects.create(
+                title=f'Storage Scholarship {i}',
+                description='Test description',
+                eligibility_criteria='Test criteria',
+                award_amount=Decimal('1000.00'),
+                application_deadline=timezone.now() + timedelta(days=30),
+                available_slots=5,
+                created_by=admin
+            )
+            self.applications.append(Application.objects.create(
+                student=self.student, scholarship=scholarship,
+                personal_statement='Test statement', gpa=Decimal('3.5')
+            ))
+    
+    def _upload(self, application, content, filename='birth_certificate.pdf'):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .models import ApplicationDocument
+        
+        return ApplicationDocument.objects.create(
+            application=application,
+            name=filename,
+            file=SimpleUploadedFile(filename, content, content_type='application/pdf'),
+            file_size=len(content),
+            content_type='application/pdf'
+        )
+    
+    def test_identical_files_are_stored_once_until_the_last_reference_goes(self):
+        import hashlib
+        from .models import DocumentBlob
+        
+        content = b'%PDF-1.4 birth certificate'
+        first = self._upload(self.applications[0], content)
+        second = self._upload(self.applications[1], content, filename='copy.pdf')
+        other = self._upload(self.applications[1], b'%PDF-1.4 grades')
+        
+        digest = hashlib.sha256(content).hexdigest()
+        self.assertEqual(first.file.name, f'documents/{digest[:2]}/{digest[2:4]}/{digest}.pdf')
+        self.assertEqual(second.file.name, first.file.name)
+        self.assertNotEqual(other.file.name, first.file.name)
+        self.assertEqual(DocumentBlob.objects.get(name=first.file.name).ref_count, 2)
+        
+        storage = first.file.storage
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(storage.exists(second.file.name))
+        self.assertEqual(DocumentBlob.objects.get(name=second.file.name).ref_count, 1)
+        
+        # Deleting the application cascades to its documents.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.applications[1].delete()
+        self.assertFalse(storage.exists(second.file.name))
+        self.assertFalse(storage.exists(other.file.name))
+        self.assertFalse(DocumentBlob.objects.exists())
+    
+    def test_release_racing_a_save_of_the_same_content_keeps_the_file(self):
+        from unittest import mock
+        from .models import DocumentBlob
+        from .storage import ContentAddressedStorage
+        
+        content = b'%PDF-1.4 good moral certificate'
+        first = self._upload(self.applications[0], content)
+        storage = first.file.storage
+        
+        # The same content is saved again before the release commits.
+        with self.captureOnCommitCallbacks() as callbacks:
+            first.delete()
+        second = self._upload(self.applications[1], content)
+        for callback in callbacks:
+            callback()
+        self.assertTrue(storage.exists(second.file.name))
+        self.assertEqual(DocumentBlob.objects.get(name=second.file.name).ref_count, 1)
+        
+        # The release commits after storage found the file but before the
+        # new document is counted.
+        with self.captureOnCommitCallbacks() as callbacks:
+            second.delete()
+        save = ContentAddressedStorage._save
+        
+        def save_then_release(storage, name, content):
+            name = save(storage, name, content)
+            for callback in callbacks:
+                callback()
+            return name
+        
+        with mock.patch.object(ContentAddressedStorage, '_save', autospec=True, side_effect=save_then_release):
+            third = self._upload(self.applications[0], content)
+        with third.file.open('rb') as stored:
+            self.assertEqual(stored.read(), content)
+        self.assertEqual(DocumentBlob.objects.get(name=third.file.name).ref_count, 1)
+    
+    def test_dedupe_command_moves_legacy_files(self):
+        from io import StringIO
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import default_storage
+        from django.core.management import call_command
+        from .models import ApplicationDocument, DocumentBlob
+        
+        storage = ApplicationDocument._meta.get_field('file').storage
+        content = b'%PDF-1.4 clearance' * 100
+        legacy = [
+            default_storage.save(f'application_documents/2024/0{i + 1}/01/clearance.pdf', ContentFile(content))
+            for i in range(3)
+        ]
+        # Written before content addressing, with one copy per upload.
+        for application, name in zip(self.applications + self.applications[:1], legacy):
+            ApplicationDocument.objects.bulk_create([ApplicationDocument(
+                application=application, name='Clearance', file=name,
+                file_size=len(content), content_type='application/pdf'
+            )])
+        
+        out = StringIO()
+        call_command('dedupe_documents', '--dry-run', stdout=out)
+        self.assertIn(f'Would reclaim {2 * len(content)} bytes', out.getvalue())
+        self.assertTrue(all(storage.exists(name) for name in legacy))
+        
+        out = StringIO()
+        call_command('dedupe_documents', stdout=out)
+        self.assertIn('Moved 3 file(s): 2 duplicate(s), 0 missing', out.getvalue())
+        self.assertIn(f'Reclaimed {2 * len(content)} bytes', out.getvalue())
+        
+        names = set(ApplicationDocument.objects.values_list('file', flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertFalse(any(storage.exists(name) for name in legacy))
+        blob = DocumentBlob.objects.get()
+        self.assertEqual((blob.name, blob.ref_count), (names.pop(), 3))
+        self.assertTrue(storage.exists(blob.name))
+
+
+    def test_bulk_upload_stores_files_in_parallel_and_reports_each_file(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .models import ApplicationDocument, DocumentBlob
+        
+        application = self.applications[0]
+        self.client.force_login(self.student)
+        content = b'%PDF-1.4 report card'
+        response = self.client.post(
+            reverse('core:bulk_upload_documents', args=[application.pk]),
+            {'files': [
+                SimpleUploadedFile('grades.pdf', content, content_type='application/pdf'),
+                SimpleUploadedFile('setup.exe', b'MZ', content_type='application/octet-stream'),
+                SimpleUploadedFile('grades-copy.pdf', content, content_type='application/pdf'),
+            ]},
+            HTTP_HX_REQUEST='true'
+        )
+        
+        self.assertTemplateUsed(response, 'htmx/bulk_upload_results.html')
+        self.assertEqual(
+            [(item['name'], item['result']) for item in response.context['results']],
+            [('grades.pdf', 'uploaded'), ('setup.exe', 'error'), ('grades-copy.pdf', 'uploaded')]
+        )
+        self.assertContains(response, "File type &#x27;exe&#x27; is not allowed")
+        names = set(ApplicationDocument.objects.filter(application=application).values_list('file', flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertEqual(DocumentBlob.objects.get(name=names.pop()).ref_count, 2)
+    
+    def test_bulk_upload_removes_written_files_when_it_fails(self):
+        import os
+        from unittest import mock
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.db import DatabaseError
+        from .forms import FileUploadValidator
+        from .models import ApplicationDocument, DocumentBlob
+        from .uploads import store_documents
+        
+        kept = self._upload(self.applications[1], b'%PDF-1.4 shared')
+        files = [
+            SimpleUploadedFile('shared.pdf', b'%PDF-1.4 shared', content_type='application/pdf'),
+            SimpleUploadedFile('new.pdf', b'%PDF-1.4 new', content_type='application/pdf'),
+        ]
+        with mock.patch.object(ApplicationDocument.objects, 'bulk_create', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                store_documents(self.applications[0], files)
+        
+        media_files = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(kept.file.storage.location) for name in names
+        ]
+        self.assertEqual(media_files, [kept.file.path])
+        self.assertEqual(DocumentBlob.objects.get(name=kept.file.name).ref_count, 1)
+        
+        # A worker failing unexpectedly removes what the others wrote.
+        validate_file = FileUploadValidator.validate_file
+        
+        def fail_on_broken(uploaded_file, max_size=None):
+            if uploaded_file.name == 'broken.pdf':
+                raise RuntimeError('validator crashed')
+            return validate_file(uploaded_file, max_size)
+        
+        files = [
+            SimpleUploadedFile(f'{name}.pdf', f'%PDF-1.4 {name}'.encode(), content_type='application/pdf')
+            for name in ('grades', 'broken', 'clearance', 'shared')
+        ]
+        with mock.patch.object(FileUploadValidator, 'validate_file', side_effect=fail_on_broken):
+            with self.assertRaisesMessage(RuntimeError, 'validator crashed'):
+                store_documents(self.applications[0], files)
+        
+        media_files = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(kept.file.storage.location) for name in names
+        ]
+        self.assertEqual(media_files, [kept.file.path])
+        self.assertFalse(ApplicationDocument.objects.filter(application=self.applications[0]).exists())
+
+
+class DocumentReuseTest(TestCase):
+    """Test reusing a student's earlier uploads when applying."""
+    
+    def setUp(self):
+        import shutil
+        import tempfile
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from .models import ApplicationDocument
+        
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        
+        admin = User.objects.create_user(username='reuseadmin')
+        self.student = User.objects.create_user(username='reusestudent', password='testpass123')
+        self.scholarships = []
+        for i in range(2):
+            scholarship = Scholarship.objects.create(
+                title=f'Reuse Scholarship {i}',
+                description='Test description',
+                eligibility_criteria='Test criteria',
+                award_amount=Decimal('1000.00'),
+                application_deadline=timezone.now() + timedelta(days=30),
+                available_slots=5,
+                created_by=admin
+            )
+            scholarship.document_requirements.add(
+                DocumentRequirement.objects.create(name='birth_certificate', file_format_requirements='pdf')
+            )
+            self.scholarships.append(scholarship)
+        
+        earlier = Application.objects.create(
+            student=self.student, scholarship=self.scholarships[0],
+            personal_statement='Test statement', gpa=Decimal('3.5')
+        )
+        self.earlier_document = ApplicationDocument.objects.create(
+            application=earlier,
+            document_requirement=self.scholarships[0].document_requirements.get(),
+            name='Birth Certificate - psa.pdf',
+            file=SimpleUploadedFile('psa.pdf', b'%PDF-1.4 birth certificate', content_type='application/pdf'),
+            file_size=26,
+            content_type='application/pdf'
+        )
+        self.requirement = self.scholarships[1].document_requirements.get()
+        self.url = reverse('core:apply_scholarship', args=[self.scholarships[1].pk])
+        self.client.force_login(self.student)
+    
+    def _post(self, **data):
+        return self.client.post(self.url, {
+            'personal_statement': 'Reusing my documents', 'gpa': '3.6', 'additional_info': '', **data
+        })
+    
+    def test_reused_document_shares_the_stored_file(self):
+        from .models import DocumentBlob
+        
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Use Birth Certificate - psa.pdf')
+        
+        response = self._post(**{f'reuse_{self.requirement.pk}': 'on'})
+        self.assertRedirects(response, reverse('core:my_applications'))
+        document = Application.objects.get(student=self.student, scholarship=self.scholarships[1]).documents.get()
+        self.assertEqual(document.file.name, self.earlier_document.file.name)
+        self.assertEqual(document.document_requirement, self.requirement)
+        self.assertEqual(DocumentBlob.objects.get(name=document.file.name).ref_count, 2)
+    
+    def test_required_document_needs_a_file_or_reuse(self):
+        response = self._post()
+        self.assertContains(response, 'Birth Certificate is required.')
+        self.assertFalse(Application.objects.filter(scholarship=self.scholarships[1]).exists())
+    
+    def test_files_that_no_longer_fit_are_not_offered(self):
+        from .forms import DynamicApplicationForm
+        
+        self.requirement.file_format_requirements = 'jpg, png'
+        self.requirement.save()
+        form = DynamicApplicationForm(scholarship=self.scholarships[1], student=self.student)
+        self.assertEqual(form.reusable_documents, {})
+        self.assertTrue(form.fields[f'document_{self.requirement.pk}'].required)
+
+
+class ChunkedUploadTest(TestCase):
+    """Test the resumable chunked upload API."""
+    
+    CONTENT = b'%PDF-1.4 transcript of records ' * 40
+    
+    def setUp(self):
+        import shutil
+        import tempfile
+        
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        upload_override = override_settings(
+            MEDIA_ROOT=media_root,
+            CHUNKED_UPLOAD_DIR=f'{media_root}/partial',
+            CHUNKED_UPLOAD_CHUNK_SIZE=512
+        )
+        upload_override.enable()
+        self.addCleanup(upload_override.disable)
+        
+        admin = User.objects.create_user(username='chunkadmin')
+        self.student = User.objects.create_user(username='chunkstudent', password='testpass123')
+        scholarship = Scholarship.objects.create(
+            title='Chunked Scholarship',
+            description='Test description',
+            eligibility_criteria='Test criteria',
+            award_amount=Decimal('1000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=5,
+            created_by=admin
+        )
+        self.application = Application.objects.create(
+            student=self.student, scholarship=scholarship,
+            personal_statement='Test statement', gpa=Decimal('3.5')
+        )
+        self.client = Client()
+        self.client.login(username='chunkstudent', password='testpass123')
+    
+    def _start(self, **extra):
+        data = {'filename': 'transcript.pdf', 'size': len(self.CONTENT), 'name': 'Transcript', **extra}
+        response = self.client.post(reverse('core:start_chunked_upload', args=[self.application.id]), data)
+        self.assertEqual(response.status_code, 201)
+        return response.json()['upload_id']
+    
+    def _put(self, upload_id, offset, data):
+        return self.client.put(
+            reverse('core:chunked_upload', args=[upload_id]), data,
+            content_type='application/octet-stream', HTTP_UPLOAD_OFFSET=str(offset)
+        )
+    
+    def test_upload_resumes_from_the_server_offset_and_attaches_the_document(self):
+        import hashlib
+        from .models import ApplicationDocument, DocumentBlob
+        
+        upload_id = self._start(sha256=hashlib.sha256(self.CONTENT).hexdigest())
+        self.assertEqual(self._put(upload_id, 0, self.CONTENT[:512]).json()['offset'], 512)
+        
+        # A retried chunk is refused with the offset to resume from.
+        response = self._put(upload_id, 0, self.CONTENT[:512])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 512)
+        
+        response = self.client.get(reverse('core:chunked_upload', args=[upload_id]))
+        offset = response.json()['offset']
+        response = self.client.post(reverse('core:complete_chunked_upload', args=[upload_id]))
+        self.assertEqual(response.status_code, 409)
+        
+        while offset < len(self.CONTENT):
+            response = self._put(upload_id, offset, self.CONTENT[offset:offset + 512])
+            self.assertEqual(response.status_code, 200)
+            offset = response.json()['offset']
+        
+        response = self.client.post(reverse('core:complete_chunked_upload', args=[upload_id]))
+        self.assertEqual(response.status_code, 200)
+        document = ApplicationDocument.objects.get(id=response.json()['document']['id'])
+        self.assertEqual(document.application, self.application)
+        self.assertEqual(document.name, 'Transcript')
+        self.assertEqual(document.file_size, len(self.CONTENT))
+        with document.file.open('rb') as stored:
+            self.assertEqual(stored.read(), self.CONTENT)
+        self.assertTrue(DocumentBlob.objects.filter(name=document.file.name, ref_count=1).exists())
+        
+        # Completing again returns the same document.
+        response = self.client.post(reverse('core:complete_chunked_upload', args=[upload_id]))
+        self.assertEqual(response.json()['document']['id'], document.id)
+        self.assertEqual(ApplicationDocument.objects.count(), 1)
+    
+    def test_checksum_mismatch_restarts_the_upload(self):
+        from .models import ApplicationDocument, UploadSession
+        
+        upload_id = self._start(sha256='0' * 64)
+        offset = 0
+        while offset < len(self.CONTENT):
+            offset = self._put(upload_id, offset, self.CONTENT[offset:offset + 512]).json()['offset']
+        
+        response = self.client.post(reverse('core:complete_chunked_upload', args=[upload_id]))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['offset'], 0)
+        self.assertEqual(UploadSession.objects.get(pk=upload_id).received, 0)
+        self.assertFalse(ApplicationDocument.objects.exists())
+    
+    def test_uploads_are_private_and_checked_before_any_data_is_sent(self):
+        User.objects.create_user(username='chunkother', password='testpass123')
+        upload_id = self._start()
+        
+        other = Client()
+        other.login(username='chunkother', password='testpass123')
+        self.assertEqual(other.get(reverse('core:chunked_upload', args=[upload_id])).status_code, 404)
+        
+        response = self.client.post(
+            reverse('core:start_chunked_upload', args=[self.application.id]),
+            {'filename': 'setup.exe', 'size': 100}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            reverse('core:start_chunked_upload', args=[self.application.id]),
+            {'filename': 'huge.pdf', 'size': 100 * 1024 * 1024}
+        )
+        self.assertEqual(response.status_code, 400)
+    
+    def test_uploads_for_a_requirement_must_use_its_formats(self):
+        from .models import ApplicationDocument
+        
+        requirement = DocumentRequirement.objects.create(name='transcript', file_format_requirements='PDF')
+        self.application.scholarship.document_requirements.add(requirement)
+        
+        response = self.client.post(
+            reverse('core:start_chunked_upload', args=[self.application.id]),
+            {'filename': 'transcript.png', 'size': len(self.CONTENT), 'requirement': requirement.id}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('File format "png" is not allowed', response.json()['error'])
+        
+        # Checked again on completion, against the requirement as it is then.
+        upload_id = self._start(requirement=requirement.id)
+        offset = 0
+        while offset < len(self.CONTENT):
+            offset = self._put(upload_id, offset, self.CONTENT[offset:offset + 512]).json()['offset']
+        requirement.file_format_requirements = 'JPG, PNG'
+        requirement.save()
+        
+        response = self.client.post(reverse('core:complete_chunked_upload', args=[upload_id]))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('File format "pdf" is not allowed', response.json()['error'])
+        self.assertFalse(ApplicationDocument.objects.exists())
+    
+    def test_garbage_collection_removes_stale_sessions_and_partial_files(self):
+        import os
+        from .models import UploadSession
+        from .uploads import collect_garbage, partial_path
+        
+        stale = UploadSession.objects.get(pk=self._start())
+        self._put(stale.pk, 0, self.CONTENT[:512])
+        fresh = UploadSession.objects.get(pk=self._start())
+        UploadSession.objects.filter(pk=stale.pk).update(updated_at=timezone.now() - timedelta(days=2))
+        
+        removed = collect_garbage()
+        
+        self.assertEqual(removed, {'sessions': 1, 'files': 1, 'bytes': 512})
+        self.assertFalse(UploadSession.objects.filter(pk=stale.pk).exists())
+        self.assertFalse(os.path.exists(partial_path(stale)))
+        self.assertTrue(os.path.exists(partial_path(fresh)))
+
+
+class NotificationFanOutTest(TestCase):
+    """Test cases for the bulk notification fan-out."""
+    
+    def setUp(self):
+        self.students = []
+        for i in range(25):
+            self.students.append(
+                User.objects.create_user(username=f'student{i}', email=f'student{i}@example.com')
+            )
+        inactive = User.objects.create_user(username='inactive', email='inactive@example.com')
+        inactive.is_active = False
+        inactive.save()
+        
+        self.admin_user = User.objects.create_user(username='admin', email='admin@example.com')
+        self.admin_user.profile.user_type = 'admin'
+        self.admin_user.profile.save()
+    
+    def test_fan_out_batches_inserts(self):
+        """Rows are inserted with one query per batch, not per recipient."""
+        from .services import NotificationService
+        
+        recipients = User.objects.filter(profile__user_type='student', is_active=True)
+        with self.assertNumQueries(6):  # select IDs, savepoint, 3 inserts, release
+            result = NotificationService.fan_out(
+                recipients,
+                title='Hello',
+                message='Batch message',
+                batch_size=10
+            )
+        
+        self.assertEqual(result['created'], 25)
+        self.assertEqual(result['batches'], 3)
+        self.assertIn('elapsed_seconds', result)
+        self.assertEqual(Notification.objects.filter(title='Hello').count(), 25)
+    
+    def test_fan_out_accepts_user_ids(self):
+        """A plain iterable of IDs can be used instead of a queryset."""
+        from .services import NotificationService
+        
+        ids = [student.id for student in self.students[:3]]
+        result = NotificationService.fan_out(ids, title='Direct', message='Hi', notification_type='warning')
+        
+        self.assertEqual(result['created'], 3)
+        self.assertEqual(
+            set(Notification.objects.filter(title='Direct').values_list('recipient_id', flat=True)),
+            set(ids)
+        )
+    
+    def test_notify_all_students_skips_inactive_and_staff(self):
+        """Only active students receive the broadcast."""
+        from .services import NotificationService
+        
+        result = NotificationService.notify_all_students(title='Broadcast', message='All students')
+        
+        self.assertEqual(result['created'], 25)
+        self.assertFalse(Notification.objects.filter(title='Broadcast', recipient=self.admin_user).exists())
+
+
+class CountingEmailBackend(LocmemEmailBackend):
+    """Locmem backend that records connection opens and fails some addresses."""
+    
+    opened = 0
+    
+    def open(self):
+        CountingEmailBackend.opened += 1
+        return super().open()
+    
+    def send_messages(self, messages):
+        accepted = []
+        for message in messages:
+            if any('fail' in address for address in message.to):
+                if not self.fail_silently:
+                    raise ConnectionError('Recipient refused')
+                continue
+            accepted.append(message)
+        return super().send_messages(accepted)
+
+
+@override_settings(EMAIL_BACKEND='core.tests.CountingEmailBackend', EMAIL_USE_OUTBOX=True)
+class EmailOutboxTest(TestCase):
+    """Test cases for the email outbox and its worker."""
+    
+    def setUp(self):
+        CountingEmailBackend.opened = 0
+        self.student = User.objects.create_user(
+            username='student',
+            email='student@example.com',
+            first_name='Test',
+            last_name='Student'
+        )
+    
+    def test_create_notification_queues_email(self):
+        """Creating a notification stores the email instead of sending it."""
+        from .email_service import NotificationService
+        from .models import OutgoingEmail
+        
+        NotificationService.create_notification(
+            recipient=self.student,
+            title='Status Update',
+            message='Your application moved forward.'
+        )
+        
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.to_email, 'student@example.com')
+        self.assertEqual(email.status, 'queued')
+        self.assertIn('Your application moved forward.', email.body_text)
+        self.assertIn('Your application moved forward.', email.body_html)
+    
+    def test_worker_sends_batch_over_one_connection(self):
+        """A batch is delivered through a single opened connection."""
+        from .email_service import EmailService, EmailOutboxWorker
+        from .models import OutgoingEmail
+        
+        for i in range(5):
+            EmailService.queue_email(f'user{i}@example.com', f'Subject {i}', 'Body')
+        
+        stats = EmailOutboxWorker(batch_size=10).process_batch()
+        
+        self.assertEqual(stats, {'claimed': 5, 'sent': 5, 'retried': 0, 'dead': 0})
+        self.assertEqual(CountingEmailBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(OutgoingEmail.objects.filter(status='sent').count(), 5)
+    
+    def test_failed_email_is_retried_then_dead_lettered(self):
+        """Failures back off exponentially and end up in the dead letter state."""
+        from .email_service import EmailService, EmailOutboxWorker
+        
+        email = EmailService.queue_email('fail@example.com', 'Subject', 'Body')
+        worker = EmailOutboxWorker(batch_size=10, max_attempts=2, backoff_seconds=30)
+        
+        stats = worker.process_batch()
+        email.refresh_from_db()
+        self.assertEqual(stats['retried'], 1)
+        self.assertEqual(email.status, 'queued')
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=25))
+        self.assertIn('Recipient refused', email.last_error)
+        
+        # Not due yet, so nothing is claimed
+        self.assertEqual(worker.process_batch()['claimed'], 0)
+        
+        email.next_attempt_at = timezone.now()
+        email.save()
+        stats = worker.process_batch()
+        email.refresh_from_db()
+        self.assertEqual(stats['dead'], 1)
+        self.assertEqual(email.status, 'dead')
+        self.assertEqual(worker.backoff_for(3), timedelta(seconds=120))
+    
+    def test_stale_claims_are_released(self):
+        """Emails left in 'sending' by a crashed worker are picked up again."""
+        from .email_service import EmailService, EmailOutboxWorker
+        
+        email = EmailService.queue_email('user@example.com', 'Subject', 'Body')
+        email.status = 'sending'
+        email.claimed_at = timezone.now() - timedelta(hours=1)
+        email.save()
+        
+        stats = EmailOutboxWorker(claim_timeout_seconds=60).process_batch()
+        self.assertEqual(stats['sent'], 1)
+    
+    def test_run_email_worker_command(self):
+        """The management command drains everything that is due."""
+        from django.core.management import call_command
+        from io import StringIO
+        from .email_service import EmailService
+        
+        for i in range(7):
+            EmailService.queue_email(f'user{i}@example.com', 'Subject', 'Body')
+        
+        out = StringIO()
+        call_command('run_email_worker', '--once', '--batch-size', '3', stdout=out)
+        
+        self.assertEqual(len(mail.outbox), 7)
+        self.assertIn('7 sent', out.getvalue())
+
+
+@override_settings(EMAIL_BACKEND='core.tests.CountingEmailBackend')
+class BatchMailerTest(TestCase):
+    """Test cases for the connection-reusing batch mailer."""
+    
+    def setUp(self):
+        CountingEmailBackend.opened = 0
+        self.admin_user = User.objects.create_user(username='admin', email='admin@example.com')
+        self.admin_user.profile.user_type = 'admin'
+        self.admin_user.profile.save()
+        
+        self.scholarship = Scholarship.objects.create(
+            title='Mailer Scholarship',
+            description='Test description',
+            eligibility_criteria='Test criteria',
+            award_amount=Decimal('1000.00'),
+            application_deadline=timezone.now() + timedelta(days=2),
+            available_slots=5,
+            created_by=self.admin_user
+        )
+        for i in range(5):
+            User.objects.create_user(
+                username=f'student{i}',
+                email=f'student{i}@example.com',
+                first_name=f'First{i}',
+                last_name='<Last>'
+            )
+    
+    def test_messages_are_personalized(self):
+        """Each recipient gets their own name, HTML-escaped in the HTML body."""
+        from .email_service import EmailService
+        
+        sent = EmailService.send_scholarship_notification(self.scholarship, 'new_scholarship')
+        
+        self.assertEqual(sent, 5)
+        message = next(m for m in mail.outbox if m.to == ['student3@example.com'])
+        self.assertIn('Dear First3 <Last>', message.body)
+        html = message.alternatives[0][0]
+        self.assertIn('Dear First3 &lt;Last&gt;', html)
+        self.assertIn('Mailer Scholarship', html)
+        self.assertNotIn('[[recipient:', html)
+    
+    def test_chunks_share_one_connection(self):
+        """All chunks go over a single opened connection."""
+        from .email_service import BatchMailer
+        
+        metrics = BatchMailer(
+            subject='Hello',
+            template_name='new_scholarship',
+            context={'scholarship': self.scholarship, 'site_name': 'Test'},
+            chunk_size=2
+        ).send(User.objects.filter(username__startswith='student'))
+        
+        self.assertEqual(CountingEmailBackend.opened, 1)
+        self.assertEqual(metrics['sent'], 5)
+        self.assertEqual(metrics['failed'], 0)
+        self.assertGreater(metrics['messages_per_second'], 0)
+    
+    def test_failures_and_missing_addresses_are_counted(self):
+        """Refused messages count as failures; users without email are skipped."""
+        from .email_service import BatchMailer
+        
+        User.objects.create_user(username='refused', email='fail@example.com')
+        User.objects.create_user(username='noemail', email='')
+        
+        metrics = BatchMailer(
+            subject='Hello',
+            template_name='new_scholarship',
+            context={'scholarship': self.scholarship, 'site_name': 'Test'},
+            chunk_size=3
+        ).send(User.objects.exclude(username='admin'))
+        
+        self.assertEqual(metrics['sent'], 5)
+        self.assertEqual(metrics['failed'], 1)
+        self.assertEqual(metrics['skipped'], 1)
+    
+    def test_deadline_reminder_skips_applicants(self):
+        """Students who already applied do not get the reminder."""
+        from .email_service import EmailService
+        
+        Application.objects.create(
+            student=User.objects.get(username='student0'),
+            scholarship=self.scholarship,
+            personal_statement='Test statement',
+            gpa=Decimal('3.5')
+        )
+        
+        sent = EmailService.send_scholarship_notification(self.scholarship, 'deadline_reminder')
+        
+        self.assertEqual(sent, 4)
+        self.assertNotIn(['student0@example.com'], [m.to for m in mail.outbox])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+class HotQueryPlanTest(TestCase):
+    """Regression test: the hot review-queue and dashboard queries must use indexes."""
+    
+    FULL_SCAN = re.compile(r'\bSCAN (core_\w+)\b(?! USING)')
+    
+    def _hot_queries(self):
+        from .models import ApplicationDocument
+        
+        user_id = 1
+        return [
+            # (description, queryset, index also serves the ORDER BY)
+            ('review queue by status', Application.objects.filter(status='pending').order_by('submitted_at'), True),
+            ('pending approvals', Application.objects.filter(
+                status__in=['osas_approved', 'osas_rejected']).order_by('reviewed_at'), False),
+            ('awardees', Application.objects.filter(status='approved').order_by('-final_decision_at'), True),
+            ('my reviews', Application.objects.filter(
+                reviewed_by_id=user_id, status='under_review').order_by('reviewed_at'), True),
+            ('student status counts', Application.objects.filter(student_id=user_id, status='pending'), True),
+            ('review history', Application.objects.filter(
+                final_decision_by__isnull=False).order_by('-final_decision_at'), True),
+            ('unread notifications', Notification.objects.filter(
+                recipient_id=user_id, is_read=False).order_by('-created_at'), True),
+            ('application documents', ApplicationDocument.objects.filter(
+                application_id=user_id).order_by('-uploaded_at'), True),
+        ]
+    
+    def test_hot_queries_do_not_scan_tables(self):
+        """Every hot query is answered from an index rather than a full table scan."""
+        for description, queryset, index_orders in self._hot_queries():
+            plan = queryset.explain()
+            with self.subTest(query=description):
+                self.assertIsNone(self.FULL_SCAN.search(plan), f'Full table scan for {description}:\n{plan}')
+                if index_orders:
+                    self.assertNotIn('TEMP B-TREE FOR ORDER BY', plan, f'Extra sort for {description}:\n{plan}')
+
+
+class QueryBudgetTest(TestCase):
+    """Every named route stays within its query budget as the data grows."""
+    
+    # Queries allowed per request when a route has no entry in BUDGETS.
+    DEFAULT_BUDGET = 8
+    BUDGETS = {
+        'core:admin_dashboard': 11,
+        'core:osas_dashboard': 11,
+        'core:student_dashboard': 11,
+        'core:scholarship_awardees': 10,
+        'core:manage_scholarships': 9,
+        'core:admin_bulk_final_decision': 12,
+        'core:bulk_review_applications': 16,
+        'core:claim_next_application': 16,
+        'core:assign_application': 16,
+    }
+    # Same-shaped queries allowed per request (e.g. one COUNT per status);
+    # a per-row N+1 on any list page blows well past this.
+    MAX_REPEATED = 3
+    
+    def setUp(self):
+        import shutil
+        import tempfile
+        
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        upload_override = override_settings(
+            MEDIA_ROOT=media_root,
+            CHUNKED_UPLOAD_DIR=f'{media_root}/partial'
+        )
+        upload_override.enable()
+        self.addCleanup(upload_override.disable)
+    
+    def budget_for(self, route_name, role):
+        return self.BUDGETS.get(route_name, self.DEFAULT_BUDGET)
+    
+    def test_query_counts_are_flat_and_within_budget(self):
+        from .query_budget import QueryBudgetHarness, REDIRECT_ROUTES
+        
+        harness = QueryBudgetHarness()
+        harness.seed_base()
+        small_fixture = harness.seed_bulk(students=12, scholarships=4)
+        small = harness.measure_all()
+        large_fixture = harness.seed_bulk(students=1000, scholarships=300)
+        large = harness.measure_all()
+        
+        report = harness.build_report(
+            small, large, self.budget_for,
+            fixture={'small': small_fixture, 'large': large_fixture},
+        )
+        harness.write_report(report)
+        
+        for route_name, by_role in report['routes'].items():
+            for role, result in by_role.items():
+                with self.subTest(route=route_name, role=role):
+                    self.assertLess(result['status'], 500, f"{route_name} as {role} failed: {result['url']}")
+                    self.assertLessEqual(result['queries_large'], result['budget'])
+                    self.assertLessEqual(result['queries_large'], result['queries_small'])
+                    self.assertLessEqual(result['repeated'], self.MAX_REPEATED)
+            if route_name in REDIRECT_ROUTES:
+                continue
+            for role in harness.intended_roles(route_name):
+                with self.subTest(route=route_name, role=role):
+                    status = by_role[role]['status']
+                    self.assertTrue(200 <= status < 300, f"{route_name} as {role} returned {status}")
+
+
+class GenerateLoadDataTest(TestCase):
+    """Test the generate_load_data management command."""
+    
+    def _run(self, prefix, seed=7):
+        from django.core.management import call_command
+        from io import StringIO
+        
+        call_command(
+            'generate_load_data', students=150, scholarships=10, apps_per_student=3,
+            seed=seed, prefix=prefix, batch_size=40, stdout=StringIO()
+        )
+        return Application.objects.filter(student__username__startswith=f'{prefix}_student')
+    
+    def test_generates_requested_volume_across_statuses_and_campuses(self):
+        from .models import ApplicationDocument, ScholarshipCounter
+        
+        applications = self._run('gen')
+        
+        self.assertEqual(applications.count(), 450)
+        self.assertEqual(ApplicationDocument.objects.filter(application__in=applications).count(), 450)
+        self.assertEqual(Notification.objects.filter(recipient__username__startswith='gen_student').count(), 300)
+        self.assertEqual(
+            set(applications.values_list('status', flat=True)),
+            {choice for choice, _ in Application.STATUS_CHOICES}
+        )
+        self.assertEqual(
+            set(UserProfile.objects.filter(user__username__startswith='gen_student').values_list('campus', flat=True)),
+            {choice for choice, _ in UserProfile.CAMPUS_CHOICES}
+        )
+        self.assertFalse(applications.filter(status='approved', final_decision_at__isnull=True).exists())
+        self.assertGreater(applications.values('submitted_at').distinct().count(), 1)
+        self.assertEqual(sum(ScholarshipCounter.objects.values_list('total', flat=True)), 450)
+    
+    def test_same_seed_gives_same_data(self):
+        first = self._run('seed_a')
+        second = self._run('seed_b')
+        
+        def shape(applications):
+            return list(applications.order_by('id').values_list('status', 'gpa'))
+        
+        self.assertEqual(shape(first), shape(second))
+    
+    def test_refuses_existing_prefix(self):
+        from django.core.management.base import CommandError
+        
+        self._run('dup')
+        with self.assertRaises(CommandError):
+            self._run('dup')
+
+
+class RequestProfilingMiddlewareTest(TestCase):
+    """Test the optional request profiling middleware."""
+    
+    def setUp(self):
+        from .middleware import profile_store
+        
+        self.profile_store = profile_store
+        profile_store.clear()
+        self.student = User.objects.create_user(username='profstudent', password='testpass123')
+        self.admin = User.objects.create_user(username='profadmin', password='testpass123')
+        self.admin.profile.user_type = 'admin'
+        self.admin.profile.save()
+    
+    def test_disabled_by_default(self):
+        self.client.force_login(self.student)
+        response = self.client.get(reverse('core:student_dashboard'))
+        
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(self.profile_store.summary(), {})
+    
+    @override_settings(REQUEST_PROFILING_ENABLED=True, REQUEST_PROFILING_SLOW_MS=0)
+    def test_records_timings_by_url_name_and_logs_slow_requests(self):
+        self.client.force_login(self.student)
+        with self.assertLogs('core.profiling', 'WARNING') as logs:
+            response = self.client.get(reverse('core:student_dashboard'))
+        
+        self.assertIn('total;dur=', response['Server-Timing'])
+        stats = self.profile_store.summary()['core:student_dashboard']
+        self.assertEqual(stats['count'], 1)
+        self.assertGreater(stats['queries']['p50'], 0)
+        self.assertGreater(stats['template_ms']['p50'], 0)
+        self.assertGreaterEqual(stats['wall_ms']['p50'], stats['db_ms']['p50'])
+        
+        import json
+        payload = json.loads(logs.records[0].getMessage().split(' ', 1)[1])
+        self.assertEqual(payload['view'], 'core:student_dashboard')
+        self.assertEqual(payload['queries'], stats['queries']['p50'])
+        self.assertTrue(payload['worst_queries'])
+        self.assertLessEqual(len(payload['worst_queries']), 5)
+    
+    @override_settings(REQUEST_PROFILING_ENABLED=True)
+    def test_summary_endpoint_is_admin_only(self):
+        self.client.force_login(self.student)
+        self.assertEqual(self.client.get(reverse('core:admin_profiling_summary')).status_code, 403)
+        
+        self.client.force_login(self.admin)
+        for _ in range(3):
+            self.client.get(reverse('core:admin_dashboard'))
+        data = self.client.get(reverse('core:admin_profiling_summary')).json()
+        
+        self.assertTrue(data['enabled'])
+        self.assertEqual(data['views']['core:admin_dashboard']['count'], 3)
+        self.assertEqual(
+            set(data['views']['core:admin_dashboard']['wall_ms']),
+            {'p50', 'p95', 'p99', 'max'}
+        )
+    
+    def test_percentile_uses_nearest_rank(self):
+        from .middleware import percentile
+        
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+
+
+class DashboardStatsCacheTest(TestCase):
+    """Test the signal-invalidated dashboard stats cache."""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        from .services import DashboardStatsService
+        
+        cache.clear()
+        self.service = DashboardStatsService
+        self.service.reset_counters()
+        self.admin = User.objects.create_user(username='statsadmin', password='testpass123')
+        self.admin.profile.user_type = 'admin'
+        self.admin.profile.save()
+        self.osas = User.objects.create_user(username='statsosas', password='testpass123')
+        self.osas.profile.user_type = 'osas'
+        self.osas.profile.save()
+        self.student = User.objects.create_user(username='statsstudent', password='testpass123')
+        self.other_student = User.objects.create_user(username='statsother', password='testpass123')
+        self.scholarship = Scholarship.objects.create(
+            title='Stats Scholarship',
+            description='Test',
+            eligibility_criteria='Test',
+            award_amount=Decimal('1000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=2,
+            created_by=self.admin
+        )
+    
+    def test_polling_is_served_from_cache(self):
+        self.client.force_login(self.student)
+        url = reverse('core:htmx_dashboard_stats')
+        self.client.get(url)
+        
+        # Session, user and profile lookups only: no COUNT queries.
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.service.counters(), {'hits': 1, 'misses': 1})
+    
+    def test_application_change_expires_only_affected_stats(self):
+        self.assertEqual(self.service.get_stats(self.student)['total_applications'], 0)
+        self.service.get_stats(self.other_student)
+        self.assertEqual(self.service.get_stats(self.osas)['pending_applications'], 0)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.create(
+                student=self.student,
+                scholarship=self.scholarship,
+                personal_statement='Test',
+                gpa=Decimal('3.50')
+            )
+        self.service.reset_counters()
+        
+        self.assertEqual(self.service.get_stats(self.student)['total_applications'], 1)
+        self.assertEqual(self.service.get_stats(self.osas)['pending_applications'], 1)
+        self.service.get_stats(self.other_student)
+        self.assertEqual(self.service.counters(), {'hits': 1, 'misses': 2})
+    
+    def test_scholarship_change_expires_student_and_admin_stats(self):
+        self.assertEqual(self.service.get_stats(self.student)['available_scholarships'], 1)
+        self.assertEqual(self.service.get_stats(self.admin, 'live')['active_scholarships'], 1)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.scholarship.is_active = False
+            self.scholarship.save()
+        
+        self.assertEqual(self.service.get_stats(self.student)['available_scholarships'], 0)
+        self.assertEqual(self.service.get_stats(self.admin, 'live')['active_scholarships'], 0)
+    
+    def test_notifications_expire_recipient_stats(self):
+        from .services import NotificationService
+        
+        self.service.get_stats(self.student)
+        self.service.get_stats(self.other_student)
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(recipient=self.student, title='Hi', message='Hello')
+        self.service.reset_counters()
+        
+        self.assertEqual(self.service.get_stats(self.student)['unread_notifications'], 1)
+        self.service.get_stats(self.other_student)
+        self.assertEqual(self.service.counters(), {'hits': 1, 'misses': 1})
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.fan_out([self.other_student.pk], title='Bulk', message='Hello')
+        self.assertEqual(self.service.get_stats(self.other_student)['unread_notifications'], 1)
+    
+    def test_versions_change_only_when_the_transaction_commits(self):
+        from django.core.cache import cache
+        
+        self.service.get_stats(self.student)
+        keys = self.service.version_keys('applications')
+        before = cache.get_many(keys)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.create(
+                student=self.student,
+                scholarship=self.scholarship,
+                personal_statement='Test',
+                gpa=Decimal('3.50')
+            )
+            # A concurrent reader still sees the old version and the old rows.
+            self.assertEqual(cache.get_many(keys), before)
+        
+        self.assertNotEqual(cache.get_many(keys), before)
+        self.assertEqual(self.service.get_stats(self.student)['total_applications'], 1)
+
+
+class ScholarshipSearchTest(TestCase):
+    """Test the full-text scholarship search index."""
+    
+    def setUp(self):
+        self.admin = User.objects.create_user(username='searchadmin', password='testpass123')
+        self.student = User.objects.create_user(username='searchstudent', password='testpass123')
+        self.deadline = timezone.now() + timedelta(days=30)
+        self.engineering = self._scholarship(
+            'Engineering Excellence Grant', 'Support for future builders.', 'Enrolled in a BS program.'
+        )
+        self.nursing = self._scholarship(
+            'Nursing Scholarship', 'For students interested in engineering health systems.', 'BS Nursing students.'
+        )
+        self.arts = self._scholarship('Arts Award', 'For painters and musicians.', 'Fine arts majors.')
+    
+    def _scholarship(self, title, description, criteria):
+        return Scholarship.objects.create(
+            title=title,
+            description=description,
+            eligibility_criteria=criteria,
+            award_amount=Decimal('1000.00'),
+            application_deadline=self.deadline,
+            available_slots=2,
+            created_by=self.admin
+        )
+    
+    def _search(self, text, **kwargs):
+        from .search import search_scholarships
+        
+        return list(search_scholarships(Scholarship.objects.all(), text, **kwargs).order_by('search_rank'))
+    
+    def test_build_match_query_quotes_terms(self):
+        from .search import build_match_query
+        
+        self.assertEqual(build_match_query('Engin OR "x"'), '"engin"* "or"* "x"*')
+        self.assertEqual(build_match_query('nursing', prefix=False), '"nursing"')
+        self.assertEqual(build_match_query('  -- '), '')
+    
+    def test_ranks_title_matches_first_and_matches_prefixes(self):
+        self.assertEqual(self._search('engineering'), [self.engineering, self.nursing])
+        self.assertEqual(self._search('engin'), [self.engineering, self.nursing])
+        self.assertEqual(self._search('engin', prefix=False), [])
+        self.assertEqual(self._search('nursing students'), [self.nursing])
+        self.assertEqual(self._search('?!'), [])
+    
+    def test_index_follows_saves_deletes_and_bulk_writes(self):
+        self.arts.title = 'Music Scholarship'
+        self.arts.save()
+        self.assertEqual(self._search('music'), [self.arts])
+        self.assertEqual(self._search('arts award'), [])
+        
+        Scholarship.objects.filter(pk=self.nursing.pk).update(description='Caring professions.')
+        self.assertEqual(self._search('engineering'), [self.engineering])
+        
+        self.engineering.delete()
+        self.assertEqual(self._search('engineering'), [])
+        
+        bulk = Scholarship.objects.bulk_create([Scholarship(
+            title='Fisheries Grant', description='Marine studies.', eligibility_criteria='Any',
+            award_amount=Decimal('500.00'), application_deadline=self.deadline, created_by=self.admin
+        )])
+        self.assertEqual(self._search('fisheries'), bulk)
+    
+    def test_fallback_search_without_fts(self):
+        from unittest import mock
+        
+        with mock.patch('core.search.fts_available', return_value=False):
+            self.assertEqual(self._search('engineering'), [self.engineering, self.nursing])
+            self.assertEqual(self._search('nursing students'), [self.nursing])
+    
+    def test_views_use_search(self):
+        self.client.force_login(self.student)
+        
+        response = self.client.get(reverse('core:htmx_scholarship_search'), {'q': 'engin'})
+        self.assertEqual(list(response.context['scholarships']), [self.engineering, self.nursing])
+        
+        response = self.client.get(reverse('core:scholarships_list'), {'search': 'musicians'})
+        self.assertEqual(list(response.context['page_obj']), [self.arts])
+
+
+class EligibilityKeywordIndexTest(TestCase):
+    """Test the eligibility keyword inverted index and department filter."""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        from .models import EligibilityKeyword
+        
+        cache.clear()
+        self.Keyword = EligibilityKeyword
+        self.admin = User.objects.create_user(username='kwadmin', password='testpass123')
+        self.student = User.objects.create_user(username='kwstudent', password='testpass123')
+        self.engineering = self._scholarship('Engineering Grant', 'Engineering students; engineering or physics majors.')
+        self.nursing = self._scholarship('Nursing Grant', 'Nursing majors with good standing.')
+    
+    def _scholarship(self, title, criteria, **kwargs):
+        return Scholarship.objects.create(
+            title=title,
+            description='Test',
+            eligibility_criteria=criteria,
+            award_amount=Decimal('1000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=2,
+            created_by=self.admin,
+            **kwargs
+        )
+    
+    def _keywords(self, scholarship):
+        return dict(self.Keyword.objects.filter(scholarship=scholarship).values_list('keyword', 'frequency'))
+    
+    def test_tokenize_counts_terms_and_drops_filler(self):
+        self.assertEqual(
+            self.Keyword.tokenize('Engineering students; ENGINEERING, GPA 3.5 with physics.'),
+            {'engineering': 2, 'physics': 1}
+        )
+    
+    def test_index_is_updated_incrementally_on_save(self):
+        self.assertEqual(self._keywords(self.engineering), {'engineering': 2, 'majors': 1, 'physics': 1})
+        
+        self.engineering.eligibility_criteria = 'Engineering or chemistry majors.'
+        with self.assertNumQueries(5):
+            # select existing, then delete removed and upsert changed terms
+            # inside a savepoint
+            written = self.Keyword.index_scholarship(self.engineering)
+        self.assertEqual(written, 3)
+        self.assertEqual(self._keywords(self.engineering), {'engineering': 1, 'chemistry': 1, 'majors': 1})
+        
+        self.engineering.save(update_fields=['title'])
+        self.assertEqual(self.Keyword.index_scholarship(self.engineering), 0)
+    
+    def test_top_keywords_prefers_widespread_terms_and_is_cached(self):
+        from .services import ScholarshipService
+        
+        self._scholarship('Closed Grant', 'Chemistry majors.', is_active=False)
+        self.assertEqual(self.Keyword.top_keywords(2), [('majors', 2), ('engineering', 1)])
+        
+        ScholarshipService.get_department_keywords()
+        with self.assertNumQueries(0):
+            keywords = ScholarshipService.get_department_keywords()
+        self.assertEqual(keywords, ['engineering', 'majors', 'nursing', 'physics'])
+        
+        self.nursing.eligibility_criteria = 'Nursing or midwifery.'
+        self.nursing.save()
+        self.assertIn('midwifery', ScholarshipService.get_department_keywords())
+    
+    def test_department_filter_joins_the_index(self):
+        self.client.force_login(self.student)
+        response = self.client.get(reverse('core:scholarships_list'), {'department': 'Physics'})
+        
+        self.assertEqual(list(response.context['page_obj']), [self.engineering])
+        self.assertIn('majors', response.context['department_keywords'])
+        
+        if connection.vendor == 'sqlite':
+            plan = Scholarship.objects.filter(eligibility_keywords__keyword='physics').explain()
+            self.assertIn('core_elig_keyword_idx', plan)
+    
+    def test_rebuild_matches_incremental_index(self):
+        expected = set(self.Keyword.objects.values_list('scholarship_id', 'keyword', 'frequency'))
+        self.Keyword.objects.all().delete()
+        
+        self.assertEqual(self.Keyword.rebuild(), len(expected))
+        self.assertEqual(set(self.Keyword.objects.values_list('scholarship_id', 'keyword', 'frequency')), expected)
+
+
+@override_settings(CURSOR_PAGINATION_THRESHOLD=5)
+class CursorPaginationTest(TestCase):
+    """Test keyset pagination of the application listings."""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        
+        cache.clear()
+        self.osas = User.objects.create_user(username='cursorosas', password='testpass123')
+        self.osas.profile.user_type = 'osas'
+        self.osas.profile.save()
+        scholarship = Scholarship.objects.create(
+            title='Cursor Grant',
+            description='Test',
+            eligibility_criteria='Test',
+            award_amount=Decimal('1000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=5,
+            created_by=self.osas,
+        )
+        for i in range(35):
+            student = User.objects.create(username=f'cursorstudent{i}')
+            Application.objects.create(
+                student=student, scholarship=scholarship, personal_statement='Test', gpa=Decimal('3.00')
+            )
+        # Ties on the sort key must be broken by id without skipping rows.
+        tied = Application.objects.order_by('id').values_list('id', flat=True)[3:8]
+        Application.objects.filter(id__in=list(tied)).update(submitted_at=timezone.now() - timedelta(days=1))
+        self.expected = list(Application.objects.order_by('submitted_at', 'id').values_list('id', flat=True))
+        self.client.force_login(self.osas)
+        self.url = reverse('core:review_queue')
+    
+    def test_cursor_round_trip_and_garbage(self):
+        from .pagination import InvalidCursor, decode_cursor, encode_cursor
+        
+        cursor = encode_cursor('2026-01-02 03:04:05.000006+00:00', 42, 30)
+        self.assertEqual(decode_cursor(cursor), ('2026-01-02 03:04:05.000006+00:00', 42, 30))
+        for garbage in ('not-a-cursor', encode_cursor('x', 'y', 0)):
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(garbage)
+    
+    def test_cursors_walk_every_row_once_without_offset(self):
+        from django.test.utils import CaptureQueriesContext
+        
+        seen = []
+        params = {'status': 'all'}
+        for _ in range(5):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url, params)
+            page = response.context['page_obj']
+            self.assertTrue(page.is_cursor)
+            self.assertEqual(page.paginator.count, 35)
+            seen.extend(application.id for application in page)
+            self.assertFalse(any('OFFSET' in query['sql'] for query in queries.captured_queries))
+            if not page.has_next():
+                break
+            self.assertContains(response, 'hx-select-oob="#listView:beforeend,#tableViewRows:beforeend,#load-more"')
+            params['cursor'] = page.next_cursor
+        self.assertEqual(seen, self.expected)
+    
+    def test_cursors_continue_into_rows_with_a_null_key(self):
+        from django.core.paginator import Paginator
+        from .pagination import CursorPaginator, keyset_ordering
+        
+        # Ten decided applications; the rest have no final_decision_at.
+        decided = self.expected[:10]
+        for i, application_id in enumerate(decided):
+            Application.objects.filter(id=application_id).update(
+                final_decision_at=timezone.now() - timedelta(hours=i % 4)
+            )
+        decided_order = list(
+            Application.objects.filter(id__in=decided).order_by('-final_decision_at', '-id').values_list('id', flat=True)
+        )
+        undecided_order = sorted(self.expected[10:], reverse=True)
+        
+        paginator = CursorPaginator(Application.objects.all(), 4, '-final_decision_at')
+        self.assertEqual(paginator.count, 35)
+        seen = []
+        cursor = None
+        while True:
+            page = paginator.page(cursor)
+            seen.extend(application.id for application in page)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, decided_order + undecided_order)
+        
+        # Numbered pages use the same order.
+        queryset = Application.objects.order_by(*keyset_ordering(Application.objects.all(), '-final_decision_at'))
+        numbered = [application.id for number in (1, 2, 3) for application in Paginator(queryset, 15).page(number)]
+        self.assertEqual(numbered, seen)
+    
+    def test_page_numbers_still_work(self):
+        response = self.client.get(self.url, {'status': 'all', 'page': 2})
+        page = response.context['page_obj']
+        self.assertFalse(getattr(page, 'is_cursor', False))
+        self.assertEqual([application.id for application in page], self.expected[15:30])
+        
+        with override_settings(CURSOR_PAGINATION_THRESHOLD=1000):
+            response = self.client.get(self.url, {'status': 'all'})
+        self.assertEqual(response.context['page_obj'].paginator.num_pages, 3)
+    
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        response = self.client.get(self.url, {'status': 'all', 'cursor': 'bogus'})
+        self.assertEqual([application.id for application in response.context['page_obj']], self.expected[:15])
+    
+    def test_totals_are_cached_until_applications_change(self):
+        from .pagination import cached_count
+        
+        queryset = Application.objects.filter(status='pending')
+        self.assertEqual(cached_count(queryset), 35)
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_count(queryset), 35)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.first().delete()
+        self.assertEqual(cached_count(queryset), 34)
+
+
+class StreamingExportTest(TestCase):
+    """Test the server-side CSV and XLSX exports."""
+    
+    def setUp(self):
+        self.admin = User.objects.create_user(username='exportadmin', password='testpass123')
+        self.admin.profile.user_type = 'admin'
+        self.admin.profile.save()
+        scholarship = Scholarship.objects.create(
+            title='Export Grant',
+            description='Test',
+            eligibility_criteria='Test',
+            award_amount=Decimal('5000.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=20,
+            created_by=self.admin,
+        )
+        for i in range(12):
+            student = User.objects.create(username=f'exportstudent{i}', first_name=f'Student{i}', last_name='Export')
+            student.profile.campus = 'dumingag' if i % 2 else 'mati'
+            student.profile.save()
+            Application.objects.create(
+                student=student, scholarship=scholarship, personal_statement='Test', gpa=Decimal('3.25'),
+                status='approved', final_decision_by=self.admin, final_decision_at=timezone.now(),
+            )
+        student.first_name = '=HYPERLINK("x")'
+        student.save()
+        self.client.force_login(self.admin)
+    
+    def _body(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+    
+    def test_csv_streams_every_filtered_row(self):
+        import csv
+        import io
+        
+        response = self.client.get(
+            reverse('core:export_scholarship_awardees', args=['csv']), {'campus': 'dumingag', 'page': 1}
+        )
+        self.assertIn('attachment; filename="scholarship_awardees_', response['Content-Disposition'])
+        text = self._body(response).decode('utf-8')
+        self.assertTrue(text.startswith('\ufeffStudent Name,'))
+        rows = list(csv.reader(io.StringIO(text.lstrip('\ufeff'))))
+        
+        # All six Dumingag awardees, not just the first page of ten.
+        self.assertEqual(len(rows), 7)
+        self.assertEqual({row[3] for row in rows[1:]}, {'Dumingag Campus'})
+        self.assertIn('\'=HYPERLINK("x") Export', [row[0] for row in rows])
+    
+    def test_xlsx_is_a_valid_streamed_workbook(self):
+        import io
+        import zipfile
+        from xml.etree import ElementTree
+        
+        response = self.client.get(reverse('core:export_view_applications', args=['xlsx']))
+        chunks = [chunk for chunk in response.streaming_content if chunk]
+        # The package parts go out before the first row is read.
+        self.assertGreater(len(chunks), 1)
+        
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+        self.assertIsNone(archive.testzip())
+        namespace = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+        sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+        rows = sheet.findall('.//s:row', namespace)
+        self.assertEqual(len(rows), 13)
+        self.assertEqual(rows[0].find('.//s:t', namespace).text, 'Application ID')
+        self.assertTrue(rows[1].find('s:c/s:v', namespace).text.isdigit())
+    
+    def test_review_history_export_is_admin_only_and_validates_format(self):
+        url = reverse('core:export_review_history', args=['csv'])
+        body = self._body(self.client.get(url, {'decision': 'approved'})).decode('utf-8')
+        self.assertEqual(len(body.strip().splitlines()), 13)
+        
+        self.assertEqual(self.client.get(reverse('core:export_review_history', args=['pdf'])).status_code, 404)
+        
+        self.client.force_login(User.objects.get(username='exportstudent0'))
+        self.assertRedirects(self.client.get(url), reverse('core:landing_page'), fetch_redirect_response=False)
+
+
+class ReportJobTest(TestCase):
+    """Test the background-generated, cached PDF reports."""
+    
+    def setUp(self):
+        import shutil
+        import tempfile
+        
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        
+        self.admin = User.objects.create_user(username='reportadmin', password='testpass123')
+        self.admin.profile.user_type = 'admin'
+        self.admin.profile.save()
+        self.scholarship = Scholarship.objects.create(
+            title='Report Grant',
+            description='Test',
+            eligibility_criteria='Test',
+            award_amount=Decimal('7500.00'),
+            application_deadline=timezone.now() + timedelta(days=30),
+            available_slots=200,
+            created_by=self.admin,
+        )
+        for i in range(60):
+            student = User.objects.create(username=f'reportstudent{i}', first_name=f'Student{i}', last_name='Report')
+            Application.objects.create(
+                student=student, scholarship=self.scholarship, personal_statement='Test', gpa=Decimal('3.40'),
+                status='approved', final_decision_by=self.admin, final_decision_at=timezone.now(),
+            )
+        self.client.force_login(self.admin)
+        self.request_url = reverse('core:request_report', args=['awardees'])
+    
+    def _run_worker(self):
+        from .reports import ReportWorker
+        
+        worker = ReportWorker()
+        jobs = []
+        while (job := worker.process_next()) is not None:
+            jobs.append(job)
+        return jobs
+    
+    def test_worker_writes_the_full_report_as_pdf(self):
+        data = self.client.post(self.request_url).json()
+        self.assertEqual(data['status'], 'queued')
+        self.assertNotIn('download_url', data)
+        
+        [job] = self._run_worker()
+        self.assertEqual(job.status, 'done', job.last_error)
+        self.assertEqual(job.row_count, 60)
+        self.assertTrue(job.file.name.startswith('reports/awardees/'))
+        
+        data = self.client.get(data['status_url']).json()
+        self.assertEqual(data['status'], 'done')
+        response = self.client.get(data['download_url'])
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('attachment;', response['Content-Disposition'])
+        body = b''.join(response.streaming_content)
+        self.assertTrue(body.startswith(b'%PDF-1.4'))
+        self.assertTrue(body.rstrip().endswith(b'%%EOF'))
+        # Sixty rows do not fit on one landscape page.
+        self.assertIn(b'/Count 2 >>', body)
+    
+    def test_unchanged_report_is_served_from_cache(self):
+        from .models import ReportJob
+        
+        first = self.client.post(self.request_url, HTTP_HX_REQUEST='true')
+        self.assertContains(first, 'hx-trigger="every 2s"')
+        self._run_worker()
+        
+        second = self.client.post(self.request_url, HTTP_HX_REQUEST='true')
+        self.assertContains(second, 'Download PDF')
+        self.assertEqual(self._run_worker(), [])
+        self.assertEqual(ReportJob.objects.count(), 1)
+        
+        # Different filters are a different report.
+        self.client.post(self.request_url + '?campus=mati')
+        self.assertEqual(ReportJob.objects.filter(status='queued').count(), 1)
+    
+    def test_non_numeric_scholarship_filter_is_ignored(self):
+        from .models import ReportJob
+        
+        data = self.client.post(self.request_url).json()
+        response = self.client.post(self.request_url + '?scholarship=abc')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], data['id'])
+        self.assertEqual(ReportJob.objects.get().filters, {})
+    
+    def test_reclaimed_job_keeps_the_new_owners_result(self):
+        import os
+        from django.conf import settings
+        from .models import ReportJob
+        from .reports import ReportWorker
+        
+        self.client.post(self.request_url)
+        worker = ReportWorker()
+        job = worker.claim_next()
+        # The claim lapsed and another worker holds the job now.
+        ReportJob.objects.filter(pk=job.pk).update(claim_token='other-worker')
+        
+        worker.generate(job)
+        stored = ReportJob.objects.get(pk=job.pk)
+        self.assertEqual((stored.status, stored.claim_token, stored.file.name), ('running', 'other-worker', ''))
+        self.assertEqual(os.listdir(os.path.join(settings.MEDIA_ROOT, 'reports', 'awardees')), [])
+    
+    def test_version_depends_only_on_the_report_data(self):
+        from django.core.cache import cache
+        from .models import ReportJob
+        
+        self.client.post(self.request_url)
+        self._run_worker()
+        
+        # A fresh worker process (empty local cache) and edits to rows the
+        # report does not cover reuse the same job.
+        cache.clear()
+        pending = Application.objects.create(
+            student=User.objects.create(username='reportpending'), scholarship=self.scholarship,
+            personal_statement='Test', gpa=Decimal('3.00'),
+        )
+        pending.gpa = Decimal('3.10')
+        pending.save()
+        self.assertEqual(self.client.post(self.request_url).json()['status'], 'done')
+        self.assertEqual(ReportJob.objects.count(), 1)
+        
+        # Renaming the scholarship changes what the report shows.
+        self.scholarship.title = 'Renamed Report Grant'
+        self.scholarship.save()
+        self.assertEqual(self.client.post(self.request_url).json()['status'], 'queued')
+    
+    def test_data_change_creates_a_new_version_and_drops_the_old_one(self):
+        from .models import ReportJob
+        
+        self.client.post(self.request_url)
+        [old] = self._run_worker()
+        old_path = old.file.path
+        
+        application = Application.objects.filter(status='approved').first()
+        application.status = 'rejected'
+        application.save()
+        
+        data = self.client.post(self.request_url).json()
+        self.assertEqual(data['status'], 'queued')
+        self.assertNotEqual(data['id'], old.pk)
+        [new] = self._run_worker()
+        self.assertEqual(new.row_count, 59)
+        self.assertEqual(list(ReportJob.objects.values_list('id', flat=True)), [new.pk])
+        
+        import os
+        self.assertFalse(os.path.exists(old_path))
+    
+    def test_permissions(self):
+        from .models import ReportJob
+        
+        osas = User.objects.create_user(username='reportosas', password='testpass123')
+        osas.profile.user_type = 'osas'
+        osas.profile.save()
+        self.client.force_login(osas)
+        self.assertEqual(self.client.post(self.request_url).status_code, 200)
+        self.assertEqual(self.client.post(reverse('core:request_report', args=['decisions'])).status_code, 403)
+        self.assertEqual(self.client.get(self.request_url).status_code, 405)
+        self.assertEqual(self.client.post(reverse('core:request_report', args=['other'])).status_code, 404)
+        
+        job = ReportJob.objects.get()
+        self.client.force_login(User.objects.get(username='reportstudent0'))
+        self.assertEqual(self.client.post(self.request_url).status_code, 403)
+        self.assertEqual(self.client.get(reverse('core:report_status', args=[job.pk])).status_code, 403)
+        # Not generated yet.
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(reverse('core:download_report', args=[job.pk])).status_code, 404)
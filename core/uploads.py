@@ -0,0 +1,380 @@
+"""
+Upload handling for application documents.
+
+``MaxSizeUploadHandler`` runs ahead of Django's memory and temporary-file
+handlers (see ``FILE_UPLOAD_HANDLERS``) and drops a file as soon as more
+than ``DOCUMENT_UPLOAD_MAX_SIZE`` bytes of it have arrived, so an oversized
+upload is never written out in full. The rest of the file is read from the
+request and discarded; views find the dropped names with
+``rejected_uploads``.
+
+A view that accepts less than that can put its own handler in front of the
+others, before anything reads ``request.POST``::
+
+    request.upload_handlers.insert(0, MaxSizeUploadHandler(request, max_size=...))
+
+Large documents can also be sent in pieces through the resumable upload
+API: ``start_upload`` opens an ``UploadSession``, ``write_chunk`` appends
+each piece at the offset the client names, ``complete_upload`` verifies the
+assembled file and attaches it to the application, and ``collect_garbage``
+removes sessions that were never finished.
+
+``store_documents`` saves the files of one bulk upload: they are validated
+and written on a small thread pool and then attached with a single INSERT.
+"""
+
+import logging
+import mimetypes
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.db import transaction
+from django.utils import timezone
+
+from .forms import FileUploadValidator
+from .models import ApplicationDocument, DocumentBlob, UploadSession
+
+logger = logging.getLogger(__name__)
+
+# Bytes copied from the request to the partial file at a time.
+_COPY_BUFFER = 64 * 1024
+
+
+def max_upload_size():
+    """Largest file, in bytes, the upload handlers will accept."""
+    return getattr(settings, 'DOCUMENT_UPLOAD_MAX_SIZE', 50 * 1024 * 1024)
+
+
+def rejected_uploads(request):
+    """Names of the files in ``request`` that were dropped for being too large."""
+    return getattr(request, '_rejected_uploads', [])
+
+
+class MaxSizeUploadHandler(FileUploadHandler):
+    """Skip any uploaded file that grows past ``max_size`` (default ``max_upload_size()``)."""
+    
+    def __init__(self, request=None, max_size=None):
+        super().__init__(request)
+        self.max_size = max_size or max_upload_size()
+        self.received = 0
+    
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+    
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            if self.request is not None:
+                if not hasattr(self.request, '_rejected_uploads'):
+                    self.request._rejected_uploads = []
+                self.request._rejected_uploads.append(self.file_name)
+            raise SkipFile(f'{self.file_name} is larger than {self.max_size} bytes.')
+        return raw_data
+    
+    def file_complete(self, file_size):
+        # The next handler builds the UploadedFile.
+        return None
+
+
+def bulk_upload_workers():
+    """Threads used to validate and write the files of one bulk upload."""
+    return getattr(settings, 'BULK_UPLOAD_WORKERS', 4)
+
+
+def _store_file(field, uploaded_file):
+    """Validate ``uploaded_file`` and write it to the document storage.
+    
+    Runs on the worker threads, so it must not touch the database.
+    """
+    try:
+        info = FileUploadValidator.validate_file(uploaded_file)
+    except ValidationError as e:
+        return {'error': e.messages[0]}
+    try:
+        name = field.storage.save(
+            field.generate_filename(None, uploaded_file.name), uploaded_file, max_length=field.max_length
+        )
+    except OSError:
+        logger.exception('Could not store uploaded file %s', uploaded_file.name)
+        return {'error': 'The file could not be saved. Please try again.'}
+    return {'info': info, 'stored': name}
+
+
+def store_documents(application, uploaded_files):
+    """Attach ``uploaded_files`` to ``application`` as ``ApplicationDocument`` rows.
+    
+    The files are validated and written to storage concurrently on up to
+    ``BULK_UPLOAD_WORKERS`` threads; the rows are then created with one
+    ``bulk_create`` in a transaction, which also counts the new references
+    to each stored file (``bulk_create`` sends no ``post_save``). If a
+    worker fails unexpectedly or the rows cannot be saved, the files
+    written for this upload that no other document uses are removed again
+    before the error is raised.
+    
+    Returns one ``{'name', 'result', 'message', 'document'}`` dict per
+    file, in upload order, where ``result`` is ``uploaded`` or ``error``.
+    """
+    field = ApplicationDocument._meta.get_field('file')
+    outcomes = [None] * len(uploaded_files)
+    failure = None
+    workers = max(1, min(bulk_upload_workers(), len(uploaded_files)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bulk-upload') as pool:
+        futures = {
+            pool.submit(_store_file, field, uploaded_file): index
+            for index, uploaded_file in enumerate(uploaded_files)
+        }
+        # Wait for every worker so nothing is still writing during cleanup.
+        for future in as_completed(futures):
+            try:
+                outcomes[futures[future]] = future.result()
+            except Exception as e:
+                failure = failure or e
+    written = {outcome['stored'] for outcome in outcomes if outcome and 'stored' in outcome}
+    if failure is not None:
+        _discard_unreferenced(written, field.storage)
+        raise failure
+    
+    results = []
+    documents = []
+    contents = {}
+    for uploaded_file, outcome in zip(uploaded_files, outcomes):
+        result = {'name': uploaded_file.name, 'result': 'error', 'message': outcome.get('error'), 'document': None}
+        if 'stored' in outcome:
+            info = outcome['info']
+            result['document'] = ApplicationDocument(
+                application=application,
+                name=uploaded_file.name,
+                file=outcome['stored'],
+                file_size=info['size'],
+                content_type=info['mime_type'] or uploaded_file.content_type
+            )
+            result.update(result='uploaded', message='Uploaded')
+            documents.append(result['document'])
+            contents.setdefault(outcome['stored'], uploaded_file)
+        results.append(result)
+    
+    if documents:
+        stored = Counter(document.file.name for document in documents)
+        sizes = {document.file.name: document.file_size for document in documents}
+        try:
+            with transaction.atomic():
+                ApplicationDocument.objects.bulk_create(documents)
+                for name, count in stored.items():
+                    DocumentBlob.acquire(name, sizes[name], count=count, storage=field.storage, content=contents[name])
+        except Exception:
+            _discard_unreferenced(written, field.storage)
+            raise
+    return results
+
+
+def _discard_unreferenced(names, storage):
+    for name in names:
+        DocumentBlob.delete_unreferenced(name, storage)
+
+
+def upload_dir():
+    """Directory holding the partial files of resumable uploads."""
+    return str(getattr(settings, 'CHUNKED_UPLOAD_DIR', os.path.join(settings.BASE_DIR, 'uploads', 'partial')))
+
+
+def chunk_size():
+    """Largest chunk, in bytes, a client may send in one request."""
+    return getattr(settings, 'CHUNKED_UPLOAD_CHUNK_SIZE', 1024 * 1024)
+
+
+def partial_path(session):
+    return os.path.join(upload_dir(), f'{session.pk}.part')
+
+
+def _size_limit(requirement):
+    if requirement is not None:
+        return requirement.max_file_size_mb * 1024 * 1024
+    return FileUploadValidator.MAX_FILE_SIZE
+
+
+def _check_file_type(filename, requirement):
+    """Reject a file name whose extension the upload, or ``requirement``, does not accept."""
+    extension = os.path.splitext(filename)[1].lower().lstrip('.')
+    if extension not in FileUploadValidator.ALLOWED_TYPES:
+        allowed_extensions = ', '.join(FileUploadValidator.ALLOWED_TYPES.keys())
+        raise ValidationError(
+            f"File type '{extension}' is not allowed. Allowed types: {allowed_extensions}", code='invalid_type'
+        )
+    if requirement is not None:
+        allowed_formats = [fmt.strip().lower() for fmt in requirement.file_format_requirements.split(',')]
+        if extension not in allowed_formats:
+            raise ValidationError(
+                f'File format "{extension}" is not allowed. '
+                f'Allowed formats: {requirement.file_format_requirements}',
+                code='invalid_type'
+            )
+
+
+def start_upload(application, user, filename, size, name='', requirement=None, sha256=''):
+    """Open an upload session for a file of ``size`` bytes.
+    
+    The file name and size are checked up front so a file that would be
+    rejected is never sent.
+    """
+    _check_file_type(filename, requirement)
+    limit = _size_limit(requirement)
+    if size <= 0 or size > limit:
+        raise ValidationError(f"File size must be less than {limit // (1024*1024)}MB.", code='invalid_size')
+    
+    session = UploadSession.objects.create(
+        application=application,
+        document_requirement=requirement,
+        uploaded_by=user,
+        filename=os.path.basename(filename),
+        name=name or os.path.basename(filename),
+        size=size,
+        sha256=sha256.lower(),
+    )
+    os.makedirs(upload_dir(), exist_ok=True)
+    open(partial_path(session), 'wb').close()
+    return session
+
+
+def write_chunk(session, offset, stream, length):
+    """Write ``length`` bytes read from ``stream`` at ``offset``.
+    
+    ``offset`` must equal the bytes received so far; otherwise the client
+    is out of step (for example a retried chunk that did arrive) and is
+    told where to resume. Returns the new offset.
+    """
+    if session.status != 'active':
+        raise ValidationError("This upload is already complete.", code='not_active')
+    if offset != session.received:
+        raise ValidationError(f"Expected offset {session.received}.", code='offset_mismatch')
+    if length <= 0 or length > chunk_size() or offset + length > session.size:
+        raise ValidationError(
+            f"Chunks must be 1 to {chunk_size()} bytes and end within the file.", code='invalid_chunk'
+        )
+    
+    path = partial_path(session)
+    if not os.path.exists(path):
+        raise ValidationError("This upload has expired. Please start again.", code='expired')
+    written = 0
+    with open(path, 'r+b') as partial:
+        partial.seek(offset)
+        while written < length:
+            data = stream.read(min(_COPY_BUFFER, length - written))
+            if not data:
+                break
+            partial.write(data)
+            written += len(data)
+    if written != length:
+        raise ValidationError("The chunk was cut short. Please send it again.", code='incomplete_chunk')
+    
+    # Only the request that wrote from the expected offset moves it on.
+    updated = UploadSession.objects.filter(pk=session.pk, status='active', received=offset).update(
+        received=offset + written, updated_at=timezone.now()
+    )
+    if not updated:
+        session.refresh_from_db(fields=['received', 'status'])
+        raise ValidationError(f"Expected offset {session.received}.", code='offset_mismatch')
+    session.received = offset + written
+    return session.received
+
+
+def complete_upload(session):
+    """Verify the assembled file and attach it as an ``ApplicationDocument``.
+    
+    The file is checked in one pass by ``FileUploadValidator`` (size, type
+    and SHA-256, compared with the digest the client sent if it sent one)
+    and then stored like any other upload. A session completed twice
+    returns the same document.
+    """
+    if session.status == 'complete':
+        return session.document
+    if session.received != session.size:
+        raise ValidationError(
+            f"Only {session.received} of {session.size} bytes have been received.", code='incomplete'
+        )
+    
+    # The requirement's formats may have changed since the upload started.
+    _check_file_type(session.filename, session.document_requirement)
+    
+    path = partial_path(session)
+    with open(path, 'rb') as partial:
+        upload = File(partial, name=session.filename)
+        info = FileUploadValidator.validate_file(upload, max_size=_size_limit(session.document_requirement))
+        if session.sha256 and info['sha256'] != session.sha256:
+            # Start over from the beginning rather than keep corrupt data.
+            UploadSession.objects.filter(pk=session.pk).update(received=0, updated_at=timezone.now())
+            session.received = 0
+            raise ValidationError(
+                "The uploaded file does not match its checksum. Please upload it again.", code='checksum_mismatch'
+            )
+        
+        with transaction.atomic():
+            if not UploadSession.objects.filter(pk=session.pk, status='active').update(status='complete'):
+                # Completed by a concurrent request.
+                session.refresh_from_db()
+                return session.document
+            document = ApplicationDocument.objects.create(
+                application=session.application,
+                document_requirement=session.document_requirement,
+                name=session.name,
+                file=upload,
+                file_size=info['size'],
+                content_type=info['mime_type'] or mimetypes.guess_type(session.filename)[0] or 'application/octet-stream'
+            )
+            session.status = 'complete'
+            session.document = document
+            session.save(update_fields=['status', 'document', 'updated_at'])
+    
+    os.remove(path)
+    return document
+
+
+def abort_upload(session):
+    """Discard an upload session and whatever has arrived of its file."""
+    path = partial_path(session)
+    if os.path.exists(path):
+        os.remove(path)
+    session.delete()
+
+
+def collect_garbage(max_age=None):
+    """Remove upload sessions idle for longer than ``max_age`` and stray partial files.
+    
+    ``max_age`` defaults to ``CHUNKED_UPLOAD_EXPIRY`` seconds (one day).
+    Returns ``{'sessions', 'files', 'bytes'}`` removed.
+    """
+    if max_age is None:
+        max_age = timedelta(seconds=getattr(settings, 'CHUNKED_UPLOAD_EXPIRY', 24 * 60 * 60))
+    cutoff = timezone.now() - max_age
+    removed = {'sessions': 0, 'files': 0, 'bytes': 0}
+    
+    stale = UploadSession.objects.filter(updated_at__lt=cutoff)
+    for session_id in stale.values_list('pk', flat=True).iterator():
+        path = os.path.join(upload_dir(), f'{session_id}.part')
+        if os.path.exists(path):
+            removed['bytes'] += os.path.getsize(path)
+            os.remove(path)
+            removed['files'] += 1
+    removed['sessions'] = stale.delete()[0]
+    
+    # Partial files whose session is gone, e.g. deleted with its application.
+    directory = upload_dir()
+    if os.path.isdir(directory):
+        live = {str(pk) for pk in UploadSession.objects.values_list('pk', flat=True)}
+        oldest = time.time() - max_age.total_seconds()
+        for entry in os.scandir(directory):
+            session_id = entry.name[:-len('.part')]
+            if entry.name.endswith('.part') and session_id not in live and entry.stat().st_mtime < oldest:
+                removed['bytes'] += entry.stat().st_size
+                os.remove(entry.path)
+                removed['files'] += 1
+    
+    logger.info('Removed %(sessions)d stale upload session(s) and %(files)d partial file(s)', removed)
+    return removed
@@ -34,7 +34,12 @@ urlpatterns = [
     # Admin final approval URLs (two-tier approval system)
     path('dashboard/admin/pending-approvals/', views_admin_approval.admin_pending_approvals, name='admin_pending_approvals'),
     path('dashboard/admin/final-decision/<int:application_id>/', views_admin_approval.admin_final_decision, name='admin_final_decision'),
+    path('dashboard/admin/final-decision/bulk/', views_admin_approval.admin_bulk_final_decision, name='admin_bulk_final_decision'),
     path('dashboard/admin/review-history/', views_admin_approval.admin_review_history, name='admin_review_history'),
+    path('dashboard/admin/review-history/export/<str:fmt>/', views_admin_approval.export_review_history, name='export_review_history'),
+    
+    # Request profiling summary (see core.middleware)
+    path('dashboard/admin/profiling/', views.admin_profiling_summary, name='admin_profiling_summary'),
     
     # Student-specific URLs
     path('scholarships/', views.scholarships_list, name='scholarships_list'),
@@ -44,16 +49,28 @@ urlpatterns = [
     path('applications/<int:application_id>/', views.application_detail, name='application_detail'),
     path('applications/<int:application_id>/upload/', views.upload_document, name='upload_document'),
     path('applications/<int:application_id>/bulk-upload/', views.bulk_upload_documents, name='bulk_upload_documents'),
+    path('applications/<int:application_id>/uploads/', views.start_chunked_upload, name='start_chunked_upload'),
+    path('uploads/<uuid:upload_id>/', views.chunked_upload, name='chunked_upload'),
+    path('uploads/<uuid:upload_id>/complete/', views.complete_chunked_upload, name='complete_chunked_upload'),
     path('documents/<int:document_id>/delete/', views.delete_document, name='delete_document'),
     
     # Admin-specific URLs
     path('manage-scholarships/', views.manage_scholarships, name='manage_scholarships'),
     path('view-applications/', views.view_applications, name='view_applications'),
+    path('view-applications/export/<str:fmt>/', views.export_view_applications, name='export_view_applications'),
     path('manage-document-requirements/', views.manage_document_requirements, name='manage_document_requirements'),
     path('scholarship-awardees/', views.scholarship_awardees, name='scholarship_awardees'),
+    path('scholarship-awardees/export/<str:fmt>/', views.export_scholarship_awardees, name='export_scholarship_awardees'),
+    
+    # Background PDF reports (see core.reports)
+    path('reports/<str:report_type>/request/', views.request_report, name='request_report'),
+    path('reports/<int:job_id>/', views.report_status, name='report_status'),
+    path('reports/<int:job_id>/download/', views.download_report, name='download_report'),
     
     path('review-queue/', views.review_queue, name='review_queue'),
     path('review/<int:application_id>/', views.application_review, name='review_application'),
+    path('review/bulk/', views.bulk_review_applications, name='bulk_review_applications'),
+    path('review/claim-next/', views.claim_next_application, name='claim_next_application'),
     path('assign/<int:application_id>/', views.assign_application, name='assign_application'),
     path('submit-review/<int:application_id>/', views.submit_review, name='submit_review'),
     
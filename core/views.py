@@ -3,13 +3,17 @@ from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.urls import reverse
 from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Q, Count
+from django.db.models import F
 from django.utils import timezone
 from django.core.paginator import Paginator
+import re
 from datetime import timedelta
 from django.core.exceptions import ValidationError
+from django.conf import settings
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from .forms import (
     CustomUserCreationForm,
     UserProfileForm,
@@ -22,7 +26,13 @@ from .forms import (
     RegistrationStep2Form,
     RegistrationStudentStep3Form,
 )
-from .models import Scholarship, Application, Notification, ApplicationDocument, DocumentRequirement
+from .models import Scholarship, Application, Notification, ApplicationDocument, DocumentRequirement, ReportJob
+from .services import ApplicationService, NotificationService, DashboardStatsService, ScholarshipService
+from .exports import APPLICATION_COLUMNS, AWARDEE_COLUMNS, export_response
+from .middleware import profile_store
+from .pagination import cached_count, paginate
+from . import reports
+from .search import search_scholarships
 
 
 def landing_page(request):
@@ -224,7 +234,7 @@ def student_dashboard(request):
         application_deadline__gt=timezone.now()
     ).exclude(
         id__in=user_applications.values_list('scholarship_id', flat=True)
-    ).order_by('application_deadline')
+    ).select_related('counter').order_by('application_deadline')
     
     # Get recent notifications
     recent_notifications = Notification.objects.filter(
@@ -233,13 +243,7 @@ def student_dashboard(request):
     ).order_by('-created_at')[:5]
     
     # Dashboard analytics
-    analytics = {
-        'total_applications': user_applications.count(),
-        'pending_applications': user_applications.filter(status='pending').count(),
-        'approved_applications': user_applications.filter(status='approved').count(),
-        'available_scholarships': available_scholarships.count(),
-        'unread_notifications': recent_notifications.count(),
-    }
+    analytics = DashboardStatsService.get_stats(request.user)
     
     context = {
         'user_applications': user_applications[:5],  # Show recent 5
@@ -261,28 +265,17 @@ def admin_dashboard(request):
     # Get scholarships created by this admin
     admin_scholarships = Scholarship.objects.filter(
         created_by=request.user
-    ).annotate(
-        total_applications=Count('applications')
+    ).select_related('counter').annotate(
+        total_applications=F('counter__total')
     ).order_by('-created_at')
     
     # Get recent applications across all scholarships
     recent_applications = Application.objects.select_related(
-        'student', 'scholarship', 'reviewed_by'
+        'student__profile', 'scholarship', 'reviewed_by'
     ).order_by('-submitted_at')[:10]
     
     # Dashboard analytics
-    analytics = {
-        'total_scholarships': admin_scholarships.count(),
-        'active_scholarships': admin_scholarships.filter(is_active=True).count(),
-        'total_applications': Application.objects.count(),
-        'pending_applications': Application.objects.filter(status='pending').count(),
-        'approved_applications': Application.objects.filter(status='approved').count(),
-        'scholarships_closing_soon': admin_scholarships.filter(
-            is_active=True,
-            application_deadline__lt=timezone.now() + timedelta(days=7),
-            application_deadline__gt=timezone.now()
-        ).count(),
-    }
+    analytics = DashboardStatsService.get_stats(request.user)
     
     context = {
         'admin_scholarships': admin_scholarships[:5],  # Show recent 5
@@ -303,40 +296,22 @@ def osas_dashboard(request):
     # Get applications pending review
     pending_applications = Application.objects.filter(
         status='pending'
-    ).select_related('student', 'scholarship').order_by('submitted_at')
+    ).select_related('student__profile', 'scholarship').order_by('submitted_at')
     
     # Get applications under review by this OSAS staff
     my_reviews = Application.objects.filter(
         reviewed_by=request.user,
         status='under_review'
-    ).select_related('student', 'scholarship').order_by('reviewed_at')
+    ).select_related('student__profile', 'scholarship').order_by('reviewed_at')
     
     # Get recently completed reviews
     recent_reviews = Application.objects.filter(
         reviewed_by=request.user,
         status__in=['approved', 'rejected']
-    ).select_related('student', 'scholarship').order_by('-reviewed_at')[:10]
+    ).select_related('student__profile', 'scholarship').order_by('-reviewed_at')[:10]
     
     # Dashboard analytics
-    analytics = {
-        'pending_applications': pending_applications.count(),
-        'my_under_review': my_reviews.count(),
-        'total_reviews_completed': Application.objects.filter(
-            reviewed_by=request.user,
-            status__in=['approved', 'rejected']
-        ).count(),
-        'approved_today': Application.objects.filter(
-            reviewed_by=request.user,
-            status='approved',
-            reviewed_at__date=timezone.now().date()
-        ).count(),
-        'rejected_today': Application.objects.filter(
-            reviewed_by=request.user,
-            status='rejected',
-            reviewed_at__date=timezone.now().date()
-        ).count(),
-        'total_pending_system': Application.objects.filter(status='pending').count(),
-    }
+    analytics = DashboardStatsService.get_stats(request.user)
     
     context = {
         'pending_applications': pending_applications[:8],  # Show top 8
@@ -377,19 +352,11 @@ def review_queue(request):
     elif reviewer_filter == 'unassigned':
         applications = applications.filter(reviewed_by__isnull=True)
     
-    # Pagination
-    paginator = Paginator(applications, 15)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset cursors once the queue is large)
+    page_obj = paginate(request, applications, 15)
     
     # Status counts
-    status_counts = {
-        'all': Application.objects.count(),
-        'pending': Application.objects.filter(status='pending').count(),
-        'under_review': Application.objects.filter(status='under_review').count(),
-        'approved': Application.objects.filter(status='approved').count(),
-        'rejected': Application.objects.filter(status='rejected').count(),
-    }
+    status_counts = ApplicationService.get_status_counts()
     
     # Get scholarships and reviewers for filters
     scholarships_for_filter = Scholarship.objects.filter(
@@ -401,6 +368,8 @@ def review_queue(request):
         reviewed_applications__isnull=False
     ).distinct().order_by('first_name', 'last_name')
     
+    from .models import UserProfile
+    
     context = {
         'applications': page_obj,  # Changed from page_obj to applications
         'page_obj': page_obj,
@@ -410,6 +379,7 @@ def review_queue(request):
         'status_counts': status_counts,
         'scholarships': scholarships_for_filter,  # Changed from scholarships_for_filter
         'reviewers_for_filter': reviewers_for_filter,
+        'campus_choices': UserProfile.CAMPUS_CHOICES,
     }
     
     return render(request, 'osas/review_queue.html', context)
@@ -447,16 +417,13 @@ def application_review(request, application_id):
                 messages.success(request, f'Application recommended for approval. Awaiting admin final decision.')
                 
                 # Create notification for admins
-                from django.contrib.auth.models import User
-                admins = User.objects.filter(profile__user_type='admin')
-                for admin in admins:
-                    Notification.objects.create(
-                        recipient=admin,
-                        title='New Application Recommended for Approval',
-                        message=f'OSAS staff {request.user.get_full_name()} recommends approval for {application.student.get_full_name()}\'s application to {application.scholarship.title}.',
-                        notification_type='info',
-                        related_application=application
-                    )
+                NotificationService.fan_out(
+                    User.objects.filter(profile__user_type='admin'),
+                    title='New Application Recommended for Approval',
+                    message=f'OSAS staff {request.user.get_full_name()} recommends approval for {application.student.get_full_name()}\'s application to {application.scholarship.title}.',
+                    notification_type='info',
+                    related_application=application
+                )
                     
             elif action == 'reject':
                 # OSAS recommends for rejection - Admin will make final decision
@@ -468,16 +435,13 @@ def application_review(request, application_id):
                 messages.success(request, f'Application recommended for rejection. Awaiting admin final decision.')
                 
                 # Create notification for admins
-                from django.contrib.auth.models import User
-                admins = User.objects.filter(profile__user_type='admin')
-                for admin in admins:
-                    Notification.objects.create(
-                        recipient=admin,
-                        title='New Application Recommended for Rejection',
-                        message=f'OSAS staff {request.user.get_full_name()} recommends rejection for {application.student.get_full_name()}\'s application to {application.scholarship.title}.',
-                        notification_type='warning',
-                        related_application=application
-                    )
+                NotificationService.fan_out(
+                    User.objects.filter(profile__user_type='admin'),
+                    title='New Application Recommended for Rejection',
+                    message=f'OSAS staff {request.user.get_full_name()} recommends rejection for {application.student.get_full_name()}\'s application to {application.scholarship.title}.',
+                    notification_type='warning',
+                    related_application=application
+                )
                 
             elif action == 'request_info':
                 application.mark_as_reviewed(
@@ -499,11 +463,10 @@ def application_review(request, application_id):
             return redirect('core:review_queue')
         
         elif action == 'assign_to_me':
-            application.reviewed_by = request.user
-            application.status = 'under_review'
-            application.reviewed_at = timezone.now()
-            application.save()
-            messages.success(request, 'Application assigned to you for review.')
+            if ApplicationService.claim_application(application, request.user):
+                messages.success(request, 'Application assigned to you for review.')
+            else:
+                messages.error(request, 'This application has already been claimed by another reviewer.')
     
     # Get student's other applications for context
     student_other_apps = Application.objects.filter(
@@ -518,6 +481,49 @@ def application_review(request, application_id):
     return render(request, 'osas/application_review.html', context)
 
 
+@login_required
+def bulk_review_applications(request):
+    """OSAS recommendation for many applications selected in the review queue.
+    
+    Takes ``application_ids`` (repeated), ``action`` (approve, reject or
+    request_info) and an optional shared ``comments`` template. Responds
+    with the per-application results as an HTMX partial or as JSON.
+    """
+    if not request.user.profile.is_osas:
+        return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Invalid request method'}, status=405)
+    
+    try:
+        application_ids = [int(value) for value in request.POST.getlist('application_ids')]
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid application id'}, status=400)
+    if not application_ids:
+        return JsonResponse({'success': False, 'error': 'No applications selected'}, status=400)
+    
+    try:
+        results = ApplicationService.bulk_recommend(
+            application_ids,
+            request.POST.get('action'),
+            request.user,
+            request.POST.get('comments', '')
+        )
+    except ValidationError as e:
+        return JsonResponse({'success': False, 'error': e.messages[0]}, status=400)
+    
+    summary = {}
+    for item in results:
+        summary[item['result']] = summary.get(item['result'], 0) + 1
+    
+    if request.headers.get('HX-Request'):
+        return render(request, 'htmx/bulk_review_results.html', {
+            'results': results,
+            'summary': summary,
+            'reviewed': len(results) - summary.get('already_reviewed', 0) - summary.get('not_found', 0),
+        })
+    return JsonResponse({'success': True, 'summary': summary, 'results': results})
+
+
 @login_required
 def htmx_notifications(request):
     """HTMX endpoint for real-time notifications."""
@@ -550,18 +556,14 @@ def scholarships_list(request):
         application_deadline__gt=timezone.now()
     )
     
-    # Apply search filter
+    # Apply search filter (full-text index, best matches first)
     if search_query:
-        scholarships = scholarships.filter(
-            Q(title__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(eligibility_criteria__icontains=search_query)
-        )
+        scholarships = search_scholarships(scholarships, search_query)
     
-    # Apply department filter
+    # Apply department filter (indexed join on the eligibility keyword index)
     if department_filter:
         scholarships = scholarships.filter(
-            eligibility_criteria__icontains=department_filter
+            eligibility_keywords__keyword=department_filter.strip().lower()
         )
     
     # Get user's existing applications to exclude applied scholarships
@@ -570,26 +572,22 @@ def scholarships_list(request):
     ).values_list('scholarship_id', flat=True)
     
     scholarships = scholarships.exclude(id__in=user_applications)
-    scholarships = scholarships.order_by('application_deadline')
+    if search_query:
+        scholarships = scholarships.order_by('search_rank', 'application_deadline')
+    else:
+        scholarships = scholarships.order_by('application_deadline')
+    scholarships = scholarships.select_related('counter')
     
     # Pagination
     paginator = Paginator(scholarships, 9)  # 9 scholarships per page
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Get unique departments for filter
-    departments = Scholarship.objects.values_list('eligibility_criteria', flat=True).distinct()
-    department_keywords = set()
-    for criteria in departments:
-        if criteria:
-            words = criteria.lower().split()
-            department_keywords.update([word for word in words if len(word) > 3])
-    
     context = {
         'page_obj': page_obj,
         'search_query': search_query,
         'department_filter': department_filter,
-        'department_keywords': sorted(list(department_keywords))[:10],  # Top 10 keywords
+        'department_keywords': ScholarshipService.get_department_keywords(10),
         'user_applications': user_applications,
     }
     
@@ -604,7 +602,7 @@ def scholarship_detail(request, scholarship_id):
         return redirect('core:landing_page')
     
     scholarship = get_object_or_404(
-        Scholarship.objects.prefetch_related('requirements'),
+        Scholarship.objects.select_related('counter').prefetch_related('requirements'),
         id=scholarship_id,
         is_active=True
     )
@@ -663,13 +661,7 @@ def my_applications(request):
     page_obj = paginator.get_page(page_number)
     
     # Get status counts for filter tabs
-    status_counts = {
-        'all': Application.objects.filter(student=request.user).count(),
-        'pending': Application.objects.filter(student=request.user, status='pending').count(),
-        'under_review': Application.objects.filter(student=request.user, status='under_review').count(),
-        'approved': Application.objects.filter(student=request.user, status='approved').count(),
-        'rejected': Application.objects.filter(student=request.user, status='rejected').count(),
-    }
+    status_counts = ApplicationService.get_status_counts(user=request.user)
     
     context = {
         'page_obj': page_obj,
@@ -690,10 +682,10 @@ def manage_scholarships(request):
     # Get scholarships created by this admin
     scholarships = Scholarship.objects.filter(
         created_by=request.user
-    ).annotate(
-        total_applications=Count('applications'),
-        pending_applications=Count('applications', filter=Q(applications__status='pending')),
-        approved_applications=Count('applications', filter=Q(applications__status='approved'))
+    ).select_related('counter').annotate(
+        total_applications=F('counter__total'),
+        pending_applications=F('counter__pending'),
+        approved_applications=F('counter__approved')
     ).order_by('-created_at')
     
     # Filter by status if requested
@@ -736,13 +728,11 @@ def manage_scholarships(request):
     return render(request, 'admin/manage_scholarships.html', context)
 
 
-@login_required
-def view_applications(request):
-    """Admin/OSAS view to see all applications across scholarships."""
-    if not (request.user.profile.is_admin or request.user.profile.is_osas):
-        messages.error(request, 'Access denied. Administrator or OSAS access required.')
-        return redirect('core:landing_page')
+def _filter_view_applications(request):
+    """Applications shown on ``view_applications`` with the request's filters.
     
+    Returns the queryset and the filter values for the template.
+    """
     # Get applications based on user role
     if request.user.profile.is_admin:
         # Admin sees applications for their scholarships
@@ -765,33 +755,38 @@ def view_applications(request):
     if scholarship_filter:
         applications = applications.filter(scholarship_id=scholarship_filter)
     
-    # Pagination
-    paginator = Paginator(applications, 15)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    return applications, {
+        'status_filter': status_filter,
+        'scholarship_filter': scholarship_filter,
+    }
+
+
+@login_required
+def view_applications(request):
+    """Admin/OSAS view to see all applications across scholarships."""
+    if not (request.user.profile.is_admin or request.user.profile.is_osas):
+        messages.error(request, 'Access denied. Administrator or OSAS access required.')
+        return redirect('core:landing_page')
+    
+    applications, filters = _filter_view_applications(request)
+    
+    # Pagination (keyset cursors once the listing is large)
+    page_obj = paginate(request, applications, 15)
     
     # Status counts for filter tabs
     if request.user.profile.is_admin:
-        base_qs = Application.objects.filter(scholarship__created_by=request.user)
         scholarships_for_filter = Scholarship.objects.filter(
             created_by=request.user
         ).order_by('title')
     else:
-        base_qs = Application.objects.all()
         scholarships_for_filter = Scholarship.objects.all().order_by('title')
     
-    status_counts = {
-        'all': base_qs.count(),
-        'pending': base_qs.filter(status='pending').count(),
-        'under_review': base_qs.filter(status='under_review').count(),
-        'approved': base_qs.filter(status='approved').count(),
-        'rejected': base_qs.filter(status='rejected').count(),
-    }
+    status_counts = ApplicationService.get_status_counts(user=request.user)
     
     context = {
         'page_obj': page_obj,
-        'status_filter': status_filter or 'all',
-        'scholarship_filter': scholarship_filter,
+        'status_filter': filters['status_filter'] or 'all',
+        'scholarship_filter': filters['scholarship_filter'],
         'status_counts': status_counts,
         'scholarships_for_filter': scholarships_for_filter,
     }
@@ -799,6 +794,17 @@ def view_applications(request):
     return render(request, 'admin/view_applications.html', context)
 
 
+@login_required
+def export_view_applications(request, fmt):
+    """Stream every application matching the page filters as CSV or XLSX."""
+    if not (request.user.profile.is_admin or request.user.profile.is_osas):
+        messages.error(request, 'Access denied. Administrator or OSAS access required.')
+        return redirect('core:landing_page')
+    
+    applications, _ = _filter_view_applications(request)
+    return export_response(applications, APPLICATION_COLUMNS, fmt, 'applications', sheet_name='Applications')
+
+
 @login_required
 def assign_application(request, application_id):
     """Assign application to current OSAS/Admin staff member."""
@@ -807,19 +813,66 @@ def assign_application(request, application_id):
         return redirect('core:landing_page')
     
     if request.method == 'POST':
-        application = get_object_or_404(Application, id=application_id)
+        application = get_object_or_404(Application.objects.select_related('scholarship'), id=application_id)
         
-        # Assign to current user and change status
-        application.reviewed_by = request.user
-        application.status = 'under_review'
-        application.save()
-        
-        messages.success(request, f'Application for {application.scholarship.title} assigned to you for review.')
+        # Assign to current user unless another reviewer claimed it first
+        if ApplicationService.claim_application(application, request.user):
+            messages.success(request, f'Application for {application.scholarship.title} assigned to you for review.')
+        else:
+            messages.error(request, 'This application has already been claimed by another reviewer.')
         return redirect('core:review_queue')
     
     return redirect('core:review_queue')
 
 
+@login_required
+def claim_next_application(request):
+    """Claim the oldest pending application for the current OSAS reviewer.
+    
+    Optional ``scholarship`` and ``campus`` parameters set the reviewer's
+    affinity; ``strict=1`` stops it from falling back to other pending
+    applications. HTMX requests are redirected to the claimed
+    application's review page; other requests get JSON.
+    """
+    if not request.user.profile.is_osas:
+        return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Invalid request method'}, status=405)
+    
+    scholarship_id = request.POST.get('scholarship') or None
+    if scholarship_id is not None and not scholarship_id.isdigit():
+        return JsonResponse({'success': False, 'error': 'Invalid scholarship'}, status=400)
+    
+    application = ApplicationService.claim_next(
+        request.user,
+        scholarship_id=scholarship_id,
+        campus=request.POST.get('campus') or None,
+        fallback=request.POST.get('strict') != '1'
+    )
+    
+    if application is None:
+        if request.headers.get('HX-Request'):
+            return HttpResponse('<span class="text-sm text-gray-600">No applications are waiting for review.</span>')
+        return JsonResponse({'success': False, 'application': None, 'error': 'No applications are waiting for review'})
+    
+    review_url = reverse('core:review_application', args=[application.id])
+    if request.headers.get('HX-Request'):
+        response = HttpResponse(status=204)
+        response['HX-Redirect'] = review_url
+        return response
+    return JsonResponse({
+        'success': True,
+        'application': {
+            'id': application.id,
+            'student': application.student.get_full_name(),
+            'scholarship': application.scholarship.title,
+            'submitted_at': application.submitted_at.isoformat(),
+            'claim_expires_at': application.claim_expires_at.isoformat(),
+            'review_url': review_url,
+        },
+    })
+
+
 @login_required
 def review_application(request, application_id):
     """OSAS/Admin view to review individual application - DEPRECATED.
@@ -881,22 +934,21 @@ def htmx_scholarship_search(request):
     if len(search_query) < 2:
         return HttpResponse('<div class="px-4 py-2 text-sm text-gray-500">Type at least 2 characters to search...</div>')
     
-    # Search scholarships
-    scholarships = Scholarship.objects.filter(
-        is_active=True,
-        application_deadline__gt=timezone.now()
-    ).filter(
-        Q(title__icontains=search_query) |
-        Q(description__icontains=search_query) |
-        Q(eligibility_criteria__icontains=search_query)
-    )[:5]  # Limit to 5 results for dropdown
+    # Search scholarships (full-text index with prefix matching for type-ahead)
+    scholarships = search_scholarships(
+        Scholarship.objects.filter(
+            is_active=True,
+            application_deadline__gt=timezone.now()
+        ),
+        search_query
+    ).select_related('counter').order_by('search_rank')
     
     # Get user's existing applications to exclude applied scholarships
     user_applications = Application.objects.filter(
         student=request.user
     ).values_list('scholarship_id', flat=True)
     
-    scholarships = scholarships.exclude(id__in=user_applications)
+    scholarships = scholarships.exclude(id__in=user_applications)[:5]  # Limit to 5 results for dropdown
     
     context = {
         'scholarships': scholarships,
@@ -912,49 +964,17 @@ def htmx_dashboard_stats(request):
     user_profile = request.user.profile
     
     if user_profile.is_student:
-        # Student statistics
-        stats = {
-            'total_applications': Application.objects.filter(student=request.user).count(),
-            'pending_applications': Application.objects.filter(student=request.user, status='pending').count(),
-            'approved_applications': Application.objects.filter(student=request.user, status='approved').count(),
-            'available_scholarships': Scholarship.objects.filter(
-                is_active=True,
-                application_deadline__gt=timezone.now()
-            ).exclude(
-                id__in=Application.objects.filter(student=request.user).values_list('scholarship_id', flat=True)
-            ).count(),
-        }
         template = 'htmx/student_stats.html'
-    
     elif user_profile.is_admin:
-        # Admin statistics
-        stats = {
-            'total_scholarships': Scholarship.objects.filter(created_by=request.user).count(),
-            'active_scholarships': Scholarship.objects.filter(created_by=request.user, is_active=True).count(),
-            'total_applications': Application.objects.filter(scholarship__created_by=request.user).count(),
-            'pending_reviews': Application.objects.filter(
-                scholarship__created_by=request.user,
-                status='pending'
-            ).count(),
-        }
         template = 'htmx/admin_stats.html'
-    
     elif user_profile.is_osas:
-        # OSAS statistics
-        stats = {
-            'pending_applications': Application.objects.filter(status='pending').count(),
-            'under_review': Application.objects.filter(status='under_review').count(),
-            'my_assigned': Application.objects.filter(reviewer=request.user, status='under_review').count(),
-            'approved_today': Application.objects.filter(
-                status='approved',
-                reviewed_at__date=timezone.now().date()
-            ).count(),
-        }
         template = 'htmx/osas_stats.html'
-    
     else:
         return HttpResponse('')
     
+    # Served from the stats cache; signals expire it when the data changes.
+    stats = DashboardStatsService.get_stats(request.user, panel='live')
+    
     context = {
         'stats': stats,
     }
@@ -1079,7 +1099,9 @@ def apply_scholarship(request, scholarship_id):
     if request.method == 'POST':
         from .forms import DynamicApplicationForm
         
-        form = DynamicApplicationForm(scholarship=scholarship, data=request.POST, files=request.FILES)
+        form = DynamicApplicationForm(
+            scholarship=scholarship, data=request.POST, files=request.FILES, student=request.user
+        )
         
         if form.is_valid():
             try:
@@ -1089,21 +1111,8 @@ def apply_scholarship(request, scholarship_id):
                 application.scholarship = scholarship
                 application.save()
                 
-                # Handle document uploads
-                for requirement in scholarship.document_requirements.all():
-                    field_name = f'document_{requirement.id}'
-                    uploaded_file = form.cleaned_data.get(field_name)
-                    
-                    if uploaded_file:
-                        # Create ApplicationDocument
-                        ApplicationDocument.objects.create(
-                            application=application,
-                            document_requirement=requirement,
-                            name=f"{requirement.display_name} - {uploaded_file.name}",
-                            file=uploaded_file,
-                            file_size=uploaded_file.size,
-                            content_type=uploaded_file.content_type
-                        )
+                # Handle document uploads and reused documents
+                form.save_documents(application)
                 
                 # Create notification for student
                 Notification.objects.create(
@@ -1123,7 +1132,7 @@ def apply_scholarship(request, scholarship_id):
             messages.error(request, 'Please correct the errors below.')
     else:
         from .forms import DynamicApplicationForm
-        form = DynamicApplicationForm(scholarship=scholarship)
+        form = DynamicApplicationForm(scholarship=scholarship, student=request.user)
     
     context = {
         'scholarship': scholarship,
@@ -1134,52 +1143,199 @@ def apply_scholarship(request, scholarship_id):
     return render(request, 'students/apply_scholarship.html', context)
 
 
+@csrf_exempt
 @login_required
 def bulk_upload_documents(request, application_id):
     """Upload multiple documents for an application using HTMX."""
+    from .forms import FileUploadValidator
+    from .uploads import MaxSizeUploadHandler
+    
+    # Drop oversized files while they are still arriving. Upload handlers
+    # can only be changed before request.POST is read, which the CSRF
+    # middleware would do, so the CSRF check happens in the inner view.
+    request.upload_handlers.insert(
+        0, MaxSizeUploadHandler(request, max_size=FileUploadValidator.MAX_FILE_SIZE)
+    )
+    return _bulk_upload_documents(request, application_id)
+
+
+@csrf_protect
+def _bulk_upload_documents(request, application_id):
     application = get_object_or_404(
         Application,
         id=application_id,
         student=request.user
     )
     
-    if request.method == 'POST' and request.FILES:
-        uploaded_files = request.FILES.getlist('files')
-        uploaded_documents = []
+    if request.method == 'POST':
+        from .forms import FileUploadValidator
+        from .uploads import rejected_uploads, store_documents
         
-        for uploaded_file in uploaded_files:
-            try:
-                # Validate file
-                from .forms import FileUploadValidator
-                FileUploadValidator.validate_file(uploaded_file)
-                
-                # Create document
-                document = ApplicationDocument.objects.create(
-                    application=application,
-                    name=uploaded_file.name,
-                    file=uploaded_file,
-                    file_size=uploaded_file.size,
-                    content_type=uploaded_file.content_type
-                )
-                uploaded_documents.append(document)
-                
-            except ValidationError as e:
-                messages.error(request, f'Error uploading {uploaded_file.name}: {str(e)}')
+        # Reading request.FILES runs the upload handlers that record rejected files.
+        uploaded_files = request.FILES.getlist('files')
+        results = [
+            {
+                'name': name,
+                'result': 'error',
+                'message': f'File size must be less than {FileUploadValidator.MAX_FILE_SIZE // (1024*1024)}MB.',
+                'document': None,
+            }
+            for name in rejected_uploads(request)
+        ]
+        results += store_documents(application, uploaded_files)
         
-        if uploaded_documents:
-            messages.success(request, f'Successfully uploaded {len(uploaded_documents)} document(s).')
+        uploaded = sum(1 for item in results if item['result'] == 'uploaded')
+        for item in results:
+            if item['result'] == 'error':
+                messages.error(request, f"Error uploading {item['name']}: {item['message']}")
+        if uploaded:
+            messages.success(request, f'Successfully uploaded {uploaded} document(s).')
         
-        # Return HTMX response with updated document list
+        # Return HTMX response with per-file results and the updated document list
         if request.headers.get('HX-Request'):
             context = {
+                'results': results,
+                'uploaded': uploaded,
+                'failed': len(results) - uploaded,
                 'documents': application.documents.all().order_by('-uploaded_at'),
                 'application': application,
             }
-            return render(request, 'htmx/document_list.html', context)
+            return render(request, 'htmx/bulk_upload_results.html', context)
     
     return redirect('core:application_detail', application_id=application.id)
 
 
+def _upload_session_data(session):
+    from .uploads import chunk_size
+    
+    return {
+        'upload_id': str(session.pk),
+        'status': session.status,
+        'offset': session.received,
+        'size': session.size,
+        'chunk_size': chunk_size(),
+    }
+
+
+@login_required
+def start_chunked_upload(request, application_id):
+    """Open a resumable upload for a document of the student's application.
+    
+    POST ``filename`` and ``size``, plus optionally the document ``name``,
+    the ``requirement`` it fulfils and the file's ``sha256``. The chunks are
+    then PUT to ``chunked_upload`` and the upload finished with
+    ``complete_chunked_upload``.
+    """
+    from . import uploads
+    
+    application = get_object_or_404(
+        Application,
+        id=application_id,
+        student=request.user
+    )
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Invalid request method'}, status=405)
+    
+    size = request.POST.get('size', '')
+    if not size.isdigit():
+        return JsonResponse({'success': False, 'error': 'Invalid size'}, status=400)
+    sha256 = request.POST.get('sha256', '').strip()
+    if sha256 and not re.fullmatch(r'[0-9a-fA-F]{64}', sha256):
+        return JsonResponse({'success': False, 'error': 'Invalid checksum'}, status=400)
+    
+    requirement = None
+    requirement_id = request.POST.get('requirement', '')
+    if requirement_id:
+        if requirement_id.isdigit():
+            requirement = application.scholarship.document_requirements.filter(id=requirement_id).first()
+        if requirement is None:
+            return JsonResponse({'success': False, 'error': 'Invalid requirement'}, status=400)
+    
+    try:
+        session = uploads.start_upload(
+            application,
+            request.user,
+            filename=request.POST.get('filename', ''),
+            size=int(size),
+            name=request.POST.get('name', '').strip(),
+            requirement=requirement,
+            sha256=sha256
+        )
+    except ValidationError as e:
+        return JsonResponse({'success': False, 'error': e.messages[0]}, status=400)
+    
+    return JsonResponse({'success': True, **_upload_session_data(session)}, status=201)
+
+
+@login_required
+def chunked_upload(request, upload_id):
+    """Resumable upload session: GET its offset, PUT a chunk or DELETE it.
+    
+    A chunk is the raw request body, written at the ``Upload-Offset``
+    header. An offset that does not match what the server has gets a 409
+    with the offset to resume from.
+    """
+    from .models import UploadSession
+    from . import uploads
+    
+    session = get_object_or_404(UploadSession, id=upload_id, uploaded_by=request.user)
+    
+    if request.method == 'GET':
+        return JsonResponse({'success': True, **_upload_session_data(session)})
+    
+    if request.method == 'DELETE':
+        uploads.abort_upload(session)
+        return JsonResponse({'success': True})
+    
+    if request.method != 'PUT':
+        return JsonResponse({'success': False, 'error': 'Invalid request method'}, status=405)
+    
+    offset = request.headers.get('Upload-Offset', '')
+    length = request.META.get('CONTENT_LENGTH') or ''
+    if not offset.isdigit() or not length.isdigit():
+        return JsonResponse({'success': False, 'error': 'Upload-Offset and Content-Length are required'}, status=400)
+    
+    try:
+        uploads.write_chunk(session, int(offset), request, int(length))
+    except ValidationError as e:
+        status = 409 if e.code in ('offset_mismatch', 'not_active') else 400
+        return JsonResponse({'success': False, 'error': e.messages[0], **_upload_session_data(session)}, status=status)
+    
+    return JsonResponse({'success': True, **_upload_session_data(session)})
+
+
+@login_required
+def complete_chunked_upload(request, upload_id):
+    """Verify a fully received upload and attach it to the application."""
+    from .models import UploadSession
+    from . import uploads
+    
+    session = get_object_or_404(
+        UploadSession.objects.select_related('application', 'document_requirement'),
+        id=upload_id,
+        uploaded_by=request.user
+    )
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Invalid request method'}, status=405)
+    
+    try:
+        document = uploads.complete_upload(session)
+    except ValidationError as e:
+        status = 409 if e.code == 'incomplete' else 400
+        return JsonResponse({'success': False, 'error': e.messages[0], **_upload_session_data(session)}, status=status)
+    
+    return JsonResponse({
+        'success': True,
+        'document': {
+            'id': document.id,
+            'name': document.name,
+            'file_size': document.file_size,
+            'content_type': document.content_type,
+            'url': document.file.url,
+        },
+    })
+
+
 @login_required
 def create_scholarship(request):
     """Admin view to create a new scholarship."""
@@ -1399,12 +1555,30 @@ def admin_review_application(request, application_id):
         comments = request.POST.get('comments', '')
         
         if decision in ['approved', 'rejected', 'additional_info_required']:
-            # Update application status
-            application.status = decision
-            application.reviewed_by = request.user
-            application.reviewer_comments = comments
-            application.reviewed_at = timezone.now()
-            application.save()
+            now = timezone.now()
+            fields = {
+                'reviewed_by': request.user,
+                'reviewer_comments': comments,
+                'reviewed_at': now,
+                'claim_expires_at': None,
+            }
+            if decision != 'additional_info_required':
+                fields.update(final_decision_by=request.user, final_decision_at=now, final_decision_comments=comments)
+            # Approvals reserve a slot atomically so the scholarship is
+            # never awarded beyond its available slots
+            try:
+                ApplicationService.decide(
+                    application,
+                    decision,
+                    ['pending', 'under_review', 'additional_info_required', 'osas_approved', 'osas_rejected'],
+                    **fields
+                )
+            except ValidationError as e:
+                if e.code == 'no_slots':
+                    messages.error(request, 'Cannot approve - no more slots available for this scholarship.')
+                    return redirect('core:admin_review_application', application_id=application_id)
+                messages.error(request, e.message)
+                return redirect('core:view_applications')
             
             # Create notification for student
             if decision == 'approved':
@@ -1494,6 +1668,25 @@ def ajax_create_document_requirement(request):
 
 
 
+def _filter_awardees(request):
+    """Approved applications matching the awardees page filters.
+    
+    Returns the queryset and the filter values for the template.
+    """
+    search_query = request.GET.get('search', '')
+    campus_filter = request.GET.get('campus')
+    scholarship_filter = request.GET.get('scholarship')
+    awardees = ApplicationService.awardees(
+        search=search_query, campus=campus_filter, scholarship_id=scholarship_filter
+    )
+    
+    return awardees, {
+        'search_query': search_query,
+        'campus_filter': campus_filter,
+        'scholarship_filter': scholarship_filter,
+    }
+
+
 @login_required
 def scholarship_awardees(request):
     """View list of students who have been awarded scholarships."""
@@ -1501,37 +1694,12 @@ def scholarship_awardees(request):
         messages.error(request, 'Access denied. Administrator or OSAS access required.')
         return redirect('core:landing_page')
     
-    # Get all approved applications
-    awardees = Application.objects.filter(
-        status='approved'
-    ).select_related(
-        'student', 'student__profile', 'scholarship', 'final_decision_by'
-    ).order_by('-final_decision_at')
-    
-    # Search filter
-    search_query = request.GET.get('search', '')
-    if search_query:
-        awardees = awardees.filter(
-            Q(student__first_name__icontains=search_query) |
-            Q(student__last_name__icontains=search_query) |
-            Q(student__username__icontains=search_query) |
-            Q(student__profile__student_id__icontains=search_query)
-        )
-    
-    # Campus filter
-    campus_filter = request.GET.get('campus')
-    if campus_filter:
-        awardees = awardees.filter(student__profile__campus=campus_filter)
-    
-    # Scholarship filter
-    scholarship_filter = request.GET.get('scholarship')
-    if scholarship_filter:
-        awardees = awardees.filter(scholarship_id=scholarship_filter)
+    awardees, filters = _filter_awardees(request)
     
     # Calculate statistics
     from django.db.models import Sum
     stats = {
-        'total_awardees': awardees.count(),
+        'total_awardees': cached_count(awardees),
         'total_amount': awardees.aggregate(
             total=Sum('scholarship__award_amount')
         )['total'] or 0,
@@ -1539,10 +1707,8 @@ def scholarship_awardees(request):
         'campuses_count': awardees.values('student__profile__campus').distinct().count(),
     }
     
-    # Pagination
-    paginator = Paginator(awardees, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset cursors once the listing is large)
+    page_obj = paginate(request, awardees, 10)
     
     # Get filter options
     from .models import UserProfile
@@ -1553,11 +1719,102 @@ def scholarship_awardees(request):
     context = {
         'page_obj': page_obj,
         'stats': stats,
-        'search_query': search_query,
-        'campus_filter': campus_filter,
-        'scholarship_filter': scholarship_filter,
+        'search_query': filters['search_query'],
+        'campus_filter': filters['campus_filter'],
+        'scholarship_filter': filters['scholarship_filter'],
         'campus_choices': UserProfile.CAMPUS_CHOICES,
         'scholarships_for_filter': scholarships_for_filter,
     }
     
     return render(request, 'admin/scholarship_awardees.html', context)
+
+
+@login_required
+def export_scholarship_awardees(request, fmt):
+    """Stream every awardee matching the page filters as CSV or XLSX."""
+    if not (request.user.profile.is_admin or request.user.profile.is_osas):
+        messages.error(request, 'Access denied. Administrator or OSAS access required.')
+        return redirect('core:landing_page')
+    
+    awardees, _ = _filter_awardees(request)
+    return export_response(awardees, AWARDEE_COLUMNS, fmt, 'scholarship_awardees', sheet_name='Awardees')
+
+
+def _report_job_response(request, job):
+    """Render a report job's status as the HTMX polling partial or JSON."""
+    if request.headers.get('HX-Request'):
+        return render(request, 'htmx/report_status.html', {'job': job})
+
+    data = {
+        'success': job.status != 'failed',
+        'id': job.pk,
+        'status': job.status,
+        'row_count': job.row_count,
+        'status_url': reverse('core:report_status', args=[job.pk]),
+    }
+    if job.status == 'done':
+        data['download_url'] = reverse('core:download_report', args=[job.pk])
+    if job.status == 'failed':
+        data['error'] = job.last_error
+    return JsonResponse(data)
+
+
+@login_required
+def request_report(request, report_type):
+    """Queue a PDF report for the listing filters in the query string.
+
+    An unchanged report that was already generated is returned straight
+    away instead of being queued again.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Invalid request method'}, status=405)
+    if report_type not in reports.REPORTS:
+        raise Http404('Unknown report.')
+    if not reports.can_request(request.user, report_type):
+        return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
+
+    filters = reports.report_filters(report_type, request.GET, request.user)
+    job = reports.request_report(report_type, filters, request.user)
+    return _report_job_response(request, job)
+
+
+@login_required
+def report_status(request, job_id):
+    """Current state of a report job; the HTMX partial polls until it is done."""
+    job = get_object_or_404(ReportJob, id=job_id)
+    if not reports.can_request(request.user, job.report_type):
+        return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
+
+    return _report_job_response(request, job)
+
+
+@login_required
+def download_report(request, job_id):
+    """Download a finished PDF report."""
+    job = get_object_or_404(ReportJob, id=job_id, status='done')
+    if not reports.can_request(request.user, job.report_type):
+        messages.error(request, 'Access denied.')
+        return redirect('core:landing_page')
+    if not job.file or not job.file.storage.exists(job.file.name):
+        raise Http404('Report file is no longer available.')
+
+    filename = f'{job.report_type}_report_{timezone.localtime(job.finished_at):%Y-%m-%d}.pdf'
+    return FileResponse(job.file.open('rb'), as_attachment=True, filename=filename, content_type='application/pdf')
+
+
+@login_required
+def admin_profiling_summary(request):
+    """JSON p50/p95/p99 timings per view from the request profiling middleware."""
+    if not request.user.profile.is_admin:
+        return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
+    
+    summary = profile_store.summary()
+    # Hottest views first
+    views = dict(sorted(summary.items(), key=lambda item: item[1]['wall_ms']['p95'], reverse=True))
+    
+    return JsonResponse({
+        'enabled': getattr(settings, 'REQUEST_PROFILING_ENABLED', False),
+        'window': profile_store.window,
+        'views': views,
+        'dashboard_stats_cache': DashboardStatsService.counters(),
+    })
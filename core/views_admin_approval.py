@@ -5,10 +5,14 @@ OSAS staff recommend approval/rejection, Admin makes final decision.
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.http import JsonResponse
+from django.core.exceptions import ValidationError
 from django.utils import timezone
-from django.core.paginator import Paginator
 from django.db.models import Q
+from .exports import REVIEW_HISTORY_COLUMNS, export_response
 from .models import Application, Notification
+from .pagination import paginate
+from .services import ApplicationService
 
 
 @login_required
@@ -49,16 +53,15 @@ def admin_pending_approvals(request):
             Q(student__username__icontains=search_query)
         )
     
-    # Pagination
-    paginator = Paginator(applications, 15)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset cursors once the listing is large)
+    page_obj = paginate(request, applications, 15)
     
     # Counts for filter tabs
+    status_counts = ApplicationService.get_status_counts()
     recommendation_counts = {
-        'all': Application.objects.filter(status__in=['osas_approved', 'osas_rejected']).count(),
-        'approved': Application.objects.filter(status='osas_approved').count(),
-        'rejected': Application.objects.filter(status='osas_rejected').count(),
+        'all': status_counts['osas_approved'] + status_counts['osas_rejected'],
+        'approved': status_counts['osas_approved'],
+        'rejected': status_counts['osas_rejected'],
     }
     
     # Get scholarships for filter
@@ -106,67 +109,33 @@ def admin_final_decision(request, application_id):
         comments = request.POST.get('final_comments', '')
         
         if decision in ['approve', 'reject']:
-            # Set final decision
-            if decision == 'approve':
-                # Check if scholarship still has available slots
-                if application.scholarship.available_slots_remaining > 0:
-                    application.status = 'approved'
-                    application.final_decision_by = request.user
-                    application.final_decision_at = timezone.now()
-                    application.final_decision_comments = comments
-                    application.save()
-                    
-                    messages.success(request, f'Application approved for {application.student.get_full_name()}.')
-                    
-                    # Create notification for student
-                    Notification.objects.create(
-                        recipient=application.student,
-                        title='Scholarship Application Approved!',
-                        message=f'Congratulations! Your application for {application.scholarship.title} has been approved by the administrator.',
-                        notification_type='success',
-                        related_application=application
-                    )
-                    
-                    # Notify OSAS staff who reviewed it
-                    if application.reviewed_by:
-                        Notification.objects.create(
-                            recipient=application.reviewed_by,
-                            title='Application Approved by Admin',
-                            message=f'The application you recommended for {application.scholarship.title} has been approved by {request.user.get_full_name()}.',
-                            notification_type='success',
-                            related_application=application
-                        )
-                else:
+            # Set final decision; approvals reserve a slot atomically so
+            # admins deciding at the same time cannot over-award
+            try:
+                ApplicationService.decide(
+                    application,
+                    'approved' if decision == 'approve' else 'rejected',
+                    ['osas_approved', 'osas_rejected'],
+                    final_decision_by=request.user,
+                    final_decision_at=timezone.now(),
+                    final_decision_comments=comments
+                )
+            except ValidationError as e:
+                if e.code == 'no_slots':
                     messages.error(request, 'Cannot approve - no more slots available for this scholarship.')
                     return redirect('core:admin_final_decision', application_id=application_id)
-                    
-            elif decision == 'reject':
-                application.status = 'rejected'
-                application.final_decision_by = request.user
-                application.final_decision_at = timezone.now()
-                application.final_decision_comments = comments
-                application.save()
-                
+                messages.error(request, e.message)
+                return redirect('core:admin_pending_approvals')
+            
+            if decision == 'approve':
+                messages.success(request, f'Application approved for {application.student.get_full_name()}.')
+            else:
                 messages.success(request, f'Application rejected for {application.student.get_full_name()}.')
-                
-                # Create notification for student
-                Notification.objects.create(
-                    recipient=application.student,
-                    title='Scholarship Application Decision',
-                    message=f'Your application for {application.scholarship.title} has been reviewed.',
-                    notification_type='info',
-                    related_application=application
-                )
-                
-                # Notify OSAS staff who reviewed it
-                if application.reviewed_by:
-                    Notification.objects.create(
-                        recipient=application.reviewed_by,
-                        title='Application Rejected by Admin',
-                        message=f'The application you reviewed for {application.scholarship.title} has been rejected by {request.user.get_full_name()}.',
-                        notification_type='info',
-                        related_application=application
-                    )
+            
+            # Notify the student and the OSAS staff who reviewed it
+            Notification.objects.bulk_create(
+                ApplicationService.final_decision_notifications(application, request.user)
+            )
             
             return redirect('core:admin_pending_approvals')
     
@@ -188,46 +157,87 @@ def admin_final_decision(request, application_id):
 
 
 @login_required
-def admin_review_history(request):
-    """Admin view to see history of all final decisions made."""
+def admin_bulk_final_decision(request):
+    """Approve or reject many OSAS-reviewed applications at once.
+    
+    Takes ``application_ids`` (repeated), ``decision`` and optional
+    ``final_comments``. Responds with the per-application results as an
+    HTMX partial or as JSON.
+    """
     if not request.user.profile.is_admin:
-        messages.error(request, 'Access denied. Administrator access required.')
-        return redirect('core:landing_page')
+        return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Invalid request method'}, status=405)
     
-    # Get applications with final decisions
-    applications = Application.objects.filter(
-        final_decision_by__isnull=False
-    ).select_related(
-        'student', 'student__profile', 'scholarship', 'reviewed_by', 'final_decision_by'
-    ).order_by('-final_decision_at')
+    decision = request.POST.get('decision')
+    comments = request.POST.get('final_comments', '')
+    try:
+        application_ids = [int(value) for value in request.POST.getlist('application_ids')]
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid application id'}, status=400)
+    if not application_ids:
+        return JsonResponse({'success': False, 'error': 'No applications selected'}, status=400)
     
-    # Filter by decision
-    decision_filter = request.GET.get('decision', 'all')
-    if decision_filter == 'approved':
-        applications = applications.filter(status='approved')
-    elif decision_filter == 'rejected':
-        applications = applications.filter(status='rejected')
+    try:
+        results = ApplicationService.bulk_final_decision(application_ids, decision, request.user, comments)
+    except ValidationError as e:
+        return JsonResponse({'success': False, 'error': e.messages[0]}, status=400)
     
-    # Filter by campus
-    campus_filter = request.GET.get('campus')
-    if campus_filter:
-        applications = applications.filter(student__profile__campus=campus_filter)
+    summary = {}
+    for item in results:
+        summary[item['result']] = summary.get(item['result'], 0) + 1
+    
+    if request.headers.get('HX-Request'):
+        return render(request, 'htmx/bulk_decision_results.html', {
+            'results': results,
+            'summary': summary,
+            'decided': summary.get('approved', 0) + summary.get('rejected', 0),
+        })
+    return JsonResponse({'success': True, 'summary': summary, 'results': results})
+
+
+def _filter_review_history(request):
+    """Decided applications matching the review history filters.
     
+    Returns the queryset and the filter values for the template.
+    """
+    decision_filter = request.GET.get('decision', 'all')
+    campus_filter = request.GET.get('campus')
     # Filter by admin who made decision
     admin_filter = request.GET.get('admin')
-    if admin_filter == 'me':
-        applications = applications.filter(final_decision_by=request.user)
+    applications = ApplicationService.final_decisions(
+        decision=decision_filter,
+        campus=campus_filter,
+        decided_by=request.user if admin_filter == 'me' else None,
+    )
+    
+    return applications, {
+        'decision_filter': decision_filter,
+        'campus_filter': campus_filter,
+        'admin_filter': admin_filter,
+    }
+
+
+@login_required
+def admin_review_history(request):
+    """Admin view to see history of all final decisions made."""
+    if not request.user.profile.is_admin:
+        messages.error(request, 'Access denied. Administrator access required.')
+        return redirect('core:landing_page')
     
-    # Pagination
-    paginator = Paginator(applications, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    applications, filters = _filter_review_history(request)
+    
+    # Pagination (keyset cursors once the listing is large)
+    page_obj = paginate(request, applications, 20)
     
     # Counts
+    status_counts = ApplicationService.get_status_counts(
+        queryset=Application.objects.filter(final_decision_by__isnull=False)
+    )
     decision_counts = {
-        'all': Application.objects.filter(final_decision_by__isnull=False).count(),
-        'approved': Application.objects.filter(status='approved', final_decision_by__isnull=False).count(),
-        'rejected': Application.objects.filter(status='rejected', final_decision_by__isnull=False).count(),
+        'all': status_counts['all'],
+        'approved': status_counts['approved'],
+        'rejected': status_counts['rejected'],
     }
     
     # Get campus choices for filter
@@ -236,11 +246,22 @@ def admin_review_history(request):
     
     context = {
         'page_obj': page_obj,
-        'decision_filter': decision_filter,
-        'campus_filter': campus_filter,
-        'admin_filter': admin_filter,
+        'decision_filter': filters['decision_filter'],
+        'campus_filter': filters['campus_filter'],
+        'admin_filter': filters['admin_filter'],
         'decision_counts': decision_counts,
         'campus_choices': campus_choices,
     }
     
     return render(request, 'admin/review_history.html', context)
+
+
+@login_required
+def export_review_history(request, fmt):
+    """Stream every final decision matching the history filters as CSV or XLSX."""
+    if not request.user.profile.is_admin:
+        messages.error(request, 'Access denied. Administrator access required.')
+        return redirect('core:landing_page')
+    
+    applications, _ = _filter_review_history(request)
+    return export_response(applications, REVIEW_HISTORY_COLUMNS, fmt, 'review_history', sheet_name='Review History')
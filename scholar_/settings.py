@@ -42,6 +42,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost so its timings cover the rest of the stack; inactive unless
+    # REQUEST_PROFILING_ENABLED is True.
+    'core.middleware.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -126,6 +129,27 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploaded files larger than this are dropped while they are still being
+# received (core.uploads.MaxSizeUploadHandler). It matches the largest
+# max_file_size_mb a document requirement can be given (50 MB).
+DOCUMENT_UPLOAD_MAX_SIZE = 50 * 1024 * 1024
+FILE_UPLOAD_HANDLERS = [
+    'core.uploads.MaxSizeUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Resumable chunked uploads (core.uploads). Partial files are kept outside
+# MEDIA_ROOT so they are never served; clients send at most
+# CHUNKED_UPLOAD_CHUNK_SIZE bytes per request, and `python manage.py
+# cleanup_uploads` removes sessions idle for CHUNKED_UPLOAD_EXPIRY seconds.
+CHUNKED_UPLOAD_DIR = BASE_DIR / 'uploads' / 'partial'
+CHUNKED_UPLOAD_CHUNK_SIZE = 1024 * 1024
+CHUNKED_UPLOAD_EXPIRY = 24 * 60 * 60
+
+# Files of one bulk document upload validated and written concurrently.
+BULK_UPLOAD_WORKERS = 4
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -137,4 +161,51 @@ LOGIN_REDIRECT_URL = 'core:dashboard_router'
 LOGOUT_REDIRECT_URL = 'core:landing_page'
 
 # Email configuration (for development)
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
\ No newline at end of file
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+# Notification emails are stored in the outbox and delivered by
+# `python manage.py run_email_worker`. Set to False to send inline.
+EMAIL_USE_OUTBOX = True
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_BACKOFF_SECONDS = 60
+
+# Per-request profiling (core.middleware.RequestProfilingMiddleware).
+# Summary per view: /dashboard/admin/profiling/ (admins only).
+REQUEST_PROFILING_ENABLED = os.environ.get('REQUEST_PROFILING_ENABLED') == '1'
+REQUEST_PROFILING_SLOW_MS = 500
+REQUEST_PROFILING_WORST_QUERIES = 5
+REQUEST_PROFILING_WINDOW = 500
+
+# Cache used for dashboard statistics (core.services.DashboardStatsService).
+# Local memory is per process; use a shared backend such as FileBasedCache
+# or Redis when running several worker processes so invalidations reach all.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'scholar-default',
+    }
+}
+# Upper bound on staleness for time-based stats (deadlines, "today" counts);
+# data changes expire entries immediately through signals.
+DASHBOARD_STATS_TIMEOUT = 300
+
+# Application listings switch from numbered pages to keyset cursors ("load
+# more") once a filtered result set grows past this many rows.
+CURSOR_PAGINATION_THRESHOLD = 1000
+# Listing totals are cached and expire when any application changes.
+PAGINATION_COUNT_TIMEOUT = 300
+
+# PDF reports (core.reports) are generated by `python manage.py
+# run_report_worker` and stored under MEDIA_ROOT/reports/. A job still
+# running after this many seconds is assumed dead and handed out again.
+REPORT_WORKER_CLAIM_TIMEOUT = 900
+
+# OSAS "claim next" (core.services.ApplicationService.claim_next): an
+# application claimed for review returns to the pending queue if it is
+# still under review this many seconds later.
+REVIEW_CLAIM_LEASE_SECONDS = 1800
+
+# `python manage.py assign_reviewers` (core.services.ReviewerAssignmentService)
+# gives OSAS reviewers at most this many open reviews; None means no cap.
+REVIEW_ASSIGNMENT_MAX_OPEN = 25
+# Lease on scheduled assignments, in seconds; None keeps them until reviewed.
+REVIEW_ASSIGNMENT_LEASE_SECONDS = None